@@ -1,16 +1,69 @@
+import threading
 import sciwing.api.conf as config
 from fastapi import FastAPI
+from starlette.responses import JSONResponse
 from sciwing.api.routers import parscit
 from sciwing.api.routers import citation_intent_clf
 
 app = FastAPI()
 
+# the name of the model, its router and the lazily loaded model
+routers = {
+    "parscit": (parscit.router, parscit.parscit_model),
+    "cit_int_clf": (
+        citation_intent_clf.router,
+        citation_intent_clf.citation_intent_clf_model,
+    ),
+}
+served_models = {
+    name: routers[name][1] for name in config.SERVED_MODELS if name in routers
+}
+
 
 @app.get("/")
 def root():
     return {"message": "Welcome To SciWING API"}
 
 
-# add the routers to the main app
-app.include_router(parscit.router)
-app.include_router(citation_intent_clf.router)
+@app.get("/ready")
+def ready():
+    """ Readiness of the api. It is ready when all the served models are loaded
+
+    Returns
+    -------
+    JSON
+        The loading status of every served model and the errors of the models
+        that failed to load. The status code is 503 until all the models are loaded
+    """
+    models = {name: model.is_loaded for name, model in served_models.items()}
+    errors = {
+        name: model.load_error
+        for name, model in served_models.items()
+        if model.load_error is not None
+    }
+    status_code = 200 if all(models.values()) else 503
+    return JSONResponse(
+        status_code=status_code,
+        content={"ready": status_code == 200, "models": models, "errors": errors},
+    )
+
+
+@app.on_event("startup")
+def warmup_models():
+    # the models are loaded in the background so that the api answers
+    # the other requests while they are loading
+    if not config.WARMUP_MODELS:
+        return
+    for model in served_models.values():
+        threading.Thread(target=model.warmup, daemon=True).start()
+
+
+@app.on_event("shutdown")
+def close_batchers():
+    parscit.parscit_batcher.close()
+    citation_intent_clf.citation_intent_clf_batcher.close()
+
+
+# add the routers of the served models to the main app
+for name in served_models:
+    app.include_router(routers[name][0])
@@ -0,0 +1,86 @@
+import json
+from typing import Any, Callable, Dict, Iterator, List
+
+
+def parse_bulk_body(body: bytes, content_type: str) -> List[str]:
+    """ Returns the texts in the body of a bulk request. The body is either a
+    json array of strings or newline delimited texts. Empty lines are ignored
+
+    Parameters
+    ----------
+    body : bytes
+        The body of the request
+    content_type : str
+        The content type of the request
+
+    Returns
+    -------
+    List[str]
+        The texts
+    """
+    text = body.decode("utf-8")
+    if "json" in content_type:
+        texts = json.loads(text)
+        if not isinstance(texts, list) or not all(
+            isinstance(text_, str) for text_ in texts
+        ):
+            raise ValueError("The body should be a json array of strings")
+    else:
+        texts = text.splitlines()
+
+    return [text_.strip() for text_ in texts if bool(text_.strip())]
+
+
+def get_length_sorted_chunks(texts: List[str], chunk_size: int) -> List[List[int]]:
+    """ Groups the indices of the texts into chunks of texts with similar lengths
+    so that little padding is needed when a chunk is infered as one batch
+
+    Parameters
+    ----------
+    texts : List[str]
+    chunk_size : int
+        The maximum number of texts in a chunk
+
+    Returns
+    -------
+    List[List[int]]
+        The indices of the texts in every chunk
+    """
+    indices = sorted(range(len(texts)), key=lambda idx: len(texts[idx].split()))
+    return [
+        indices[start : start + chunk_size]
+        for start in range(0, len(indices), chunk_size)
+    ]
+
+
+def stream_predictions(
+    texts: List[str],
+    predict_batch: Callable[[List[str]], List[Any]],
+    chunk_size: int,
+    text_key: str = "text",
+) -> Iterator[str]:
+    """ Infers the texts in length sorted chunks and yields one json line for every
+    text as soon as its chunk is infered. The lines are not in the order of the
+    texts, every line has the ``index`` of its text
+
+    Parameters
+    ----------
+    texts : List[str]
+    predict_batch : Callable[[List[str]], List[Any]]
+        Returns the prediction for every text in a chunk
+    chunk_size : int
+        The maximum number of texts infered together
+    text_key : str
+        The key of the text in the json lines
+
+    Returns
+    -------
+    Iterator[str]
+        Newline delimited json
+    """
+    for chunk in get_length_sorted_chunks(texts, chunk_size=chunk_size):
+        chunk_texts = [texts[idx] for idx in chunk]
+        predictions = predict_batch(chunk_texts)
+        for idx, text, prediction in zip(chunk, chunk_texts, predictions):
+            result: Dict[str, Any] = {"index": idx, text_key: text, "tags": prediction}
+            yield json.dumps(result) + "\n"
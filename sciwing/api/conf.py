@@ -1,3 +1,4 @@
+import os
 import pathlib
 import sciwing.constants as constants
 
@@ -6,3 +7,13 @@ OUTPUT_DIR = PATHS["OUTPUT_DIR"]
 
 PDF_STORE_LOCATION = pathlib.Path("/tmp/")
 BIN_FOLDER = pathlib.Path("./bin/")
+
+# comma separated names of the models that are served by the api
+SERVED_MODELS = os.environ.get("SCIWING_API_MODELS", "parscit,cit_int_clf").split(",")
+# load the served models when the api starts instead of on their first request
+WARMUP_MODELS = os.environ.get("SCIWING_API_WARMUP", "1") == "1"
+# concurrent requests are batched up to this size or until the first one waited this long
+MAX_BATCH_SIZE = int(os.environ.get("SCIWING_API_MAX_BATCH_SIZE", "32"))
+MAX_BATCH_WAIT_MS = float(os.environ.get("SCIWING_API_MAX_BATCH_WAIT_MS", "10"))
+# the texts of a bulk request are infered in chunks of this size
+BULK_CHUNK_SIZE = int(os.environ.get("SCIWING_API_BULK_CHUNK_SIZE", "64"))
@@ -0,0 +1,60 @@
+import importlib
+import threading
+from logzero import logger
+from typing import Any, Optional
+
+
+class LazyModel:
+    def __init__(self, module_name: str, class_name: str):
+        """ A model that is created only when it is first used. The module of the model
+        is imported only then, so that the heavy dependencies of a model are loaded
+        only when the model is served. The model is created once even when many
+        threads use it at the same time
+
+        Parameters
+        ----------
+        module_name : str
+            The module where the model class is defined
+        class_name : str
+            The name of the model class. It is instantiated without any arguments
+        """
+        self.module_name = module_name
+        self.class_name = class_name
+        self._model = None
+        self._lock = threading.Lock()
+        self.load_error: Optional[str] = None
+
+    def get(self) -> Any:
+        """ Returns the model. It is created if this is the first use
+
+        Returns
+        -------
+        Any
+            The model
+        """
+        model = self._model
+        if model is not None:
+            return model
+
+        with self._lock:
+            if self._model is None:
+                module = importlib.import_module(self.module_name)
+                self._model = getattr(module, self.class_name)()
+                self.load_error = None
+            return self._model
+
+    def warmup(self):
+        """ Loads the model. This runs in a background thread, so a failure to load
+        is logged and stored in ``load_error`` instead of being raised
+        """
+        try:
+            self.get()
+        except Exception as e:
+            self.load_error = f"{type(e).__name__}: {e}"
+            logger.exception(
+                f"Failed to load {self.module_name}.{self.class_name}: {self.load_error}"
+            )
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._model is not None
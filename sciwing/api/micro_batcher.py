@@ -0,0 +1,123 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Tuple
+
+
+class MicroBatcher:
+    def __init__(
+        self,
+        infer_batch: Callable[[List[Any]], List[Any]],
+        max_batch_size: int = 32,
+        max_wait_ms: float = 10.0,
+    ):
+        """ Collects the items of concurrent requests into batches and runs
+        one batch inference for all of them. A batch is run when it has
+        ``max_batch_size`` items or when its first item has waited ``max_wait_ms``.
+        The results are returned to the requests in the order of their items
+
+        Parameters
+        ----------
+        infer_batch : Callable[[List[Any]], List[Any]]
+            Returns one result for every item in the batch. It is run on a
+            separate thread so that the event loop is not blocked
+        max_batch_size : int
+            The maximum number of items in a batch
+        max_wait_ms : float
+            The maximum time in milliseconds an item waits for other items
+        """
+        self.infer_batch = infer_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self._queue: asyncio.Queue = None
+        self._worker: asyncio.Task = None
+        # one thread runs the batches so that they do not compete for the model
+        self._executor = ThreadPoolExecutor(max_workers=1)
+
+    async def submit(self, item: Any) -> Any:
+        """ Adds the item to the next batch and returns its result
+
+        Parameters
+        ----------
+        item : Any
+            The item to be infered
+
+        Returns
+        -------
+        Any
+            The result of the item
+        """
+        loop = asyncio.get_event_loop()
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        if self._worker is None or self._worker.done():
+            self._worker = loop.create_task(self._run())
+
+        future = loop.create_future()
+        await self._queue.put((item, future))
+        return await future
+
+    def run_batch(self, items: List[Any]) -> List[Any]:
+        """ Infers the items as one batch on the thread that runs the micro batches
+        and waits for the results. This is called from other threads, for example
+        by the bulk requests, so that they do not use the model at the same time
+        as the micro batches
+
+        Parameters
+        ----------
+        items : List[Any]
+            The items to be infered
+
+        Returns
+        -------
+        List[Any]
+            The result of every item
+        """
+        return self._executor.submit(self.infer_batch, items).result()
+
+    def close(self):
+        """ Stops the batching and the thread that runs the batches
+        """
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+        self._queue = None
+        self._executor.shutdown(wait=False)
+
+    async def _collect_batch(self) -> List[Tuple[Any, asyncio.Future]]:
+        loop = asyncio.get_event_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait_ms / 1000.0
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_event_loop()
+        while True:
+            batch = await self._collect_batch()
+            items = [item for item, _ in batch]
+            results = await loop.run_in_executor(self._executor, self._infer, items)
+            for (_, future), (result, error) in zip(batch, results):
+                # the request may have been cancelled while the batch was running
+                if future.done():
+                    continue
+                if error is not None:
+                    future.set_exception(error)
+                else:
+                    future.set_result(result)
+
+    def _infer(self, items: List[Any]) -> List[Tuple[Any, Exception]]:
+        try:
+            return [(result, None) for result in self.infer_batch(items)]
+        except Exception as e:
+            if len(items) == 1:
+                return [(None, e)]
+
+        # an item that fails should fail only its own request
+        return [self._infer([item])[0] for item in items]
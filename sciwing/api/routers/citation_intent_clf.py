@@ -1,14 +1,32 @@
-from fastapi import APIRouter
-from sciwing.models.citation_intent_clf import CitationIntentClassification
+from fastapi import APIRouter, HTTPException
+from starlette.requests import Request
+from starlette.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+import sciwing.api.conf as config
+from sciwing.api.lazy_model import LazyModel
+from sciwing.api.micro_batcher import MicroBatcher
+from sciwing.api.bulk import parse_bulk_body, stream_predictions
 
 router = APIRouter()
 
-citation_intent_clf_model = CitationIntentClassification()
+citation_intent_clf_model = LazyModel(
+    module_name="sciwing.models.citation_intent_clf",
+    class_name="CitationIntentClassification",
+)
+
+citation_intent_clf_batcher = MicroBatcher(
+    infer_batch=lambda citations: citation_intent_clf_model.get().predict_for_batch(
+        citations
+    ),
+    max_batch_size=config.MAX_BATCH_SIZE,
+    max_wait_ms=config.MAX_BATCH_WAIT_MS,
+)
 
 
 @router.get("/cit_int_clf/{citation}")
-def classify_citation_intent(citation: str):
-    """ End point to classify a citation
+async def classify_citation_intent(citation: str):
+    """ End point to classify a citation. Concurrent requests are classified together
+    in one batch
 
     Parameters
     ----------
@@ -19,5 +37,44 @@ def classify_citation_intent(citation: str):
     JSON
         Predicted class for the citation
     """
-    predictions = citation_intent_clf_model.predict_for_text(citation)
+    predictions = await citation_intent_clf_batcher.submit(citation)
     return {"tags": predictions, "citation": citation}
+
+
+@router.post("/cit_int_clf")
+async def classify_citation_intents(request: Request):
+    """ End point for many citations. Classifies the citations in a json array or in a
+    newline delimited body. The results are streamed back as newline delimited json
+    as soon as every chunk of citations is done
+
+    Parameters
+    ----------
+    request: Request
+
+    Returns
+    -------
+    StreamingResponse
+        One json line with the ``index``, the ``citation`` and the ``tags``
+        for every citation
+    """
+    body = await request.body()
+    try:
+        citations = parse_bulk_body(
+            body=body, content_type=request.headers.get("content-type", "")
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # the model may be loaded on this request, which should not block the other requests
+    await run_in_threadpool(citation_intent_clf_model.get)
+    # the chunks run on the thread of the batcher so that the model is never
+    # used by two requests at the same time
+    return StreamingResponse(
+        stream_predictions(
+            texts=citations,
+            predict_batch=citation_intent_clf_batcher.run_batch,
+            chunk_size=config.BULK_CHUNK_SIZE,
+            text_key="citation",
+        ),
+        media_type="application/x-ndjson",
+    )
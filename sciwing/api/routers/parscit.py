@@ -1,14 +1,29 @@
-from fastapi import APIRouter
-from sciwing.models.neural_parscit import NeuralParscit
+from fastapi import APIRouter, HTTPException
+from starlette.requests import Request
+from starlette.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+import sciwing.api.conf as config
+from sciwing.api.lazy_model import LazyModel
+from sciwing.api.micro_batcher import MicroBatcher
+from sciwing.api.bulk import parse_bulk_body, stream_predictions
 
 router = APIRouter()
 
-parscit_model = NeuralParscit()
+parscit_model = LazyModel(
+    module_name="sciwing.models.neural_parscit", class_name="NeuralParscit"
+)
+
+parscit_batcher = MicroBatcher(
+    infer_batch=lambda citations: parscit_model.get().predict_for_batch(citations),
+    max_batch_size=config.MAX_BATCH_SIZE,
+    max_wait_ms=config.MAX_BATCH_WAIT_MS,
+)
 
 
 @router.get("/parscit/{citation}")
-def tag_citation_string(citation: str):
-    """ End point to tag a citation
+async def tag_citation_string(citation: str):
+    """ End point to tag a citation. Concurrent requests are tagged together
+    in one batch
 
     Parameters
     ----------
@@ -20,5 +35,44 @@ def tag_citation_string(citation: str):
         Predicted tags for the given citation
 
     """
-    predictions = parscit_model.predict_for_text(citation)
+    predictions = await parscit_batcher.submit(citation)
     return {"tags": predictions, "text_tokens": citation.split()}
+
+
+@router.post("/parscit")
+async def tag_citation_strings(request: Request):
+    """ End point for many citations. Tags the citations in a json array or in a
+    newline delimited body. The results are streamed back as newline delimited json
+    as soon as every chunk of citations is done
+
+    Parameters
+    ----------
+    request: Request
+
+    Returns
+    -------
+    StreamingResponse
+        One json line with the ``index``, the ``citation`` and the ``tags``
+        for every citation
+    """
+    body = await request.body()
+    try:
+        citations = parse_bulk_body(
+            body=body, content_type=request.headers.get("content-type", "")
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # the model may be loaded on this request, which should not block the other requests
+    await run_in_threadpool(parscit_model.get)
+    # the chunks run on the thread of the batcher so that the model is never
+    # used by two requests at the same time
+    return StreamingResponse(
+        stream_predictions(
+            texts=citations,
+            predict_batch=parscit_batcher.run_batch,
+            chunk_size=config.BULK_CHUNK_SIZE,
+            text_key="citation",
+        ),
+        media_type="application/x-ndjson",
+    )
@@ -0,0 +1,95 @@
+import click
+import pathlib
+import wasabi
+import sciwing.constants as constants
+from sciwing.utils.sciwing_toml_runner import SciWingTOMLRunner
+from sciwing.data.streaming_dataset import StreamingDataset
+
+PATHS = constants.PATHS
+EMBEDDING_CACHE_DIR = PATHS["EMBEDDING_CACHE_DIR"]
+
+
+@click.group()
+def precompute():
+    """ Group of commands that precompute and cache the outputs of frozen embedders
+    """
+    pass
+
+
+@precompute.command()
+@click.argument("toml_filename")
+@click.option(
+    "--cache-filename",
+    default=str(pathlib.Path(EMBEDDING_CACHE_DIR, "elmo_cache.hdf5")),
+    help="HDF5 file where the ELMo embeddings are cached",
+)
+@click.option(
+    "--layer-aggregation",
+    type=click.Choice(["sum", "average", "last", "first"]),
+    default="sum",
+)
+@click.option("--batch-size", type=int, default=32)
+@click.option("--device", default="cpu")
+@click.option("--word-tokens-namespace", default="tokens")
+@click.option("--options-file", default=None, help="ELMo options file or url")
+@click.option("--weight-file", default=None, help="ELMo weights file or url")
+def elmo(
+    toml_filename,
+    cache_filename,
+    layer_aggregation,
+    batch_size,
+    device,
+    word_tokens_namespace,
+    options_file,
+    weight_file,
+):
+    """ Precomputes the ELMo embeddings for the train, dev and test lines of the
+    dataset in the toml file. Pass the same ``cache_filename``, ``layer_aggregation``
+    and ELMo files to the ``BowElmoEmbedder`` to read the embeddings from the cache
+
+    Parameters
+    ----------
+    toml_filename : str
+        Full path of the toml filename with the dataset section
+    """
+    # import here so that the other commands do not need allennlp
+    from sciwing.modules.embedders.bow_elmo_embedder import BowElmoEmbedder
+
+    toml_filepath = pathlib.Path(toml_filename)
+    if not toml_filepath.is_file():
+        raise FileNotFoundError(f"TOML File {toml_filename} is not found")
+
+    msg_printer = wasabi.Printer()
+    sciwing_toml_runner = SciWingTOMLRunner(toml_filename=toml_filepath)
+    datasets_manager = sciwing_toml_runner.parse_dataset_section()
+
+    elmo_files = {}
+    if options_file is not None:
+        elmo_files["options_file"] = options_file
+    if weight_file is not None:
+        elmo_files["weight_file"] = weight_file
+
+    embedder = BowElmoEmbedder(
+        layer_aggregation=layer_aggregation,
+        device=device,
+        word_tokens_namespace=word_tokens_namespace,
+        cache_filename=cache_filename,
+        **elmo_files,
+    )
+
+    datasets = {
+        "train": datasets_manager.train_dataset,
+        "dev": datasets_manager.dev_dataset,
+        "test": datasets_manager.test_dataset,
+    }
+    for split, dataset in datasets.items():
+        if isinstance(dataset, StreamingDataset):
+            lines = [line for line, _ in dataset.iter_lines_labels()]
+        else:
+            lines = [dataset[idx][0] for idx in range(len(dataset))]
+        with msg_printer.loading(f"Caching ELMo embeddings of {split} lines"):
+            embedder.precompute(lines, batch_size=batch_size)
+        msg_printer.good(f"Cached ELMo embeddings of {len(lines)} {split} lines")
+
+    embedder.cache.close()
+    msg_printer.good(f"ELMo embeddings are cached in {cache_filename}")
@@ -4,6 +4,7 @@ from sciwing.commands.run import run
 from sciwing.commands.test import test
 from sciwing.commands.develop import develop
 from sciwing.commands.download import download
+from sciwing.commands.precompute import precompute
 
 
 @click.group(name="sciwing")
@@ -19,6 +20,7 @@ def main():
     sciwing_group.add_command(test)
     sciwing_group.add_command(develop)
     sciwing_group.add_command(download)
+    sciwing_group.add_command(precompute)
     sciwing_group()
 
 
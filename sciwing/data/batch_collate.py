@@ -0,0 +1,157 @@
+from typing import List, Dict, Tuple, Any, Optional, Union
+from sciwing.numericalizers.base_numericalizer import BaseNumericalizer
+import torch
+
+
+class BatchInstances(list):
+    def __init__(
+        self,
+        instances: List[Any],
+        namespace_to_tensors: Dict[
+            str, Tuple[torch.LongTensor, torch.BoolTensor]
+        ] = None,
+    ):
+        """ A list of lines or labels of a batch together with the padded tensors
+        of token ids and the masks of some of their namespaces. The models and the
+        metrics use the tensors instead of numericalizing the tokens again
+
+        Parameters
+        ----------
+        instances : List[Any]
+            The lines or labels of the batch
+        namespace_to_tensors : Dict[str, Tuple[torch.LongTensor, torch.BoolTensor]]
+            A mapping from the namespace to the token ids and the mask of the
+            batch. Both are of size ``[batch_size, max_num_tokens]``
+        """
+        super(BatchInstances, self).__init__(instances)
+        self.namespace_to_tensors = namespace_to_tensors or {}
+
+    def pin_memory(self) -> "BatchInstances":
+        self.namespace_to_tensors = {
+            namespace: (ids.pin_memory(), mask.pin_memory())
+            for namespace, (ids, mask) in self.namespace_to_tensors.items()
+        }
+        return self
+
+
+class Batch:
+    def __init__(self, lines: BatchInstances, labels: BatchInstances):
+        """ The lines and the labels of a batch that is made by ``NumericalizingCollate``
+
+        Parameters
+        ----------
+        lines : BatchInstances
+        labels : BatchInstances
+        """
+        self.lines = lines
+        self.labels = labels
+
+    def pin_memory(self) -> "Batch":
+        # called by the DataLoader when ``pin_memory`` is True
+        self.lines = self.lines.pin_memory()
+        self.labels = self.labels.pin_memory()
+        return self
+
+    def __len__(self):
+        return len(self.lines)
+
+
+class NumericalizingCollate:
+    def __init__(
+        self,
+        namespace_to_numericalizer: Dict[str, BaseNumericalizer],
+        namespaces: List[str],
+        label_namespaces: List[str],
+    ):
+        """ Collates the lines and labels of a batch and numericalizes and pads the
+        tokens of the ``namespaces``. This does not depend on the embedders of the
+        model, so the DataLoader can run it in its worker processes while the
+        model runs on the previous batch
+
+        Parameters
+        ----------
+        namespace_to_numericalizer : Dict[str, BaseNumericalizer]
+            The numericalizers of the datasets manager
+        namespaces : List[str]
+            The namespaces that are numericalized. Their vocab should have the
+            start, end, pad and unk tokens
+        label_namespaces : List[str]
+            The namespaces of the labels. The other namespaces are the
+            namespaces of the lines
+        """
+        self.namespace_to_numericalizer = namespace_to_numericalizer
+        self.namespaces = namespaces
+        self.label_namespaces = label_namespaces
+
+    def __call__(self, examples: List[Tuple[Any, Any]]) -> Batch:
+        lines = [line for line, _ in examples]
+        labels = [label for _, label in examples]
+        lines_tensors = {}
+        labels_tensors = {}
+
+        for namespace in self.namespaces:
+            is_label_namespace = namespace in self.label_namespaces
+            instances = labels if is_label_namespace else lines
+            tensors = labels_tensors if is_label_namespace else lines_tensors
+            numericalizer = self.namespace_to_numericalizer[namespace]
+            tensors[namespace] = numericalizer.numericalize_batch_to_tensor(
+                instances=[
+                    [tok.text for tok in instance.tokens[namespace]]
+                    for instance in instances
+                ],
+                add_start_end_token=False,
+            )
+
+        return Batch(
+            lines=BatchInstances(lines, namespace_to_tensors=lines_tensors),
+            labels=BatchInstances(labels, namespace_to_tensors=labels_tensors),
+        )
+
+
+def get_batch_tensors(
+    instances: List[Any],
+    namespace: str,
+    numericalizer: BaseNumericalizer,
+    max_length: Optional[int] = None,
+    device: Union[str, torch.device] = torch.device("cpu"),
+) -> Tuple[torch.LongTensor, torch.BoolTensor]:
+    """ Returns the padded token ids and the mask of a namespace for a batch of
+    lines or labels. The tensors made by ``NumericalizingCollate`` are used if
+    they are available. Otherwise the tokens are numericalized here
+
+    Parameters
+    ----------
+    instances : List[Any]
+        The lines or labels of the batch
+    namespace : str
+        The namespace of the tokens
+    numericalizer : BaseNumericalizer
+        The numericalizer of the namespace
+    max_length : Optional[int]
+        The length to pad or clip every instance to. The length of the longest
+        instance is used if it is None
+    device : Union[str, torch.device]
+        The device of the returned tensors
+
+    Returns
+    -------
+    Tuple[torch.LongTensor, torch.BoolTensor]
+        The token ids and the mask of size ``[batch_size, max_length]``
+    """
+    namespace_to_tensors = getattr(instances, "namespace_to_tensors", {})
+    if namespace in namespace_to_tensors:
+        ids, mask = namespace_to_tensors[namespace]
+        if max_length is None or ids.size(1) == max_length:
+            return (
+                ids.to(device, non_blocking=True),
+                mask.to(device, non_blocking=True),
+            )
+
+    return numericalizer.numericalize_batch_to_tensor(
+        instances=[
+            [tok.text for tok in instance.tokens[namespace]] for instance in instances
+        ],
+        max_length=max_length,
+        add_start_end_token=False,
+        device=device,
+    )
@@ -0,0 +1,149 @@
+from torch.utils.data import Dataset
+from torch.utils.data.sampler import Sampler
+from typing import List, Iterator, Dict, Optional
+from sciwing.data.columnar_lines import ColumnarTokens
+import numpy as np
+
+
+class BucketBatchSampler(Sampler):
+    def __init__(
+        self,
+        lengths: List[int],
+        batch_size: int,
+        indices: Optional[List[int]] = None,
+        bucket_size_multiplier: int = 50,
+        drop_last: bool = False,
+        shuffle: bool = True,
+    ):
+        """ A batch sampler that groups examples of similar lengths into the same batch
+
+        Every epoch the indices are shuffled and split into chunks of
+        ``batch_size * bucket_size_multiplier`` examples. Every chunk is sorted by length
+        and split into batches. The order of the batches is shuffled again so that
+        the model does not see the batches in increasing order of length. This
+        keeps the randomness across epochs while reducing the padding in every batch.
+
+        Parameters
+        ----------
+        lengths : List[int]
+            The length of every example in the dataset
+        batch_size : int
+            The number of examples in every batch
+        indices : Optional[List[int]]
+            The indices of the dataset that are sampled. If this is None then all
+            the examples of the dataset are sampled
+        bucket_size_multiplier : int
+            The number of batches that are sorted together by length
+        drop_last : bool
+            If True, the last batch of every chunk is dropped if it is smaller than ``batch_size``
+        shuffle : bool
+            If False, the examples are sorted by length without any randomness.
+            This is useful for validation and test datasets
+        """
+        self.lengths = np.array(lengths)
+        self.batch_size = batch_size
+        self.indices = np.arange(len(lengths)) if indices is None else np.array(indices)
+        self.bucket_size_multiplier = bucket_size_multiplier
+        self.drop_last = drop_last
+        self.shuffle = shuffle
+        self.bucket_size = self.batch_size * self.bucket_size_multiplier
+        self.padding_stats: Dict[str, int] = {}
+        self.reset_padding_stats()
+
+    def __iter__(self) -> Iterator[List[int]]:
+        self.reset_padding_stats()
+        indices = self.indices
+        if self.shuffle:
+            indices = np.random.permutation(indices)
+
+        batches: List[List[int]] = []
+        for bucket_start in range(0, len(indices), self.bucket_size):
+            bucket = indices[bucket_start : bucket_start + self.bucket_size]
+            self._update_padding_stats(bucket, key="unsorted_padded_tokens")
+
+            # stable sort so that the randomness of the shuffle is retained among
+            # examples of the same length
+            bucket = bucket[np.argsort(self.lengths[bucket], kind="mergesort")]
+            self._update_padding_stats(bucket, key="padded_tokens")
+
+            for batch_start in range(0, len(bucket), self.batch_size):
+                batch = bucket[batch_start : batch_start + self.batch_size]
+                if self.drop_last and len(batch) < self.batch_size:
+                    continue
+                batches.append(batch.tolist())
+
+        if self.shuffle:
+            batch_order = np.random.permutation(len(batches))
+            batches = [batches[idx] for idx in batch_order]
+
+        for batch in batches:
+            yield batch
+
+    def __len__(self):
+        num_batches = 0
+        for bucket_start in range(0, len(self.indices), self.bucket_size):
+            bucket_len = min(self.bucket_size, len(self.indices) - bucket_start)
+            if self.drop_last:
+                num_batches += bucket_len // self.batch_size
+            else:
+                num_batches += int(np.ceil(bucket_len / self.batch_size))
+        return num_batches
+
+    def _update_padding_stats(self, bucket: np.ndarray, key: str):
+        for batch_start in range(0, len(bucket), self.batch_size):
+            batch_lengths = self.lengths[
+                bucket[batch_start : batch_start + self.batch_size]
+            ]
+            self.padding_stats[key] += int(
+                batch_lengths.max() * len(batch_lengths) - batch_lengths.sum()
+            )
+
+    def reset_padding_stats(self):
+        self.padding_stats = {
+            "num_tokens": (
+                int(self.lengths[self.indices].sum()) if len(self.indices) else 0
+            ),
+            "padded_tokens": 0,
+            "unsorted_padded_tokens": 0,
+        }
+
+    def get_padding_stats(self) -> Dict[str, int]:
+        """ Returns the padding statistics for the last epoch
+
+        Returns
+        -------
+        Dict[str, int]
+            ``num_tokens`` is the number of actual tokens in the epoch.
+            ``padded_tokens`` is the number of pad tokens introduced by the bucketed batches.
+            ``unsorted_padded_tokens`` is the number of pad tokens that random batches
+            of the same shuffle would have introduced. ``padding_removed`` is the
+            difference between the two
+
+        """
+        stats = dict(self.padding_stats)
+        stats["padding_removed"] = (
+            stats["unsorted_padded_tokens"] - stats["padded_tokens"]
+        )
+        return stats
+
+
+def get_line_lengths(dataset: Dataset, namespace: str = "tokens") -> List[int]:
+    """ Returns the number of tokens of every line in the dataset for a namespace
+
+    Parameters
+    ----------
+    dataset : Dataset
+        Any sciwing dataset that stores the lines in ``lines``
+    namespace : str
+        The namespace of the tokens that are counted
+
+    Returns
+    -------
+    List[int]
+        The length of every line in the dataset
+
+    """
+    lines = dataset.lines
+    if isinstance(lines, ColumnarTokens):
+        return lines.get_lengths(namespace).tolist()
+    return [len(line.tokens[namespace]) for line in lines]
@@ -0,0 +1,339 @@
+from array import array
+from collections.abc import Sequence
+from typing import Dict, List, Iterator, Union, Any, Optional
+import json
+import pathlib
+import numpy as np
+from sciwing.data.line import Line, tokenize_texts
+from sciwing.data.label import Label
+from sciwing.data.seq_label import SeqLabel
+from sciwing.tokenizers.BaseTokenizer import BaseTokenizer
+
+
+class TokenColumn:
+    def __init__(self):
+        """ Stores the tokens of many instances for one namespace.
+
+        Every distinct token is stored once. The instances are a flat int32 array
+        of token ids and an offsets array, where the tokens of instance ``i`` are
+        ``ids[offsets[i]:offsets[i + 1]]``
+        """
+        self.token2id: Dict[str, int] = {}
+        self.id2token: List[str] = []
+        self.ids = array("i")
+        self.offsets = array("q", [0])
+
+    def append(self, tokens: List[str]):
+        for token in tokens:
+            token_id = self.token2id.get(token)
+            if token_id is None:
+                token_id = len(self.id2token)
+                self.token2id[token] = token_id
+                self.id2token.append(token)
+            self.ids.append(token_id)
+        self.offsets.append(len(self.ids))
+
+    def get_ids(self, idx: int) -> np.ndarray:
+        ids = np.frombuffer(self.ids, dtype=np.int32)
+        return ids[self.offsets[idx] : self.offsets[idx + 1]].copy()
+
+    def get_tokens(self, idx: int) -> List[str]:
+        return [
+            self.id2token[self.ids[pos]]
+            for pos in range(self.offsets[idx], self.offsets[idx + 1])
+        ]
+
+    def get_lengths(self) -> np.ndarray:
+        return np.diff(np.frombuffer(self.offsets, dtype=np.int64))
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def save(self, directory: pathlib.Path, name: str):
+        np.save(
+            str(directory.joinpath(f"{name}.ids.npy")),
+            np.frombuffer(self.ids, np.int32),
+        )
+        np.save(
+            str(directory.joinpath(f"{name}.offsets.npy")),
+            np.frombuffer(self.offsets, np.int64),
+        )
+        with open(
+            directory.joinpath(f"{name}.tokens.json"), "w", encoding="utf-8"
+        ) as fp:
+            json.dump(self.id2token, fp)
+
+    @classmethod
+    def load(cls, directory: pathlib.Path, name: str) -> "TokenColumn":
+        column = cls()
+        column.ids = array("i")
+        column.ids.frombytes(
+            np.load(str(directory.joinpath(f"{name}.ids.npy")))
+            .astype(np.int32)
+            .tobytes()
+        )
+        column.offsets = array("q")
+        column.offsets.frombytes(
+            np.load(str(directory.joinpath(f"{name}.offsets.npy")))
+            .astype(np.int64)
+            .tobytes()
+        )
+        with open(
+            directory.joinpath(f"{name}.tokens.json"), "r", encoding="utf-8"
+        ) as fp:
+            column.id2token = json.load(fp)
+        column.token2id = dict(zip(column.id2token, range(len(column.id2token))))
+        return column
+
+
+class ColumnarTokens(Sequence):
+    def __init__(self, namespaces: List[str]):
+        """ A compact sequence of tokenized instances. The tokens of every namespace
+        are stored in a ``TokenColumn`` and the instances are created lazily
+        only when they are indexed
+
+        Parameters
+        ----------
+        namespaces : List[str]
+            The namespaces of the tokens
+        """
+        self.namespaces = namespaces
+        self.columns: Dict[str, TokenColumn] = {
+            namespace: TokenColumn() for namespace in namespaces
+        }
+
+    def append_tokens(self, namespace_tokens: Dict[str, List[str]]):
+        for namespace in self.namespaces:
+            self.columns[namespace].append(namespace_tokens[namespace])
+
+    def get_tokens(self, idx: int, namespace: str) -> List[str]:
+        return self.columns[namespace].get_tokens(idx)
+
+    def get_lengths(self, namespace: str) -> np.ndarray:
+        """ Returns the number of tokens of every instance in the namespace
+
+        Parameters
+        ----------
+        namespace : str
+
+        Returns
+        -------
+        np.ndarray
+        """
+        return self.columns[namespace].get_lengths()
+
+    def get_unique_tokens(self, namespace: str) -> List[str]:
+        """ Returns every distinct token of the namespace once
+
+        Parameters
+        ----------
+        namespace : str
+
+        Returns
+        -------
+        List[str]
+        """
+        return list(self.columns[namespace].id2token)
+
+    def iter_tokens(
+        self, namespace: str, start: int = 0, end: Optional[int] = None
+    ) -> Iterator[List[str]]:
+        """ Iterates over the tokens of every instance without creating the instances
+
+        Parameters
+        ----------
+        namespace : str
+        start : int
+            The index of the first instance
+        end : Optional[int]
+            The index after the last instance. All the instances from ``start``
+            are iterated over if it is None
+
+        Returns
+        -------
+        Iterator[List[str]]
+        """
+        column = self.columns[namespace]
+        end = len(self) if end is None else min(end, len(self))
+        for idx in range(start, end):
+            yield column.get_tokens(idx)
+
+    def make_instance(self, idx: int):
+        raise NotImplementedError
+
+    def save(self, directory: str):
+        """ Saves the token columns to the directory. Every column is stored
+        as ``.npy`` arrays of the token ids and offsets and a json list of the
+        distinct tokens
+
+        Parameters
+        ----------
+        directory : str
+            The directory where the columns are saved. It is created if it does not exist
+        """
+        directory = pathlib.Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        for idx, namespace in enumerate(self.namespaces):
+            self.columns[namespace].save(directory, f"column_{idx}")
+        with open(directory.joinpath("meta.json"), "w", encoding="utf-8") as fp:
+            json.dump(self.get_meta(), fp)
+
+    def get_meta(self) -> Dict[str, Any]:
+        return {"namespaces": self.namespaces}
+
+    def load_columns(self, directory: str):
+        directory = pathlib.Path(directory)
+        self.columns = {
+            namespace: TokenColumn.load(directory, f"column_{idx}")
+            for idx, namespace in enumerate(self.namespaces)
+        }
+
+    @staticmethod
+    def load_meta(directory: str) -> Dict[str, Any]:
+        with open(
+            pathlib.Path(directory).joinpath("meta.json"), "r", encoding="utf-8"
+        ) as fp:
+            return json.load(fp)
+
+    def __getitem__(self, idx: Union[int, slice]):
+        if isinstance(idx, slice):
+            return [self.make_instance(i) for i in range(*idx.indices(len(self)))]
+        if idx < 0:
+            idx += len(self)
+        if idx < 0 or idx >= len(self):
+            raise IndexError(f"Index {idx} is out of range")
+        return self.make_instance(idx)
+
+    def __len__(self) -> int:
+        return len(self.columns[self.namespaces[0]])
+
+
+class ColumnarLines(ColumnarTokens):
+    def __init__(self, tokenizers: Dict[str, BaseTokenizer]):
+        """ Lines whose texts are tokenized once and stored compactly.
+        ``Line`` objects are created only when they are indexed
+
+        Parameters
+        ----------
+        tokenizers : Dict[str, BaseTokenizer]
+            A mapping from namespace to the tokenizer that is used to tokenize the text
+        """
+        super(ColumnarLines, self).__init__(namespaces=list(tokenizers.keys()))
+        self.tokenizers = tokenizers
+        self.texts: List[str] = []
+
+    def append(self, text: str):
+        namespace_tokens = {
+            namespace: tokenizer.tokenize(text)
+            for namespace, tokenizer in self.tokenizers.items()
+        }
+        self.texts.append(text)
+        self.append_tokens(namespace_tokens)
+
+    def extend(self, texts: List[str], batch_size: int = 10000):
+        """ Appends many texts. The texts are tokenized ``batch_size`` at a time
+        with ``tokenize_texts``, so that only the tokens of one batch are held
+        as lists of strings
+
+        Parameters
+        ----------
+        texts : List[str]
+        batch_size : int
+            The number of texts that are tokenized together
+        """
+        for start in range(0, len(texts), batch_size):
+            batch_texts = texts[start : start + batch_size]
+            batch_tokens = tokenize_texts(batch_texts, self.tokenizers)
+            for text, namespace_tokens in zip(batch_texts, batch_tokens):
+                self.texts.append(text)
+                self.append_tokens(namespace_tokens)
+
+    def make_instance(self, idx: int) -> Line:
+        tokens = {
+            namespace: self.get_tokens(idx, namespace) for namespace in self.namespaces
+        }
+        return Line(text=self.texts[idx], tokenizers=self.tokenizers, tokens=tokens)
+
+    def get_meta(self) -> Dict[str, Any]:
+        return {"namespaces": self.namespaces, "texts": self.texts}
+
+    @classmethod
+    def load(
+        cls, directory: str, tokenizers: Dict[str, BaseTokenizer]
+    ) -> "ColumnarLines":
+        """ Loads the lines saved with ``save``
+
+        Parameters
+        ----------
+        directory : str
+            The directory where the lines are saved
+        tokenizers : Dict[str, BaseTokenizer]
+            The tokenizers with which the lines were tokenized
+
+        Returns
+        -------
+        ColumnarLines
+        """
+        meta = cls.load_meta(directory)
+        lines = cls(tokenizers=tokenizers)
+        assert lines.namespaces == meta["namespaces"]
+        lines.texts = meta["texts"]
+        lines.load_columns(directory)
+        return lines
+
+
+class ColumnarLabels(ColumnarTokens):
+    def __init__(self, namespace: str = "label"):
+        """ Labels of a text classification dataset stored as token ids.
+        ``Label`` objects are created only when they are indexed
+
+        Parameters
+        ----------
+        namespace : str
+            The namespace of the labels
+        """
+        super(ColumnarLabels, self).__init__(namespaces=[namespace])
+        self.namespace = namespace
+
+    def append(self, text: str):
+        self.append_tokens({self.namespace: [text]})
+
+    def make_instance(self, idx: int) -> Label:
+        text = self.get_tokens(idx, self.namespace)[0]
+        return Label(text=text, namespace=self.namespace)
+
+    @classmethod
+    def load(cls, directory: str) -> "ColumnarLabels":
+        meta = cls.load_meta(directory)
+        labels = cls(namespace=meta["namespaces"][0])
+        labels.load_columns(directory)
+        return labels
+
+
+class ColumnarSeqLabels(ColumnarTokens):
+    def __init__(self, namespaces: List[str]):
+        """ Sequence labels stored as token ids.
+        ``SeqLabel`` objects are created only when they are indexed
+
+        Parameters
+        ----------
+        namespaces : List[str]
+            The label namespaces
+        """
+        super(ColumnarSeqLabels, self).__init__(namespaces=namespaces)
+
+    def append(self, labels: Dict[str, List[str]]):
+        self.append_tokens(labels)
+
+    def make_instance(self, idx: int) -> SeqLabel:
+        labels = {
+            namespace: self.get_tokens(idx, namespace) for namespace in self.namespaces
+        }
+        return SeqLabel(labels=labels)
+
+    @classmethod
+    def load(cls, directory: str) -> "ColumnarSeqLabels":
+        meta = cls.load_meta(directory)
+        labels = cls(namespaces=meta["namespaces"])
+        labels.load_columns(directory)
+        return labels
@@ -0,0 +1,261 @@
+import os
+import json
+import pickle
+import hashlib
+import pathlib
+import shutil
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from sciwing.data.columnar_lines import (
+    ColumnarTokens,
+    ColumnarLines,
+    ColumnarLabels,
+    ColumnarSeqLabels,
+)
+from sciwing.tokenizers.BaseTokenizer import BaseTokenizer
+from sciwing.vocab.vocab import Vocab
+
+CACHE_FORMAT_VERSION = 2
+
+
+class _TokenizersPickler(pickle.Pickler):
+    """ Pickles a reference in place of the tokenizers so that the tokenizers,
+    which may hold large models, are not stored with every cached line
+    """
+
+    def __init__(self, fp, tokenizers: Dict[str, BaseTokenizer]):
+        super(_TokenizersPickler, self).__init__(fp, protocol=pickle.HIGHEST_PROTOCOL)
+        self.tokenizers = tokenizers
+
+    def persistent_id(self, obj):
+        if obj is self.tokenizers:
+            return "tokenizers"
+        return None
+
+
+class _TokenizersUnpickler(pickle.Unpickler):
+    def __init__(self, fp, tokenizers: Dict[str, BaseTokenizer]):
+        super(_TokenizersUnpickler, self).__init__(fp)
+        self.tokenizers = tokenizers
+
+    def persistent_load(self, pid):
+        if pid == "tokenizers":
+            return self.tokenizers
+        raise pickle.UnpicklingError(f"Unknown persistent id {pid}")
+
+
+class DatasetCache:
+    def __init__(self, cache_dir: str):
+        """ A content addressed on-disk cache of tokenized datasets and their vocabs.
+
+        Every entry is a directory named by a key which is a hash of the dataset file,
+        the tokenizer configuration and the dataset options. Changing any of them
+        creates a new entry. Columnar lines and labels are stored in their compact
+        binary format. Other lines and labels are pickled
+
+        Parameters
+        ----------
+        cache_dir : str
+            The directory where the cache is stored
+        """
+        self.cache_dir = pathlib.Path(cache_dir)
+
+    @staticmethod
+    def get_file_hash(filename: str) -> str:
+        sha1 = hashlib.sha1()
+        with open(filename, "rb") as fp:
+            for chunk in iter(lambda: fp.read(1 << 20), b""):
+                sha1.update(chunk)
+        return sha1.hexdigest()
+
+    @staticmethod
+    def get_tokenizers_config(
+        tokenizers: Dict[str, BaseTokenizer]
+    ) -> Dict[str, Dict[str, Any]]:
+        """ Returns the class and the simple valued attributes of every tokenizer.
+        The attributes in ``runtime_attributes`` of a tokenizer do not change its
+        tokens and are left out
+
+        Parameters
+        ----------
+        tokenizers : Dict[str, BaseTokenizer]
+            A mapping from namespace to tokenizer
+
+        Returns
+        -------
+        Dict[str, Dict[str, Any]]
+        """
+        config = {}
+        for namespace, tokenizer in tokenizers.items():
+            runtime_attributes = getattr(tokenizer, "runtime_attributes", [])
+            attributes = {
+                key: value
+                for key, value in vars(tokenizer).items()
+                if isinstance(value, (str, int, float, bool, type(None)))
+                and key not in runtime_attributes
+            }
+            config[namespace] = {
+                "class": type(tokenizer).__name__,
+                "attributes": attributes,
+            }
+        return config
+
+    @staticmethod
+    def get_key(**items) -> str:
+        """ Returns a hash of the items
+
+        Parameters
+        ----------
+        items
+            Any json serializable values. Values that cannot be serialized are
+            converted to strings
+
+        Returns
+        -------
+        str
+        """
+        items["cache_format_version"] = CACHE_FORMAT_VERSION
+        key = json.dumps(items, sort_keys=True, default=str)
+        return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+    def get_dataset_key(
+        self,
+        dataset_class: str,
+        filename: str,
+        tokenizers: Dict[str, BaseTokenizer],
+        **options,
+    ) -> str:
+        return self.get_key(
+            dataset_class=dataset_class,
+            file_hash=self.get_file_hash(filename),
+            tokenizers=self.get_tokenizers_config(tokenizers),
+            options=options,
+        )
+
+    def load_or_create_lines_labels(
+        self,
+        key: str,
+        tokenizers: Dict[str, BaseTokenizer],
+        create: Callable[[], Tuple[List[Any], List[Any]]],
+    ) -> Tuple[List[Any], List[Any]]:
+        """ Returns the lines and labels stored under the key. If they are not
+        cached, they are created and stored
+
+        Parameters
+        ----------
+        key : str
+            The key of the dataset
+        tokenizers : Dict[str, BaseTokenizer]
+            The tokenizers of the lines. They are attached to the lines that are loaded
+        create : Callable[[], Tuple[List[Any], List[Any]]]
+            Reads and tokenizes the dataset when there is a cache miss
+
+        Returns
+        -------
+        Tuple[List[Any], List[Any]]
+            The lines and labels
+        """
+        lines_labels = self.load_lines_labels(key=key, tokenizers=tokenizers)
+        if lines_labels is not None:
+            return lines_labels
+
+        lines, labels = create()
+        self.save_lines_labels(
+            key=key, lines=lines, labels=labels, tokenizers=tokenizers
+        )
+        return lines, labels
+
+    def load_lines_labels(
+        self, key: str, tokenizers: Dict[str, BaseTokenizer]
+    ) -> Optional[Tuple[List[Any], List[Any]]]:
+        entry_dir = self.cache_dir.joinpath(key)
+        if not entry_dir.joinpath("complete").is_file():
+            return None
+
+        with open(entry_dir.joinpath("format.json")) as fp:
+            formats = json.load(fp)
+
+        if formats["lines"] == "pickle":
+            with open(entry_dir.joinpath("lines_labels.pkl"), "rb") as fp:
+                return _TokenizersUnpickler(fp, tokenizers=tokenizers).load()
+
+        lines = ColumnarLines.load(entry_dir.joinpath("lines"), tokenizers=tokenizers)
+        if formats["labels"] == "ColumnarLabels":
+            labels = ColumnarLabels.load(entry_dir.joinpath("labels"))
+        else:
+            labels = ColumnarSeqLabels.load(entry_dir.joinpath("labels"))
+        return lines, labels
+
+    def save_lines_labels(
+        self,
+        key: str,
+        lines: List[Any],
+        labels: List[Any],
+        tokenizers: Dict[str, BaseTokenizer],
+    ):
+        entry_dir = self.cache_dir.joinpath(key)
+        # write to a temporary directory so that a half written entry is never read
+        tmp_dir = self.cache_dir.joinpath(f"{key}.{os.getpid()}.tmp")
+        if tmp_dir.is_dir():
+            shutil.rmtree(tmp_dir)
+        tmp_dir.mkdir(parents=True)
+
+        if isinstance(lines, ColumnarLines) and isinstance(labels, ColumnarTokens):
+            formats = {"lines": type(lines).__name__, "labels": type(labels).__name__}
+            lines.save(tmp_dir.joinpath("lines"))
+            labels.save(tmp_dir.joinpath("labels"))
+        else:
+            formats = {"lines": "pickle", "labels": "pickle"}
+            with open(tmp_dir.joinpath("lines_labels.pkl"), "wb") as fp:
+                _TokenizersPickler(fp, tokenizers=tokenizers).dump((lines, labels))
+
+        with open(tmp_dir.joinpath("format.json"), "w") as fp:
+            json.dump(formats, fp)
+        tmp_dir.joinpath("complete").touch()
+
+        try:
+            os.replace(str(tmp_dir), str(entry_dir))
+        except OSError:
+            # another process has already cached the same dataset
+            shutil.rmtree(tmp_dir)
+
+    def load_vocabs(self, key: str) -> Optional[Dict[str, Vocab]]:
+        """ Returns the vocabs of all the namespaces stored under the key
+
+        Parameters
+        ----------
+        key : str
+            The key of the vocabs
+
+        Returns
+        -------
+        Optional[Dict[str, Vocab]]
+            None if the vocabs are not cached
+        """
+        vocab_dir = self.cache_dir.joinpath("vocab", key)
+        if not vocab_dir.joinpath("namespaces.json").is_file():
+            return None
+
+        with open(vocab_dir.joinpath("namespaces.json")) as fp:
+            namespaces = json.load(fp)
+
+        namespace_to_vocab = {}
+        for idx, namespace in enumerate(namespaces):
+            namespace_to_vocab[namespace] = Vocab.load_from_binary_file(
+                str(vocab_dir.joinpath(f"vocab_{idx}"))
+            )
+        return namespace_to_vocab
+
+    def save_vocabs(self, key: str, namespace_to_vocab: Dict[str, Vocab]):
+        vocab_dir = self.cache_dir.joinpath("vocab", key)
+        vocab_dir.mkdir(parents=True, exist_ok=True)
+        namespaces = list(namespace_to_vocab.keys())
+        for idx, namespace in enumerate(namespaces):
+            namespace_to_vocab[namespace].save_to_binary_file(
+                str(vocab_dir.joinpath(f"vocab_{idx}"))
+            )
+
+        # the namespaces are written last and mark the vocabs as complete
+        tmp_filename = vocab_dir.joinpath(f"namespaces.{os.getpid()}.tmp")
+        with open(tmp_filename, "w") as fp:
+            json.dump(namespaces, fp)
+        os.replace(str(tmp_filename), str(vocab_dir.joinpath("namespaces.json")))
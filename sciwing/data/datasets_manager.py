@@ -6,10 +6,19 @@ from torch.utils.data import Dataset
 from sciwing.vocab.vocab import Vocab
 from sciwing.numericalizers.base_numericalizer import BaseNumericalizer
 from sciwing.data.line import Line
-from typing import Dict, List, Any
-from collections import defaultdict
+from sciwing.data.columnar_lines import ColumnarTokens
+from sciwing.data.dataset_cache import DatasetCache
+from sciwing.data.streaming_dataset import StreamingDataset
+from typing import Dict, List, Any, Optional, Tuple
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing as mp
 import wasabi
 import itertools
+import importlib
+import inspect
+import pathlib
+import json
 
 
 class DatasetsManager:
@@ -21,6 +30,8 @@ class DatasetsManager:
         namespace_vocab_options: Dict[str, Dict[str, Any]] = None,
         namespace_numericalizer_map: Dict[str, BaseNumericalizer] = None,
         batch_size: int = 32,
+        cache_dir: Optional[str] = None,
+        num_vocab_workers: int = 0,
     ):
         """
 
@@ -40,6 +51,19 @@ class DatasetsManager:
             be passed down to the Numericalizer Instances
         batch_size: int
             Batch size for loading the datasets
+        cache_dir: Optional[str]
+            If passed and the train dataset is cached in this directory, the vocab
+            of every namespace is cached here as well
+        num_vocab_workers: int
+            If greater than 0, the train dataset is split into contiguous shards and
+            the tokens of every shard are counted in a pool of these many processes.
+            Only a description of the shard is sent to a process. The lines of a
+            ``StreamingDataset`` are read and tokenized in the process that counts
+            them. The processes that count the lines of other datasets are forked,
+            so they share the lines without copying them, and the tokens are counted
+            in the main process where fork is not available. The counts are merged
+            in the order of the shards, so the vocab is the same as the one that
+            is built in the main process
         """
         self.train_dataset = train_dataset
         self.dev_dataset = dev_dataset
@@ -53,6 +77,8 @@ class DatasetsManager:
             self.namespace_vocab_options = namespace_vocab_options
 
         self.batch_size = batch_size
+        self.cache_dir = cache_dir
+        self.num_vocab_workers = num_vocab_workers
 
         self.namespace_to_numericalizer: Dict[
             str, BaseNumericalizer
@@ -82,29 +108,139 @@ class DatasetsManager:
             A vocab corresponding to each of the
 
         """
+        if isinstance(self.train_dataset, StreamingDataset):
+            if self.num_vocab_workers > 0:
+                namespace_to_vocab = self._count_streaming_tokens_in_workers()
+            else:
+                namespace_to_vocab = self._count_streaming_tokens()
+            for vocab in namespace_to_vocab.values():
+                vocab.build_vocab()
+            return namespace_to_vocab
+
         lines = self.train_dataset.lines
         labels = self.train_dataset.labels
-
-        namespace_to_instances: Dict[str, List[List[str]]] = defaultdict(list)
-        for line in lines:
-            namespace_tokens = line.tokens
-            for namespace, tokens in namespace_tokens.items():
-                namespace_to_instances[namespace].append(tokens)
-        for label in labels:
-            namespace_tokens = label.tokens
-            for namespace, tokens in namespace_tokens.items():
-                namespace_to_instances[namespace].append(tokens)
-
         self.label_namespaces = list(labels[0].tokens.keys())
 
-        namespace_to_vocab: Dict[str, Vocab] = {}
+        train_cache_key = getattr(self.train_dataset, "cache_key", None)
+        vocab_cache_key = None
+        if self.cache_dir is not None and train_cache_key is not None:
+            cache = DatasetCache(cache_dir=self.cache_dir)
+            vocab_cache_key = cache.get_key(
+                train_cache_key=train_cache_key,
+                namespace_vocab_options=self.namespace_vocab_options,
+            )
+            namespace_to_vocab = cache.load_vocabs(key=vocab_cache_key)
+            if namespace_to_vocab is not None:
+                return namespace_to_vocab
+
+        # The tokens are counted as the lines and labels are read, without
+        # collecting the instances of every namespace
+        if self.num_vocab_workers > 0 and "fork" in mp.get_all_start_methods():
+            namespace_to_vocab = self._count_tokens_in_workers(lines, labels)
+        else:
+            namespace_to_vocab = {}
+            for instances in [lines, labels]:
+                count_tokens(
+                    namespace_to_vocab=namespace_to_vocab,
+                    instances=instances,
+                    namespace_vocab_options=self.namespace_vocab_options,
+                )
 
         # This always builds a vocab from instances
-        for namespace, instances in namespace_to_instances.items():
-            namespace_to_vocab[namespace] = Vocab(
-                instances=instances, **self.namespace_vocab_options.get(namespace, {})
+        for vocab in namespace_to_vocab.values():
+            vocab.build_vocab()
+
+        if vocab_cache_key is not None:
+            cache.save_vocabs(
+                key=vocab_cache_key, namespace_to_vocab=namespace_to_vocab
             )
-            namespace_to_vocab[namespace].build_vocab()
+        return namespace_to_vocab
+
+    def _count_streaming_tokens(self) -> Dict[str, Vocab]:
+        """ Counts the tokens of a streaming train dataset in a single pass over
+        its file. The lines and labels are dropped once they are counted
+        """
+        namespace_to_vocab: Dict[str, Vocab] = {}
+        for line, label in self.train_dataset.iter_lines_labels():
+            if self.label_namespaces is None:
+                self.label_namespaces = list(label.tokens.keys())
+            for instance in [line, label]:
+                for namespace, tokens in instance.tokens.items():
+                    vocab = get_namespace_vocab(
+                        namespace_to_vocab=namespace_to_vocab,
+                        namespace=namespace,
+                        namespace_vocab_options=self.namespace_vocab_options,
+                    )
+                    vocab.count_instance(tokens)
+        return namespace_to_vocab
+
+    def _count_streaming_tokens_in_workers(self) -> Dict[str, Vocab]:
+        """ Counts the tokens of contiguous shards of a streaming train dataset in a
+        process pool. Every process gets the configuration of the dataset and
+        the range of its shard, and reads, tokenizes and counts the shard itself
+        """
+        num_instances = len(self.train_dataset)
+        # every process parses the records of the file before its shard,
+        # so there is one shard per process
+        shard_starts, shard_ends = get_shard_ranges(
+            num_instances=num_instances, num_shards=self.num_vocab_workers
+        )
+        dataset_config = get_streaming_dataset_config(self.train_dataset)
+        num_shards = len(shard_starts)
+
+        namespace_to_vocab: Dict[str, Vocab] = {}
+        with ProcessPoolExecutor(max_workers=self.num_vocab_workers) as executor:
+            for label_namespaces, namespace_to_counter in executor.map(
+                _count_streaming_shard,
+                [dataset_config] * num_shards,
+                shard_starts,
+                shard_ends,
+                [self.namespace_vocab_options] * num_shards,
+            ):
+                if self.label_namespaces is None:
+                    self.label_namespaces = label_namespaces
+                merge_counters(
+                    namespace_to_vocab=namespace_to_vocab,
+                    namespace_to_counter=namespace_to_counter,
+                    namespace_vocab_options=self.namespace_vocab_options,
+                )
+
+        return namespace_to_vocab
+
+    def _count_tokens_in_workers(self, lines, labels) -> Dict[str, Vocab]:
+        """ Counts the tokens of shards of the lines and labels in a pool of forked
+        processes and merges the counts of the shards into a vocab for every namespace.
+        The processes share the lines and labels with the main process, and only the
+        range of every shard is sent to them
+        """
+        num_instances = len(lines)
+        # a few shards per worker, so that a slow shard does not hold up the pool
+        shard_starts, shard_ends = get_shard_ranges(
+            num_instances=num_instances, num_shards=self.num_vocab_workers * 4
+        )
+
+        namespace_to_vocab: Dict[str, Vocab] = {}
+        # the forked processes inherit these instead of receiving a pickled copy
+        _worker_data["lines"] = lines
+        _worker_data["labels"] = labels
+        _worker_data["namespace_vocab_options"] = self.namespace_vocab_options
+        try:
+            with ProcessPoolExecutor(
+                max_workers=self.num_vocab_workers, mp_context=mp.get_context("fork")
+            ) as executor:
+                # ``map`` returns the counts in the order of the shards, which keeps
+                # the first occurrence of every token the same as in a single process
+                for namespace_to_counter in executor.map(
+                    _count_shard, shard_starts, shard_ends
+                ):
+                    merge_counters(
+                        namespace_to_vocab=namespace_to_vocab,
+                        namespace_to_counter=namespace_to_counter,
+                        namespace_vocab_options=self.namespace_vocab_options,
+                    )
+        finally:
+            _worker_data.clear()
+
         return namespace_to_vocab
 
     def print_stats(self):
@@ -158,9 +294,165 @@ class DatasetsManager:
         Line
 
         """
-        line_ = Line(text=line, tokenizers=self.train_dataset.tokenizers)
+        if self.train_dataset is not None:
+            tokenizers = self.train_dataset.tokenizers
+        else:
+            tokenizers = self.tokenizers
+        line_ = Line(text=line, tokenizers=tokenizers)
         return line_
 
+    def save_for_inference(self, directory: str):
+        """ Saves everything that is needed to make predictions with a trained model
+        without the datasets. This is the vocab of every namespace, the configuration
+        of the tokenizers and numericalizers and the label namespaces
+
+        Parameters
+        ----------
+        directory : str
+            The directory where the inference artifacts are stored.
+            It is created if it does not exist
+        """
+        directory = pathlib.Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+
+        tokenizers = (
+            self.train_dataset.tokenizers
+            if self.train_dataset is not None
+            else self.tokenizers
+        )
+        for idx, namespace in enumerate(self.namespaces):
+            vocab = self.namespace_to_vocab[namespace]
+            vocab.save_to_binary_file(str(directory.joinpath(f"vocab_{idx}")))
+
+        artifact = {
+            "namespaces": self.namespaces,
+            "label_namespaces": self.label_namespaces,
+            "tokenizers": {
+                namespace: self._get_object_config(tokenizer)
+                for namespace, tokenizer in tokenizers.items()
+            },
+            "numericalizers": {
+                namespace: self._get_object_config(
+                    numericalizer, exclude=("vocabulary",)
+                )
+                for namespace, numericalizer in self.namespace_to_numericalizer.items()
+            },
+            "batch_size": self.batch_size,
+        }
+        with open(directory.joinpath("datasets_manager.json"), "w") as fp:
+            json.dump(artifact, fp, indent=4)
+
+    @classmethod
+    def load_for_inference(cls, directory: str) -> "DatasetsManager":
+        """ Loads the datasets manager saved with ``save_for_inference``. The datasets
+        of the returned manager are None. The vocab, numericalizers and tokenizers
+        are restored, which is all that the models and the inference clients need to
+        make predictions
+
+        Parameters
+        ----------
+        directory : str
+            The directory where the inference artifacts are stored
+
+        Returns
+        -------
+        DatasetsManager
+        """
+        directory = pathlib.Path(directory)
+        with open(directory.joinpath("datasets_manager.json")) as fp:
+            artifact = json.load(fp)
+
+        datasets_manager = DatasetsManager.__new__(DatasetsManager)
+        datasets_manager.train_dataset = None
+        datasets_manager.dev_dataset = None
+        datasets_manager.test_dataset = None
+        datasets_manager.msg_printer = wasabi.Printer()
+        datasets_manager.namespace_vocab_options = {}
+        datasets_manager.batch_size = artifact["batch_size"]
+        datasets_manager.cache_dir = None
+        datasets_manager.num_vocab_workers = 0
+        datasets_manager.label_namespaces = artifact["label_namespaces"]
+        datasets_manager.namespaces = artifact["namespaces"]
+        datasets_manager.tokenizers = {
+            namespace: cls._create_object(config)
+            for namespace, config in artifact["tokenizers"].items()
+        }
+        datasets_manager.namespace_to_vocab = {
+            namespace: cls._load_vocab(directory, idx)
+            for idx, namespace in enumerate(artifact["namespaces"])
+        }
+        datasets_manager.namespace_to_numericalizer = {}
+        for namespace, config in artifact["numericalizers"].items():
+            numericalizer = cls._create_object(config)
+            # the vocab is not part of the config. It is restored from its own files
+            numericalizer.vocabulary = datasets_manager.namespace_to_vocab[namespace]
+            datasets_manager.namespace_to_numericalizer[namespace] = numericalizer
+        datasets_manager.num_labels = {
+            namespace: datasets_manager.namespace_to_vocab[namespace].get_vocab_len()
+            for namespace in datasets_manager.label_namespaces
+        }
+        return datasets_manager
+
+    @staticmethod
+    def _load_vocab(directory: pathlib.Path, idx: int) -> Vocab:
+        binary_directory = directory.joinpath(f"vocab_{idx}")
+        if binary_directory.joinpath("options.json").is_file():
+            return Vocab.load_from_binary_file(str(binary_directory))
+        # the vocabs were saved as json before the binary format
+        return Vocab.load_from_file(str(directory.joinpath(f"vocab_{idx}.json")))
+
+    @staticmethod
+    def _get_object_config(obj: Any, exclude: Tuple[str, ...] = ()) -> Dict[str, Any]:
+        """ Returns the class of the object and the arguments of its constructor
+        that are stored as attributes with the same name
+
+        Parameters
+        ----------
+        obj : Any
+            The object whose configuration is returned
+        exclude : Tuple[str, ...]
+            The arguments of the constructor that are not part of the configuration,
+            because they are restored separately
+
+        Returns
+        -------
+        Dict[str, Any]
+
+        Raises
+        ------
+        ValueError
+            If an argument of the constructor cannot be stored as json. The object
+            cannot be created again from its configuration then
+        """
+        attributes = vars(obj)
+        parameters = inspect.signature(type(obj).__init__).parameters
+        kwargs = {}
+        for name in parameters:
+            if name == "self" or name in exclude or name not in attributes:
+                continue
+            value = attributes[name]
+            if value is None or isinstance(value, (str, int, float, bool)):
+                kwargs[name] = value
+            elif isinstance(value, (list, tuple)) and all(
+                isinstance(item, (str, int, float, bool)) for item in value
+            ):
+                kwargs[name] = list(value)
+            else:
+                raise ValueError(
+                    f"The argument {name} of {type(obj).__name__} is a "
+                    f"{type(value).__name__}, which cannot be stored in the config"
+                )
+        return {
+            "class": type(obj).__name__,
+            "module": type(obj).__module__,
+            "kwargs": kwargs,
+        }
+
+    @staticmethod
+    def _create_object(config: Dict[str, Any]) -> Any:
+        module = importlib.import_module(config["module"])
+        return getattr(module, config["class"])(**config["kwargs"])
+
     @property
     def train_dataset(self):
         return self._train_dataset
@@ -216,3 +508,174 @@ class DatasetsManager:
     @label_namespaces.setter
     def label_namespaces(self, value):
         self._label_namespaces = value
+
+
+def get_namespace_vocab(
+    namespace_to_vocab: Dict[str, Vocab],
+    namespace: str,
+    namespace_vocab_options: Dict[str, Dict[str, Any]],
+) -> Vocab:
+    """ Returns the vocab of the namespace and creates it if it does not exist yet
+    """
+    if namespace not in namespace_to_vocab:
+        namespace_to_vocab[namespace] = Vocab(
+            **namespace_vocab_options.get(namespace, {})
+        )
+    return namespace_to_vocab[namespace]
+
+
+def count_tokens(
+    namespace_to_vocab: Dict[str, Vocab],
+    instances,
+    namespace_vocab_options: Dict[str, Dict[str, Any]],
+    start: int = 0,
+    end: Optional[int] = None,
+):
+    """ Counts the tokens of every namespace of the lines or labels in
+    ``instances[start:end]`` in the vocab of the namespace
+
+    Parameters
+    ----------
+    namespace_to_vocab : Dict[str, Vocab]
+        The vocab of every namespace. The vocabs of new namespaces are added
+    instances
+        The lines or labels of a dataset. They are either a list or ``ColumnarTokens``
+    namespace_vocab_options : Dict[str, Dict[str, Any]]
+        The options of the vocabs that are created
+    start : int
+        The index of the first instance that is counted
+    end : Optional[int]
+        The index after the last instance that is counted. The instances
+        till the end are counted if it is None
+    """
+    if isinstance(instances, ColumnarTokens):
+        # the tokens are read without creating the lines and labels
+        for namespace in instances.namespaces:
+            vocab = get_namespace_vocab(
+                namespace_to_vocab, namespace, namespace_vocab_options
+            )
+            vocab.count_instances(instances.iter_tokens(namespace, start, end))
+        return
+
+    end = len(instances) if end is None else min(end, len(instances))
+    for idx in range(start, end):
+        for namespace, tokens in instances[idx].tokens.items():
+            vocab = get_namespace_vocab(
+                namespace_to_vocab, namespace, namespace_vocab_options
+            )
+            vocab.count_instance(tokens)
+
+
+def get_shard_ranges(num_instances: int, num_shards: int) -> Tuple[List[int], List[int]]:
+    """ Splits the instances into at most ``num_shards`` contiguous shards of equal size
+
+    Parameters
+    ----------
+    num_instances : int
+    num_shards : int
+
+    Returns
+    -------
+    Tuple[List[int], List[int]]
+        The start and the end of every shard
+    """
+    num_shards = max(min(num_instances, num_shards), 1)
+    shard_size = max(-(-num_instances // num_shards), 1)
+    shard_starts = list(range(0, num_instances, shard_size))
+    shard_ends = [start + shard_size for start in shard_starts]
+    return shard_starts, shard_ends
+
+
+def merge_counters(
+    namespace_to_vocab: Dict[str, Vocab],
+    namespace_to_counter: Dict[str, Counter],
+    namespace_vocab_options: Dict[str, Dict[str, Any]],
+):
+    """ Adds the token counts of a shard to the vocab of every namespace
+    """
+    for namespace, counter in namespace_to_counter.items():
+        vocab = get_namespace_vocab(
+            namespace_to_vocab=namespace_to_vocab,
+            namespace=namespace,
+            namespace_vocab_options=namespace_vocab_options,
+        )
+        vocab.token_counter.update(counter)
+
+
+def get_streaming_dataset_config(dataset: StreamingDataset) -> Dict[str, Any]:
+    """ Returns what is needed to create the streaming dataset again in another
+    process. This is the class of the dataset, the arguments of its constructor
+    and the configuration of its tokenizers
+
+    Parameters
+    ----------
+    dataset : StreamingDataset
+
+    Returns
+    -------
+    Dict[str, Any]
+    """
+    config = DatasetsManager._get_object_config(dataset, exclude=("tokenizers",))
+    config["tokenizers"] = {
+        namespace: DatasetsManager._get_object_config(tokenizer)
+        for namespace, tokenizer in dataset.tokenizers.items()
+    }
+    return config
+
+
+def _count_streaming_shard(
+    dataset_config: Dict[str, Any],
+    start: int,
+    end: int,
+    namespace_vocab_options: Dict[str, Dict[str, Any]],
+) -> Tuple[Optional[List[str]], Dict[str, Counter]]:
+    tokenizers = {}
+    for namespace, config in dataset_config["tokenizers"].items():
+        # the shards are already tokenized in parallel
+        if "n_process" in config["kwargs"]:
+            config["kwargs"]["n_process"] = 1
+        tokenizers[namespace] = DatasetsManager._create_object(config)
+    module = importlib.import_module(dataset_config["module"])
+    dataset = getattr(module, dataset_config["class"])(
+        tokenizers=tokenizers, **dataset_config["kwargs"]
+    )
+
+    label_namespaces = None
+    namespace_to_vocab: Dict[str, Vocab] = {}
+    for line, label in dataset.iter_range_lines_labels(start, end):
+        if label_namespaces is None:
+            label_namespaces = list(label.tokens.keys())
+        for instance in [line, label]:
+            for namespace, tokens in instance.tokens.items():
+                vocab = get_namespace_vocab(
+                    namespace_to_vocab, namespace, namespace_vocab_options
+                )
+                vocab.count_instance(tokens)
+    return (
+        label_namespaces,
+        {
+            namespace: vocab.token_counter
+            for namespace, vocab in namespace_to_vocab.items()
+        },
+    )
+
+
+# The lines, labels and the vocab options that the forked processes count.
+# They are set in the main process just before the processes are forked
+_worker_data: Dict[str, Any] = {}
+
+
+def _count_shard(start: int, end: int) -> Dict[str, Counter]:
+    namespace_to_vocab: Dict[str, Vocab] = {}
+    for instances in [_worker_data["lines"], _worker_data["labels"]]:
+        count_tokens(
+            namespace_to_vocab=namespace_to_vocab,
+            instances=instances,
+            namespace_vocab_options=_worker_data["namespace_vocab_options"],
+            start=start,
+            end=end,
+        )
+    return {
+        namespace: vocab.token_counter
+        for namespace, vocab in namespace_to_vocab.items()
+    }
@@ -6,12 +6,37 @@ from collections import defaultdict
 
 
 class Line:
-    def __init__(self, text: str, tokenizers: Dict[str, BaseTokenizer] = None):
+    def __init__(
+        self,
+        text: str,
+        tokenizers: Dict[str, BaseTokenizer] = None,
+        tokens: Dict[str, List[str]] = None,
+    ):
+        """ A line of text with its tokens in different namespaces
+
+        Parameters
+        ----------
+        text : str
+            The text of the line
+        tokenizers : Dict[str, BaseTokenizer]
+            A mapping from namespace to the tokenizer that is used to tokenize the text
+        tokens : Dict[str, List[str]]
+            A mapping from namespace to the already tokenized text. The text is
+            not tokenized again if this is passed
+        """
+        self.text = text
+        self.tokens: Dict[str, List[Any]] = defaultdict(list)
+
+        if tokens is not None:
+            self.tokenizers = tokenizers
+            self.namespaces = list(tokens.keys())
+            for namespace, namespace_tokens in tokens.items():
+                self.add_tokens(tokens=namespace_tokens, namespace=namespace)
+            return
+
         if tokenizers is None:
             tokenizers = {"tokens": WordTokenizer()}
-        self.text = text
         self.tokenizers = tokenizers
-        self.tokens: Dict[str, List[Any]] = defaultdict(list)
         self.namespaces = list(tokenizers.keys())
 
         for namespace, tokenizer in tokenizers.items():
@@ -44,3 +69,56 @@ class Line:
     @namespaces.setter
     def namespaces(self, value):
         self._namespaces = value
+
+
+def tokenize_texts(
+    texts: List[str], tokenizers: Dict[str, BaseTokenizer]
+) -> List[Dict[str, List[str]]]:
+    """ Tokenizes many texts with every tokenizer. Each tokenizer gets all the texts
+    at once in ``tokenize_batch``, so that tokenizers like spacy process them in batches
+
+    Parameters
+    ----------
+    texts : List[str]
+        The texts that are tokenized
+    tokenizers : Dict[str, BaseTokenizer]
+        A mapping from namespace to the tokenizer that is used to tokenize the texts
+
+    Returns
+    -------
+    List[Dict[str, List[str]]]
+        The mapping from namespace to the tokens of every text
+    """
+    namespace_tokens = {
+        namespace: tokenizer.tokenize_batch(texts)
+        for namespace, tokenizer in tokenizers.items()
+    }
+    return [
+        {namespace: tokens[idx] for namespace, tokens in namespace_tokens.items()}
+        for idx in range(len(texts))
+    ]
+
+
+def make_lines(
+    texts: List[str], tokenizers: Dict[str, BaseTokenizer] = None
+) -> List[Line]:
+    """ Makes the lines of many texts. This is the same as making a ``Line`` for
+    every text, but the texts are tokenized together with ``tokenize_texts``
+
+    Parameters
+    ----------
+    texts : List[str]
+        The texts of the lines
+    tokenizers : Dict[str, BaseTokenizer]
+        A mapping from namespace to the tokenizer that is used to tokenize the texts
+
+    Returns
+    -------
+    List[Line]
+    """
+    if tokenizers is None:
+        tokenizers = {"tokens": WordTokenizer()}
+    return [
+        Line(text=text, tokenizers=tokenizers, tokens=tokens)
+        for text, tokens in zip(texts, tokenize_texts(texts, tokenizers))
+    ]
@@ -0,0 +1,191 @@
+from abc import abstractmethod
+from typing import Any, Iterator, List, Optional, Tuple
+from torch.utils.data import IterableDataset, get_worker_info
+from sciwing.data.line import Line
+import itertools
+import random
+import torch
+
+
+class StreamingDataset(IterableDataset):
+    def __init__(
+        self, filename: str, shuffle_buffer_size: int = 0, tokenize_batch_size: int = 256
+    ):
+        """ A dataset that reads its file one example at a time instead of holding
+        all the lines and labels in memory. Only the raw records of the file are
+        read ahead, and the lines are tokenized just before they are used.
+
+        When it is iterated over in a DataLoader with workers, every worker
+        tokenizes a different shard of the examples. The DataLoader
+        collates them as usual, so it works with the ``Engine``. The vocab of the
+        ``DatasetsManager`` is built with a counting pass over ``iter_lines_labels``
+
+        Parameters
+        ----------
+        filename : str
+            The file where the dataset is stored
+        shuffle_buffer_size : int
+            The number of records that are held in a buffer from which the
+            next example is drawn at random. The examples are not shuffled if
+            this is less than 2
+        tokenize_batch_size : int
+            The number of records whose lines are tokenized together with
+            ``tokenize_batch`` of the tokenizers
+        """
+        super(StreamingDataset, self).__init__()
+        self.filename = filename
+        self.shuffle_buffer_size = shuffle_buffer_size
+        self.tokenize_batch_size = tokenize_batch_size
+        self._num_examples: Optional[int] = None
+
+    @abstractmethod
+    def iter_records(self) -> Iterator[Any]:
+        """ Iterates over the records of the file in order. A record is whatever
+        is needed to make a line and a label, before the line is tokenized
+
+        Returns
+        -------
+        Iterator[Any]
+        """
+
+    @abstractmethod
+    def make_lines_labels(self, records: List[Any]) -> List[Tuple[Line, Any]]:
+        """ Makes the lines and the labels of a batch of records. The lines of
+        the batch are tokenized together
+
+        Parameters
+        ----------
+        records : List[Any]
+            Records from ``iter_records``
+
+        Returns
+        -------
+        List[Tuple[Line, Any]]
+        """
+
+    def make_line_label(self, record: Any) -> Tuple[Line, Any]:
+        """ Makes the line and the label of a record
+
+        Parameters
+        ----------
+        record : Any
+            A record from ``iter_records``
+
+        Returns
+        -------
+        Tuple[Line, Any]
+        """
+        return self.make_lines_labels([record])[0]
+
+    def iter_lines_labels(
+        self, shard_id: int = 0, num_shards: int = 1
+    ) -> Iterator[Tuple[Line, Any]]:
+        """ Iterates over the lines and labels of a shard of the dataset in file order
+
+        Parameters
+        ----------
+        shard_id : int
+            The shard that is iterated over. The examples at positions
+            ``shard_id``, ``shard_id + num_shards`` and so on form the shard
+        num_shards : int
+            The number of shards
+
+        Returns
+        -------
+        Iterator[Tuple[Line, Any]]
+        """
+        records = self._iter_shard_records(shard_id, num_shards)
+        yield from self._make_lines_labels_in_batches(records)
+
+    def iter_range_lines_labels(
+        self, start: int, end: Optional[int] = None
+    ) -> Iterator[Tuple[Line, Any]]:
+        """ Iterates over the lines and labels of the examples from ``start`` to ``end``
+        in file order. Only the records in the range are tokenized
+
+        Parameters
+        ----------
+        start : int
+            The position of the first example
+        end : Optional[int]
+            The position after the last example. The examples till the end of
+            the file are iterated over if it is None
+
+        Returns
+        -------
+        Iterator[Tuple[Line, Any]]
+        """
+        records = itertools.islice(self.iter_records(), start, end)
+        yield from self._make_lines_labels_in_batches(records)
+
+    def _make_lines_labels_in_batches(
+        self, records: Iterator[Any]
+    ) -> Iterator[Tuple[Line, Any]]:
+        batch_size = max(self.tokenize_batch_size, 1)
+        while True:
+            batch = list(itertools.islice(records, batch_size))
+            if len(batch) == 0:
+                return
+            yield from self.make_lines_labels(batch)
+
+    def _iter_shard_records(self, shard_id: int, num_shards: int) -> Iterator[Any]:
+        for idx, record in enumerate(self.iter_records()):
+            if idx % num_shards == shard_id:
+                yield record
+
+    def __iter__(self) -> Iterator[Tuple[Line, Any]]:
+        worker_info = get_worker_info()
+        if worker_info is None:
+            shard_id, num_shards = 0, 1
+        else:
+            shard_id, num_shards = worker_info.id, worker_info.num_workers
+
+        records = self._iter_shard_records(shard_id, num_shards)
+        if self.shuffle_buffer_size > 1:
+            # drawn from torch so that ``torch.manual_seed`` and the seeds of the
+            # DataLoader workers decide the order
+            seed = torch.empty((), dtype=torch.int64).random_().item()
+            records = shuffle_buffer(
+                records, self.shuffle_buffer_size, rng=random.Random(seed)
+            )
+
+        yield from self._make_lines_labels_in_batches(records)
+
+    def __len__(self) -> int:
+        # the records are only parsed and not tokenized to count them
+        if self._num_examples is None:
+            self._num_examples = sum(1 for _ in self.iter_records())
+        return self._num_examples
+
+
+def shuffle_buffer(
+    items: Iterator[Any], buffer_size: int, rng: random.Random
+) -> Iterator[Any]:
+    """ Shuffles a stream of items with a buffer of fixed size. Every item is
+    placed in the buffer and a random item of the full buffer is returned in its place
+
+    Parameters
+    ----------
+    items : Iterator[Any]
+        The stream of items
+    buffer_size : int
+        The number of items that are held in the buffer
+    rng : random.Random
+        The random number generator that chooses the items
+
+    Returns
+    -------
+    Iterator[Any]
+        The items of the stream in a shuffled order
+    """
+    buffer = []
+    for item in items:
+        if len(buffer) < buffer_size:
+            buffer.append(item)
+            continue
+        idx = rng.randrange(buffer_size)
+        yield buffer[idx]
+        buffer[idx] = item
+
+    rng.shuffle(buffer)
+    yield from buffer
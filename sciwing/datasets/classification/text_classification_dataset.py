@@ -1,6 +1,9 @@
-from typing import Dict, List, Any
-from sciwing.data.line import Line
+from typing import Dict, List, Any, Optional, Iterator, Tuple
+from sciwing.data.line import Line, make_lines
 from sciwing.data.label import Label
+from sciwing.data.columnar_lines import ColumnarLines, ColumnarLabels
+from sciwing.data.dataset_cache import DatasetCache
+from sciwing.data.streaming_dataset import StreamingDataset
 from sciwing.tokenizers.word_tokenizer import WordTokenizer
 from sciwing.tokenizers.character_tokenizer import CharacterTokenizer
 from torch.utils.data import Dataset
@@ -25,27 +28,69 @@ class TextClassificationDataset(BaseTextClassification, Dataset):
     """
 
     def __init__(
-        self, filename: str, tokenizers: Dict[str, BaseTokenizer] = WordTokenizer()
+        self,
+        filename: str,
+        tokenizers: Dict[str, BaseTokenizer] = WordTokenizer(),
+        columnar: bool = False,
+        cache_dir: Optional[str] = None,
     ):
+        """
+
+        Parameters
+        ----------
+        filename : str
+            The file where the dataset is stored
+        tokenizers : Dict[str, BaseTokenizer]
+            The mapping between namespace and a tokenizer
+        columnar : bool
+            If True, the lines are tokenized once and the tokens of every namespace
+            are stored as compact arrays of token ids. The ``Line`` and ``Label``
+            objects are created only when they are accessed
+        cache_dir : Optional[str]
+            If passed, the tokenized lines and labels are cached in this directory
+            and are loaded from it when the file and the tokenizers are unchanged.
+            Cached datasets are always columnar
+        """
         super().__init__(filename, tokenizers)
         self.filename = filename
         self.tokenizers = tokenizers
-        self.lines, self.labels = self.get_lines_labels()
+        self.cache_dir = cache_dir
+        self.columnar = columnar or cache_dir is not None
+        self.cache_key: Optional[str] = None
+
+        if self.cache_dir is None:
+            self.lines, self.labels = self.get_lines_labels()
+        else:
+            cache = DatasetCache(cache_dir=self.cache_dir)
+            self.cache_key = cache.get_dataset_key(
+                dataset_class=type(self).__name__,
+                filename=self.filename,
+                tokenizers=self.tokenizers,
+            )
+            self.lines, self.labels = cache.load_or_create_lines_labels(
+                key=self.cache_key,
+                tokenizers=self.tokenizers,
+                create=self.get_lines_labels,
+            )
 
     def get_lines_labels(self) -> (List[Line], List[Label]):
-        lines: List[Line] = []
-        labels: List[Label] = []
-
-        with open(self.filename) as fp:
-            for line in fp:
-                line, label = line.split("###")
-                line = line.strip()
-                label = label.strip()
-                line_instance = Line(text=line, tokenizers=self.tokenizers)
-                label_instance = Label(text=label)
-                lines.append(line_instance)
-                labels.append(label_instance)
+        texts: List[str] = []
+        label_texts: List[str] = []
+        for line, label in iter_text_classification_records(self.filename):
+            texts.append(line)
+            label_texts.append(label)
 
+        # all the lines are tokenized together, which is much faster for spacy
+        if self.columnar:
+            lines = ColumnarLines(tokenizers=self.tokenizers)
+            lines.extend(texts)
+            labels = ColumnarLabels()
+            for label in label_texts:
+                labels.append(label)
+            return lines, labels
+
+        lines = make_lines(texts, tokenizers=self.tokenizers)
+        labels = [Label(text=label) for label in label_texts]
         return lines, labels
 
     def __len__(self):
@@ -72,6 +117,63 @@ class TextClassificationDataset(BaseTextClassification, Dataset):
         self._labels = value
 
 
+class StreamingTextClassificationDataset(StreamingDataset):
+    def __init__(
+        self,
+        filename: str,
+        tokenizers: Dict[str, BaseTokenizer],
+        shuffle_buffer_size: int = 0,
+        tokenize_batch_size: int = 256,
+    ):
+        """ The streaming counterpart of ``TextClassificationDataset``. The lines
+        are read and tokenized as they are iterated over
+
+        Parameters
+        ----------
+        filename : str
+            The file where the dataset is stored
+        tokenizers : Dict[str, BaseTokenizer]
+            The mapping between namespace and a tokenizer
+        shuffle_buffer_size : int
+            The number of examples from which the next example is drawn at random
+        tokenize_batch_size : int
+            The number of lines that are tokenized together
+        """
+        super(StreamingTextClassificationDataset, self).__init__(
+            filename=filename,
+            shuffle_buffer_size=shuffle_buffer_size,
+            tokenize_batch_size=tokenize_batch_size,
+        )
+        self.tokenizers = tokenizers
+
+    def iter_records(self) -> Iterator[Tuple[str, str]]:
+        return iter_text_classification_records(self.filename)
+
+    def make_lines_labels(
+        self, records: List[Tuple[str, str]]
+    ) -> List[Tuple[Line, Label]]:
+        lines = make_lines([line for line, _ in records], tokenizers=self.tokenizers)
+        labels = [Label(text=label) for _, label in records]
+        return list(zip(lines, labels))
+
+
+def iter_text_classification_records(filename: str) -> Iterator[Tuple[str, str]]:
+    """ Iterates over the text and the label of every line of the file
+
+    Parameters
+    ----------
+    filename : str
+
+    Returns
+    -------
+    Iterator[Tuple[str, str]]
+    """
+    with open(filename) as fp:
+        for line in fp:
+            line, label = line.split("###")
+            yield line.strip(), label.strip()
+
+
 class TextClassificationDatasetManager(DatasetsManager, ClassNursery):
     def __init__(
         self,
@@ -82,6 +184,11 @@ class TextClassificationDatasetManager(DatasetsManager, ClassNursery):
         namespace_vocab_options: Dict[str, Dict[str, Any]] = None,
         namespace_numericalizer_map: Dict[str, BaseNumericalizer] = None,
         batch_size: int = 10,
+        columnar: bool = False,
+        cache_dir: Optional[str] = None,
+        num_vocab_workers: int = 0,
+        streaming: bool = False,
+        shuffle_buffer_size: int = 1000,
     ):
         self.train_filename = train_filename
         self.dev_filename = dev_filename
@@ -105,16 +212,43 @@ class TextClassificationDatasetManager(DatasetsManager, ClassNursery):
         }
         self.namespace_numericalizer_map["label"] = Numericalizer()
         self.batch_size = batch_size
+        self.columnar = columnar
+        self.cache_dir = cache_dir
+        self.streaming = streaming
 
-        self.train_dataset = TextClassificationDataset(
-            filename=self.train_filename, tokenizers=self.tokenizers
-        )
-        self.dev_dataset = TextClassificationDataset(
-            filename=self.dev_filename, tokenizers=self.tokenizers
-        )
-        self.test_dataset = TextClassificationDataset(
-            filename=self.test_filename, tokenizers=self.tokenizers
-        )
+        # streaming datasets are read and tokenized as they are iterated over.
+        # Only the training examples are shuffled
+        if streaming:
+            self.train_dataset = StreamingTextClassificationDataset(
+                filename=self.train_filename,
+                tokenizers=self.tokenizers,
+                shuffle_buffer_size=shuffle_buffer_size,
+            )
+            self.dev_dataset = StreamingTextClassificationDataset(
+                filename=self.dev_filename, tokenizers=self.tokenizers,
+            )
+            self.test_dataset = StreamingTextClassificationDataset(
+                filename=self.test_filename, tokenizers=self.tokenizers,
+            )
+        else:
+            self.train_dataset = TextClassificationDataset(
+                filename=self.train_filename,
+                tokenizers=self.tokenizers,
+                columnar=self.columnar,
+                cache_dir=self.cache_dir,
+            )
+            self.dev_dataset = TextClassificationDataset(
+                filename=self.dev_filename,
+                tokenizers=self.tokenizers,
+                columnar=self.columnar,
+                cache_dir=self.cache_dir,
+            )
+            self.test_dataset = TextClassificationDataset(
+                filename=self.test_filename,
+                tokenizers=self.tokenizers,
+                columnar=self.columnar,
+                cache_dir=self.cache_dir,
+            )
 
         super(TextClassificationDatasetManager, self).__init__(
             train_dataset=self.train_dataset,
@@ -123,4 +257,6 @@ class TextClassificationDatasetManager(DatasetsManager, ClassNursery):
             namespace_vocab_options=self.namespace_vocab_options,
             namespace_numericalizer_map=self.namespace_numericalizer_map,
             batch_size=batch_size,
+            cache_dir=self.cache_dir,
+            num_vocab_workers=num_vocab_workers,
         )
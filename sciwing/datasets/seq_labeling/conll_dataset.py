@@ -1,11 +1,14 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterator, Tuple
 from sciwing.tokenizers.BaseTokenizer import BaseTokenizer
 from sciwing.numericalizers.base_numericalizer import BaseNumericalizer
 from sciwing.tokenizers.word_tokenizer import WordTokenizer
 from sciwing.tokenizers.character_tokenizer import CharacterTokenizer
 from sciwing.numericalizers.numericalizer import Numericalizer
-from sciwing.data.line import Line
+from sciwing.data.line import Line, make_lines
 from sciwing.data.seq_label import SeqLabel
+from sciwing.data.columnar_lines import ColumnarLines, ColumnarSeqLabels
+from sciwing.data.dataset_cache import DatasetCache
+from sciwing.data.streaming_dataset import StreamingDataset
 from sciwing.utils.class_nursery import ClassNursery
 from sciwing.data.datasets_manager import DatasetsManager
 from sciwing.datasets.seq_labeling.base_seq_labeling import BaseSeqLabelingDataset
@@ -20,6 +23,8 @@ class CoNLLDataset(BaseSeqLabelingDataset, Dataset):
         tokenizers: Dict[str, BaseTokenizer],
         column_names: List[str] = None,
         train_only: Optional[str] = None,
+        columnar: bool = False,
+        cache_dir: Optional[str] = None,
     ):
         """ Dataset in CoNLL format
 
@@ -35,6 +40,14 @@ class CoNLLDataset(BaseSeqLabelingDataset, Dataset):
             You can pass one of ["pos", "dep", "ner"]
             If this is passed only those columns in CoNLL will be used
             And appropriate column names will be chosen
+        columnar : bool
+            If True, the lines are tokenized once and the tokens of every namespace
+            are stored as compact arrays of token ids. The ``Line`` and ``SeqLabel``
+            objects are created only when they are accessed
+        cache_dir : Optional[str]
+            If passed, the tokenized lines and labels are cached in this directory
+            and are loaded from it when the file, the tokenizers, the column names
+            and ``train_only`` are unchanged. Cached datasets are always columnar
         """
         super().__init__(filename, tokenizers)
         if column_names is None:
@@ -45,64 +58,58 @@ class CoNLLDataset(BaseSeqLabelingDataset, Dataset):
         self.tokenizers = tokenizers
         self.column_names = column_names
         self.train_only = train_only
-        self.lines, self.labels = self.get_lines_labels()
+        self.cache_dir = cache_dir
+        self.columnar = columnar or cache_dir is not None
+        self.cache_key: Optional[str] = None
 
-    def get_lines_labels(self) -> (List[Line], List[SeqLabel]):
-        lines: List[Line] = []
-        labels: List[SeqLabel] = []
-        with open(self.filename) as fp:
-            lines_: List[str] = []
-            labels_: List[List[str]] = []  # every list is a label for one namespace
-            for text in fp:
-                text_ = text.strip()
-                if bool(text_):
-                    line_labels = text_.split()
-                    line_ = line_labels[0]
-                    label_ = line_labels[1:]  # all 3 tags
-                    lines_.append(line_)
-                    labels_.append(label_)
-                elif "DOCSTART" in text_:
-                    # skip next empty line as well
-                    next(fp)
-                else:
-                    if len(lines_) > 0 and len(labels_) > 0:
-                        sentence = " ".join(lines_)
-                        line, label = self._form_line_label(
-                            text=sentence, labels=labels_
-                        )
-                        lines.append(line)
-                        labels.append(label)
-                        lines_ = []
-                        labels_ = []
-            # handle the case when there is only one example without any new line
-            else:
-                if len(lines_) > 0 and len(lines) == 0:
-                    text_ = " ".join(lines_)
-                    line, label = self._form_line_label(text=text_, labels=labels_)
-                    lines.append(line)
-                    labels.append(label)
+        if self.cache_dir is None:
+            self.lines, self.labels = self.get_lines_labels()
+        else:
+            cache = DatasetCache(cache_dir=self.cache_dir)
+            self.cache_key = cache.get_dataset_key(
+                dataset_class=type(self).__name__,
+                filename=self.filename,
+                tokenizers=self.tokenizers,
+                column_names=self.column_names,
+                train_only=self.train_only,
+            )
+            self.lines, self.labels = cache.load_or_create_lines_labels(
+                key=self.cache_key,
+                tokenizers=self.tokenizers,
+                create=self.get_lines_labels,
+            )
 
-        return lines, labels
+    def get_label_namespaces(self) -> List[str]:
+        return get_conll_label_namespaces(
+            column_names=self.column_names, train_only=self.train_only
+        )
 
-    def _form_line_label(self, text: str, labels: List[str]):
-        line = Line(text=text, tokenizers=self.tokenizers)
-        labels_ = zip(*labels)
-        labels_ = zip(self.column_names, labels_)
-        labels_ = dict(labels_)
-        if self.train_only:
-            if self.train_only == "pos":
-                column_index = 0
-            elif self.train_only == "dep":
-                column_index = 1
-            elif self.train_only == "ner":
-                column_index = 2
-            else:
-                raise ValueError(f"train_only parameter can be one of [pos, dep, ner]")
+    def get_lines_labels(self) -> (List[Line], List[SeqLabel]):
+        label_namespaces = self.get_label_namespaces()
+        texts: List[str] = []
+        namespace_labels: List[Dict[str, List[str]]] = []
+        for sentence, labels_ in iter_conll_records(self.filename):
+            texts.append(sentence)
+            namespace_labels.append(
+                get_conll_labels(
+                    column_names=self.column_names,
+                    label_namespaces=label_namespaces,
+                    labels=labels_,
+                )
+            )
 
-            column_name = self.column_names[column_index]
-            labels_ = {column_name: labels_[column_name]}
-        label = SeqLabel(labels=labels_)
-        return line, label
+        # all the lines are tokenized together, which is much faster for spacy
+        if self.columnar:
+            lines = ColumnarLines(tokenizers=self.tokenizers)
+            lines.extend(texts)
+            labels = ColumnarSeqLabels(namespaces=label_namespaces)
+            for label in namespace_labels:
+                labels.append(label)
+            return lines, labels
+
+        lines = make_lines(texts, tokenizers=self.tokenizers)
+        labels = [SeqLabel(labels=label) for label in namespace_labels]
+        return lines, labels
 
     def __len__(self):
         return len(self.lines)
@@ -113,6 +120,141 @@ class CoNLLDataset(BaseSeqLabelingDataset, Dataset):
         return line, label
 
 
+class StreamingCoNLLDataset(StreamingDataset):
+    def __init__(
+        self,
+        filename: str,
+        tokenizers: Dict[str, BaseTokenizer],
+        column_names: List[str] = None,
+        train_only: Optional[str] = None,
+        shuffle_buffer_size: int = 0,
+        tokenize_batch_size: int = 256,
+    ):
+        """ The streaming counterpart of ``CoNLLDataset``. The sentences are read
+        and tokenized as they are iterated over
+
+        Parameters
+        ----------
+        filename : str
+            The CONLL filename
+        tokenizers : Dict[str, BaseTokenizer]
+        column_names: List[str]
+            A list of column names for the three labels in the CoNLL format
+            If this is not provided then we will use ["label_1", "label_2", "label_3"]
+        train_only: str
+            You can pass one of ["pos", "dep", "ner"]
+            If this is passed only those columns in CoNLL will be used
+        shuffle_buffer_size : int
+            The number of sentences from which the next sentence is drawn at random
+        tokenize_batch_size : int
+            The number of lines that are tokenized together
+        """
+        super(StreamingCoNLLDataset, self).__init__(
+            filename=filename,
+            shuffle_buffer_size=shuffle_buffer_size,
+            tokenize_batch_size=tokenize_batch_size,
+        )
+        if column_names is None:
+            column_names = ["label_1", "label_2", "label_3"]
+        assert len(column_names) == 3
+
+        self.tokenizers = tokenizers
+        self.column_names = column_names
+        self.train_only = train_only
+        self.label_namespaces = get_conll_label_namespaces(
+            column_names=self.column_names, train_only=self.train_only
+        )
+
+    def iter_records(self) -> Iterator[Tuple[str, List[List[str]]]]:
+        return iter_conll_records(self.filename)
+
+    def make_lines_labels(
+        self, records: List[Tuple[str, List[List[str]]]]
+    ) -> List[Tuple[Line, SeqLabel]]:
+        lines = make_lines(
+            [sentence for sentence, _ in records], tokenizers=self.tokenizers
+        )
+        labels = []
+        for _, labels_ in records:
+            labels_ = get_conll_labels(
+                column_names=self.column_names,
+                label_namespaces=self.label_namespaces,
+                labels=labels_,
+            )
+            labels.append(SeqLabel(labels=labels_))
+        return list(zip(lines, labels))
+
+
+def iter_conll_records(filename: str) -> Iterator[Tuple[str, List[List[str]]]]:
+    """ Iterates over the sentences of a CoNLL file
+
+    Parameters
+    ----------
+    filename : str
+
+    Returns
+    -------
+    Iterator[Tuple[str, List[List[str]]]]
+        The words of the sentence joined by space and a list of the
+        labels of every word
+    """
+    num_sentences = 0
+    with open(filename) as fp:
+        lines_: List[str] = []
+        labels_: List[List[str]] = []  # every list is a label for one namespace
+        for text in fp:
+            text_ = text.strip()
+            if bool(text_):
+                line_labels = text_.split()
+                line_ = line_labels[0]
+                label_ = line_labels[1:]  # all 3 tags
+                lines_.append(line_)
+                labels_.append(label_)
+            elif "DOCSTART" in text_:
+                # skip next empty line as well
+                next(fp)
+            else:
+                if len(lines_) > 0 and len(labels_) > 0:
+                    yield " ".join(lines_), labels_
+                    num_sentences += 1
+                    lines_ = []
+                    labels_ = []
+        # handle the case when there is only one example without any new line
+        else:
+            if len(lines_) > 0 and num_sentences == 0:
+                yield " ".join(lines_), labels_
+
+
+def get_conll_label_namespaces(
+    column_names: List[str], train_only: Optional[str] = None
+) -> List[str]:
+    """ Returns the columns of the CoNLL file that are used as labels
+    """
+    if not train_only:
+        return column_names
+
+    if train_only == "pos":
+        column_index = 0
+    elif train_only == "dep":
+        column_index = 1
+    elif train_only == "ner":
+        column_index = 2
+    else:
+        raise ValueError(f"train_only parameter can be one of [pos, dep, ner]")
+    return [column_names[column_index]]
+
+
+def get_conll_labels(
+    column_names: List[str], label_namespaces: List[str], labels: List[List[str]]
+) -> Dict[str, List[str]]:
+    """ Returns the labels of the words of a sentence for every label namespace
+    """
+    labels_ = zip(*labels)
+    labels_ = zip(column_names, labels_)
+    labels_ = dict(labels_)
+    return {column_name: list(labels_[column_name]) for column_name in label_namespaces}
+
+
 class CoNLLDatasetManager(DatasetsManager, ClassNursery):
     def __init__(
         self,
@@ -125,6 +267,11 @@ class CoNLLDatasetManager(DatasetsManager, ClassNursery):
         batch_size=10,
         column_names: List[str] = None,
         train_only: Optional[str] = None,
+        columnar: bool = False,
+        cache_dir: Optional[str] = None,
+        num_vocab_workers: int = 0,
+        streaming: bool = False,
+        shuffle_buffer_size: int = 1000,
     ):
 
         self.train_filename = train_filename
@@ -163,6 +310,9 @@ class CoNLLDatasetManager(DatasetsManager, ClassNursery):
         }
 
         self.batch_size = batch_size
+        self.columnar = columnar
+        self.cache_dir = cache_dir
+        self.streaming = streaming
 
         if column_names is None:
             column_names = ["label_1", "label_2", "label_3"]
@@ -179,26 +329,55 @@ class CoNLLDatasetManager(DatasetsManager, ClassNursery):
         for column_name in valid_column_names:
             self.namespace_numericalizer_map[column_name] = Numericalizer()
 
-        self.train_dataset = CoNLLDataset(
-            filename=self.train_filename,
-            tokenizers=self.tokenizers,
-            column_names=column_names,
-            train_only=train_only,
-        )
+        # streaming datasets are read and tokenized as they are iterated over.
+        # Only the training examples are shuffled
+        if streaming:
+            self.train_dataset = StreamingCoNLLDataset(
+                filename=self.train_filename,
+                tokenizers=self.tokenizers,
+                column_names=column_names,
+                train_only=train_only,
+                shuffle_buffer_size=shuffle_buffer_size,
+            )
+            self.dev_dataset = StreamingCoNLLDataset(
+                filename=self.dev_filename,
+                tokenizers=self.tokenizers,
+                column_names=column_names,
+                train_only=train_only,
+            )
+            self.test_dataset = StreamingCoNLLDataset(
+                filename=self.test_filename,
+                tokenizers=self.tokenizers,
+                column_names=column_names,
+                train_only=train_only,
+            )
+        else:
+            self.train_dataset = CoNLLDataset(
+                filename=self.train_filename,
+                tokenizers=self.tokenizers,
+                column_names=column_names,
+                train_only=train_only,
+                columnar=self.columnar,
+                cache_dir=self.cache_dir,
+            )
 
-        self.dev_dataset = CoNLLDataset(
-            filename=self.dev_filename,
-            tokenizers=self.tokenizers,
-            column_names=column_names,
-            train_only=train_only,
-        )
+            self.dev_dataset = CoNLLDataset(
+                filename=self.dev_filename,
+                tokenizers=self.tokenizers,
+                column_names=column_names,
+                train_only=train_only,
+                columnar=self.columnar,
+                cache_dir=self.cache_dir,
+            )
 
-        self.test_dataset = CoNLLDataset(
-            filename=self.test_filename,
-            tokenizers=self.tokenizers,
-            column_names=column_names,
-            train_only=train_only,
-        )
+            self.test_dataset = CoNLLDataset(
+                filename=self.test_filename,
+                tokenizers=self.tokenizers,
+                column_names=column_names,
+                train_only=train_only,
+                columnar=self.columnar,
+                cache_dir=self.cache_dir,
+            )
 
         super(CoNLLDatasetManager, self).__init__(
             train_dataset=self.train_dataset,
@@ -207,4 +386,6 @@ class CoNLLDatasetManager(DatasetsManager, ClassNursery):
             namespace_vocab_options=self.namespace_vocab_options,
             namespace_numericalizer_map=self.namespace_numericalizer_map,
             batch_size=batch_size,
+            cache_dir=self.cache_dir,
+            num_vocab_workers=num_vocab_workers,
         )
@@ -3,13 +3,14 @@ from sciwing.data.seq_label import SeqLabel
 from sciwing.datasets.seq_labeling.base_seq_labeling import BaseSeqLabelingDataset
 from sciwing.numericalizers.numericalizer import Numericalizer
 from torch.utils.data import Dataset
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 from sciwing.tokenizers.BaseTokenizer import BaseTokenizer
 from sciwing.tokenizers.word_tokenizer import WordTokenizer
 from sciwing.tokenizers.character_tokenizer import CharacterTokenizer
 from sciwing.numericalizers.base_numericalizer import BaseNumericalizer
 from sciwing.utils.class_nursery import ClassNursery
 from sciwing.data.datasets_manager import DatasetsManager
+from sciwing.data.dataset_cache import DatasetCache
 import copy
 
 
@@ -19,6 +20,7 @@ class ConllYagoDataset(BaseSeqLabelingDataset, Dataset):
         filename: str,
         tokenizers: Dict[str, BaseTokenizer],
         column_names: List[str] = None,
+        cache_dir: Optional[str] = None,
     ):
         """
 
@@ -29,6 +31,10 @@ class ConllYagoDataset(BaseSeqLabelingDataset, Dataset):
             A mapping between
         column_names : List[str]
         Maximum one column for NER.
+        cache_dir : Optional[str]
+            If passed, the tokenized lines and labels are cached in this directory
+            and are loaded from it when the file, the tokenizers and the column names
+            are unchanged. The lines with context are pickled
         """
         super().__init__(filename, tokenizers)
         if column_names is None:
@@ -37,7 +43,24 @@ class ConllYagoDataset(BaseSeqLabelingDataset, Dataset):
         self.filename = filename
         self.tokenizers = tokenizers
         self.column_names = column_names
-        self.lines, self.labels = self.get_lines_labels()
+        self.cache_dir = cache_dir
+        self.cache_key: Optional[str] = None
+
+        if self.cache_dir is None:
+            self.lines, self.labels = self.get_lines_labels()
+        else:
+            cache = DatasetCache(cache_dir=self.cache_dir)
+            self.cache_key = cache.get_dataset_key(
+                dataset_class=type(self).__name__,
+                filename=self.filename,
+                tokenizers=self.tokenizers,
+                column_names=self.column_names,
+            )
+            self.lines, self.labels = cache.load_or_create_lines_labels(
+                key=self.cache_key,
+                tokenizers=self.tokenizers,
+                create=self.get_lines_labels,
+            )
 
     def get_lines_labels(self) -> (List[LineWithContext], List[SeqLabel]):
         lines: List[LineWithContext] = []
@@ -111,6 +134,8 @@ class ConllYagoDatasetsManager(DatasetsManager, ClassNursery):
         namespace_numericalizer_map: Dict[str, BaseNumericalizer] = None,
         batch_size=10,
         column_names: List[str] = None,
+        cache_dir: Optional[str] = None,
+        num_vocab_workers: int = 0,
     ):
         self.train_filename = train_filename
         self.dev_filename = dev_filename
@@ -144,6 +169,7 @@ class ConllYagoDatasetsManager(DatasetsManager, ClassNursery):
         }
 
         self.batch_size = batch_size
+        self.cache_dir = cache_dir
 
         if column_names is None:
             column_names = ["NER"]
@@ -155,18 +181,21 @@ class ConllYagoDatasetsManager(DatasetsManager, ClassNursery):
             filename=self.train_filename,
             tokenizers=self.tokenizers,
             column_names=column_names,
+            cache_dir=self.cache_dir,
         )
 
         self.dev_dataset = ConllYagoDataset(
             filename=self.dev_filename,
             tokenizers=self.tokenizers,
             column_names=column_names,
+            cache_dir=self.cache_dir,
         )
 
         self.test_dataset = ConllYagoDataset(
             filename=self.test_filename,
             tokenizers=self.tokenizers,
             column_names=column_names,
+            cache_dir=self.cache_dir,
         )
 
         super(ConllYagoDatasetsManager, self).__init__(
@@ -176,4 +205,6 @@ class ConllYagoDatasetsManager(DatasetsManager, ClassNursery):
             namespace_vocab_options=self.namespace_vocab_options,
             namespace_numericalizer_map=self.namespace_numericalizer_map,
             batch_size=batch_size,
+            cache_dir=self.cache_dir,
+            num_vocab_workers=num_vocab_workers,
         )
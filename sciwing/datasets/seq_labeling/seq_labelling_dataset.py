@@ -5,9 +5,12 @@ from sciwing.tokenizers.word_tokenizer import WordTokenizer
 from sciwing.tokenizers.character_tokenizer import CharacterTokenizer
 from sciwing.numericalizers.base_numericalizer import BaseNumericalizer
 from sciwing.numericalizers.numericalizer import Numericalizer
-from typing import Dict, List, Any
-from sciwing.data.line import Line
+from typing import Dict, List, Any, Optional, Iterator, Tuple
+from sciwing.data.line import Line, make_lines
 from sciwing.data.seq_label import SeqLabel
+from sciwing.data.columnar_lines import ColumnarLines, ColumnarSeqLabels
+from sciwing.data.dataset_cache import DatasetCache
+from sciwing.data.streaming_dataset import StreamingDataset
 from sciwing.data.datasets_manager import DatasetsManager
 
 
@@ -21,36 +24,70 @@ class SeqLabellingDataset(BaseSeqLabelingDataset, Dataset):
         .
     """
 
-    def __init__(self, filename: str, tokenizers: Dict[str, BaseTokenizer]):
+    def __init__(
+        self,
+        filename: str,
+        tokenizers: Dict[str, BaseTokenizer],
+        columnar: bool = False,
+        cache_dir: Optional[str] = None,
+    ):
+        """
+
+        Parameters
+        ----------
+        filename : str
+            The file where the dataset is stored
+        tokenizers : Dict[str, BaseTokenizer]
+            The mapping between namespace and a tokenizer
+        columnar : bool
+            If True, the lines are tokenized once and the tokens of every namespace
+            are stored as compact arrays of token ids. The ``Line`` and ``SeqLabel``
+            objects are created only when they are accessed
+        cache_dir : Optional[str]
+            If passed, the tokenized lines and labels are cached in this directory
+            and are loaded from it when the file and the tokenizers are unchanged.
+            Cached datasets are always columnar
+        """
         super().__init__(filename, tokenizers)
         self.filename = filename
         self.tokenizers = tokenizers
-        self.lines, self.labels = self.get_lines_labels()
+        self.cache_dir = cache_dir
+        self.columnar = columnar or cache_dir is not None
+        self.cache_key: Optional[str] = None
+
+        if self.cache_dir is None:
+            self.lines, self.labels = self.get_lines_labels()
+        else:
+            cache = DatasetCache(cache_dir=self.cache_dir)
+            self.cache_key = cache.get_dataset_key(
+                dataset_class=type(self).__name__,
+                filename=self.filename,
+                tokenizers=self.tokenizers,
+            )
+            self.lines, self.labels = cache.load_or_create_lines_labels(
+                key=self.cache_key,
+                tokenizers=self.tokenizers,
+                create=self.get_lines_labels,
+            )
 
     def get_lines_labels(self) -> (List[Line], List[SeqLabel]):
-        lines: List[Line] = []
-        labels: List[SeqLabel] = []
-
-        with open(self.filename, "r", encoding="utf-8") as fp:
-            for line in fp:
-                line = line.strip()
-                if not bool(line):
-                    continue
-                lines_and_labels = line.strip().split(" ")
-                words: List[str] = []
-                word_labels: List[str] = []
-                for word_line_labels in lines_and_labels:
-                    word, word_label = word_line_labels.split("###")
-                    word = word.strip()
-                    word_label = word_label.strip()
-                    words.append(word)
-                    word_labels.append(word_label)
-
-                line = Line(text=" ".join(words), tokenizers=self.tokenizers)
-                label = SeqLabel(labels={"seq_label": word_labels})
-                lines.append(line)
+        texts: List[str] = []
+        namespace_labels: List[Dict[str, List[str]]] = []
+        for words, word_labels in iter_seq_labelling_records(self.filename):
+            texts.append(" ".join(words))
+            namespace_labels.append({"seq_label": word_labels})
+
+        # all the lines are tokenized together, which is much faster for spacy
+        if self.columnar:
+            lines = ColumnarLines(tokenizers=self.tokenizers)
+            lines.extend(texts)
+            labels = ColumnarSeqLabels(namespaces=["seq_label"])
+            for label in namespace_labels:
                 labels.append(label)
+            return lines, labels
 
+        lines = make_lines(texts, tokenizers=self.tokenizers)
+        labels = [SeqLabel(labels=label) for label in namespace_labels]
         return lines, labels
 
     def __len__(self):
@@ -61,6 +98,78 @@ class SeqLabellingDataset(BaseSeqLabelingDataset, Dataset):
         return line, label
 
 
+class StreamingSeqLabellingDataset(StreamingDataset):
+    def __init__(
+        self,
+        filename: str,
+        tokenizers: Dict[str, BaseTokenizer],
+        shuffle_buffer_size: int = 0,
+        tokenize_batch_size: int = 256,
+    ):
+        """ The streaming counterpart of ``SeqLabellingDataset``. The lines
+        are read and tokenized as they are iterated over
+
+        Parameters
+        ----------
+        filename : str
+            The file where the dataset is stored
+        tokenizers : Dict[str, BaseTokenizer]
+            The mapping between namespace and a tokenizer
+        shuffle_buffer_size : int
+            The number of examples from which the next example is drawn at random
+        tokenize_batch_size : int
+            The number of lines that are tokenized together
+        """
+        super(StreamingSeqLabellingDataset, self).__init__(
+            filename=filename,
+            shuffle_buffer_size=shuffle_buffer_size,
+            tokenize_batch_size=tokenize_batch_size,
+        )
+        self.tokenizers = tokenizers
+
+    def iter_records(self) -> Iterator[Tuple[List[str], List[str]]]:
+        return iter_seq_labelling_records(self.filename)
+
+    def make_lines_labels(
+        self, records: List[Tuple[List[str], List[str]]]
+    ) -> List[Tuple[Line, SeqLabel]]:
+        texts = [" ".join(words) for words, _ in records]
+        lines = make_lines(texts, tokenizers=self.tokenizers)
+        labels = [
+            SeqLabel(labels={"seq_label": word_labels}) for _, word_labels in records
+        ]
+        return list(zip(lines, labels))
+
+
+def iter_seq_labelling_records(filename: str,) -> Iterator[Tuple[List[str], List[str]]]:
+    """ Iterates over the words and the labels of the words of every non empty
+    line of the file
+
+    Parameters
+    ----------
+    filename : str
+
+    Returns
+    -------
+    Iterator[Tuple[List[str], List[str]]]
+    """
+    with open(filename, "r", encoding="utf-8") as fp:
+        for line in fp:
+            line = line.strip()
+            if not bool(line):
+                continue
+            lines_and_labels = line.strip().split(" ")
+            words: List[str] = []
+            word_labels: List[str] = []
+            for word_line_labels in lines_and_labels:
+                word, word_label = word_line_labels.split("###")
+                word = word.strip()
+                word_label = word_label.strip()
+                words.append(word)
+                word_labels.append(word_label)
+            yield words, word_labels
+
+
 class SeqLabellingDatasetManager(DatasetsManager):
     def __init__(
         self,
@@ -71,6 +180,11 @@ class SeqLabellingDatasetManager(DatasetsManager):
         namespace_vocab_options: Dict[str, Dict[str, Any]] = None,
         namespace_numericalizer_map: Dict[str, BaseNumericalizer] = None,
         batch_size: int = 10,
+        columnar: bool = False,
+        cache_dir: Optional[str] = None,
+        num_vocab_workers: int = 0,
+        streaming: bool = False,
+        shuffle_buffer_size: int = 1000,
     ):
 
         self.train_filename = train_filename
@@ -95,18 +209,45 @@ class SeqLabellingDatasetManager(DatasetsManager):
         self.namespace_numericalizer_map["seq_label"] = Numericalizer()
 
         self.batch_size = batch_size
+        self.columnar = columnar
+        self.cache_dir = cache_dir
+        self.streaming = streaming
 
-        self.train_dataset = SeqLabellingDataset(
-            filename=self.train_filename, tokenizers=self.tokenizers
-        )
+        # streaming datasets are read and tokenized as they are iterated over.
+        # Only the training examples are shuffled
+        if streaming:
+            self.train_dataset = StreamingSeqLabellingDataset(
+                filename=self.train_filename,
+                tokenizers=self.tokenizers,
+                shuffle_buffer_size=shuffle_buffer_size,
+            )
+            self.dev_dataset = StreamingSeqLabellingDataset(
+                filename=self.dev_filename, tokenizers=self.tokenizers,
+            )
+            self.test_dataset = StreamingSeqLabellingDataset(
+                filename=self.test_filename, tokenizers=self.tokenizers,
+            )
+        else:
+            self.train_dataset = SeqLabellingDataset(
+                filename=self.train_filename,
+                tokenizers=self.tokenizers,
+                columnar=self.columnar,
+                cache_dir=self.cache_dir,
+            )
 
-        self.dev_dataset = SeqLabellingDataset(
-            filename=self.dev_filename, tokenizers=self.tokenizers
-        )
+            self.dev_dataset = SeqLabellingDataset(
+                filename=self.dev_filename,
+                tokenizers=self.tokenizers,
+                columnar=self.columnar,
+                cache_dir=self.cache_dir,
+            )
 
-        self.test_dataset = SeqLabellingDataset(
-            filename=self.test_filename, tokenizers=self.tokenizers
-        )
+            self.test_dataset = SeqLabellingDataset(
+                filename=self.test_filename,
+                tokenizers=self.tokenizers,
+                columnar=self.columnar,
+                cache_dir=self.cache_dir,
+            )
 
         super(SeqLabellingDatasetManager, self).__init__(
             train_dataset=self.train_dataset,
@@ -115,4 +256,6 @@ class SeqLabellingDatasetManager(DatasetsManager):
             namespace_vocab_options=self.namespace_vocab_options,
             namespace_numericalizer_map=self.namespace_numericalizer_map,
             batch_size=batch_size,
+            cache_dir=self.cache_dir,
+            num_vocab_workers=num_vocab_workers,
         )
@@ -1,9 +1,9 @@
-from torch.utils.data import Dataset
+from torch.utils.data import Dataset, IterableDataset
 from torch.utils.data import DataLoader
 import torch.nn as nn
 import torch.optim as optim
 from wasabi import Printer
-from typing import Iterator, Any, Optional, Dict, Union
+from typing import Iterator, Any, Optional, Dict, Union, List
 from sciwing.meters.loss_meter import LossMeter
 from sciwing.data.datasets_manager import DatasetsManager
 from tensorboardX import SummaryWriter
@@ -14,6 +14,8 @@ import logging
 import torch
 from torch.utils.data.sampler import SubsetRandomSampler
 from sciwing.utils.class_nursery import ClassNursery
+from sciwing.data.bucket_batch_sampler import BucketBatchSampler, get_line_lengths
+from sciwing.data.batch_collate import Batch, NumericalizingCollate
 import logzero
 import hashlib
 import pathlib
@@ -51,6 +53,15 @@ class Engine(ClassNursery):
         use_wandb: bool = False,
         sample_proportion: float = 1.0,
         seeds: Dict[str, int] = None,
+        use_bucket_sampler: bool = False,
+        bucket_namespace: str = "tokens",
+        bucket_size_multiplier: int = 50,
+        calc_train_metrics: bool = True,
+        num_workers: int = 0,
+        pin_memory: Optional[bool] = None,
+        prefetch_factor: int = 2,
+        persistent_workers: bool = False,
+        collate_namespaces: Optional[List[str]] = None,
     ):
         """ Engine runs the models end to end. It iterates through the train dataset and passes
         it through the model. During training it helps in tracking a lot of parameters for the run
@@ -122,6 +133,39 @@ class Engine(ClassNursery):
             Set the random_seed, pytorch_seed and numpy_seed
             Found in
             https://github.com/allenai/allennlp/blob/master/allennlp/common/util.py
+        use_bucket_sampler: bool
+            If True, the lines of similar lengths are batched together using
+            ``BucketBatchSampler``. This reduces the padding in every batch.
+            It is not used for streaming datasets
+        bucket_namespace: str
+            The namespace of the tokens used to calculate the length of the lines
+            for bucketing
+        bucket_size_multiplier: int
+            The number of batches that are sorted together by length
+        calc_train_metrics: bool
+            If False, the ``train_metric`` is not calculated for the training batches.
+            Models with a ``decode_during_training`` attribute, like
+            ``RnnSeqCrfTagger``, then skip decoding the training batches
+        num_workers: int
+            The number of worker processes that load and collate the batches.
+            If 0, the batches are loaded in the main process
+        pin_memory: Optional[bool]
+            If True, the tensors of the batches are copied into pinned memory.
+            It defaults to True only if the ``device`` is a cuda device
+        prefetch_factor: int
+            The number of batches loaded in advance by every worker
+        persistent_workers: bool
+            If True, the workers are not shut down at the end of every epoch
+        collate_namespaces: Optional[List[str]]
+            If passed, the batches are collated with ``NumericalizingCollate`` instead
+            of ``collate_fn``. The tokens of these namespaces are numericalized and
+            padded in the workers. The vocab of every namespace should have the start,
+            end, pad and unk tokens. The tensors are used by ``TrainableWordEmbedder``
+            and ``CharEmbedder`` for the word tokens and by ``SimpleTagger``,
+            ``RnnSeqCrfTagger`` and ``TokenClassificationAccuracy`` for the tags.
+            ``WordEmbedder`` looks up the embeddings by the text of the tokens and the
+            labels of ``SimpleClassifier`` and ``PrecisionRecallFMeasure`` have no
+            special tokens, so these do not benefit from it
         """
 
         if isinstance(device, str):
@@ -163,6 +207,32 @@ class Engine(ClassNursery):
         self.use_wandb = wandb and use_wandb
         self.sample_proportion = sample_proportion
         self.label_namespaces = self.datasets_manager.label_namespaces
+        self.use_bucket_sampler = use_bucket_sampler
+        self.bucket_namespace = bucket_namespace
+        self.bucket_size_multiplier = bucket_size_multiplier
+        self.calc_train_metrics = calc_train_metrics
+        if hasattr(self.model, "decode_during_training"):
+            self.model.decode_during_training = self.calc_train_metrics
+        self.num_workers = num_workers
+        self.pin_memory = (
+            self.device.type == "cuda" if pin_memory is None else pin_memory
+        )
+        self.prefetch_factor = prefetch_factor
+        self.persistent_workers = persistent_workers
+        self.collate_namespaces = collate_namespaces
+        for namespace in self.collate_namespaces or []:
+            vocab = self.datasets_manager.namespace_to_vocab[namespace]
+            if not vocab.include_special_vocab:
+                raise ValueError(
+                    f"The vocab of {namespace} does not have the start, end, pad "
+                    f"and unk tokens. It cannot be in collate_namespaces"
+                )
+        if self.collate_namespaces:
+            self.collate_fn = NumericalizingCollate(
+                namespace_to_numericalizer=self.datasets_manager.namespace_to_numericalizer,
+                namespaces=self.collate_namespaces,
+                label_namespaces=self.label_namespaces,
+            )
         self.datasets_manager.print_stats()
 
         if experiment_name is None:
@@ -187,12 +257,17 @@ class Engine(ClassNursery):
         with open(self.save_dir.joinpath("hyperparams.json"), "w") as fp:
             json.dump(self.experiment_hyperparams, fp)
 
-        self.num_workers = 1
+        # the vocab and tokenizers are stored with the model so that
+        # the model can be used for inference without the datasets
+        self.datasets_manager.save_for_inference(
+            self.save_dir.joinpath("datasets_manager")
+        )
+
         self.model.to(self.device)
 
         self.train_loader = self.get_loader(self.train_dataset)
-        self.validation_loader = self.get_loader(self.validation_dataset)
-        self.test_loader = self.get_loader(self.test_dataset)
+        self.validation_loader = self.get_loader(self.validation_dataset, shuffle=False)
+        self.test_loader = self.get_loader(self.test_dataset, shuffle=False)
 
         # refresh the iters at the beginning of every epoch
         self.train_iter = None
@@ -244,12 +319,15 @@ class Engine(ClassNursery):
                     f"You are optimizing for micro_fscore and lr scheduler mode is min instead of max"
                 )
 
-    def get_loader(self, dataset: Dataset) -> DataLoader:
+    def get_loader(self, dataset: Dataset, shuffle: bool = True) -> DataLoader:
         """ Returns the DataLoader for the Dataset
 
         Parameters
         ----------
         dataset : Dataset
+        shuffle : bool
+            If False, the bucketed batches are formed from the lines sorted by length
+            in a deterministic order. This is used for the validation and test datasets
 
         Returns
         -------
@@ -257,17 +335,57 @@ class Engine(ClassNursery):
             A pytorch DataLoader
 
         """
+        # the prefetching and persistence of workers are only valid with workers
+        worker_options = {}
+        if self.num_workers > 0:
+            worker_options = {
+                "prefetch_factor": self.prefetch_factor,
+                "persistent_workers": self.persistent_workers,
+            }
+
+        if isinstance(dataset, IterableDataset):
+            # streaming datasets shuffle and shard the examples themselves, so
+            # they are neither sampled nor bucketed
+            return DataLoader(
+                dataset=dataset,
+                batch_size=self.batch_size,
+                num_workers=self.num_workers,
+                collate_fn=self.collate_fn,
+                pin_memory=self.pin_memory,
+                **worker_options,
+            )
+
         dataset_size = len(dataset)
         sample_size = int(np.floor(dataset_size * self.sample_proportion))
         indices = np.random.choice(range(dataset_size), size=sample_size, replace=False)
+
+        if self.use_bucket_sampler:
+            batch_sampler = BucketBatchSampler(
+                lengths=get_line_lengths(dataset, namespace=self.bucket_namespace),
+                batch_size=self.batch_size,
+                indices=indices if shuffle else np.sort(indices),
+                bucket_size_multiplier=self.bucket_size_multiplier,
+                shuffle=shuffle,
+            )
+            loader = DataLoader(
+                dataset=dataset,
+                num_workers=self.num_workers,
+                collate_fn=self.collate_fn,
+                pin_memory=self.pin_memory,
+                batch_sampler=batch_sampler,
+                **worker_options,
+            )
+            return loader
+
         sampler = SubsetRandomSampler(indices=indices)
         loader = DataLoader(
             dataset=dataset,
             batch_size=self.batch_size,
             num_workers=self.num_workers,
             collate_fn=self.collate_fn,
-            pin_memory=True,
+            pin_memory=self.pin_memory,
             sampler=sampler,
+            **worker_options,
         )
         return loader
 
@@ -353,10 +471,7 @@ class Engine(ClassNursery):
         while True:
             try:
                 # N*T, N * 1, N * 1
-                lines_labels = next(train_iter)
-                lines_labels = list(zip(*lines_labels))
-                lines = lines_labels[0]
-                labels = lines_labels[1]
+                lines, labels = self.get_lines_labels(next(train_iter))
                 batch_size = len(lines)
 
                 model_forward_out = self.model(
@@ -366,9 +481,10 @@ class Engine(ClassNursery):
                     is_validation=False,
                     is_test=False,
                 )
-                self.train_metric_calc.calc_metric(
-                    lines=lines, labels=labels, model_forward_dict=model_forward_out
-                )
+                if self.calc_train_metrics:
+                    self.train_metric_calc.calc_metric(
+                        lines=lines, labels=labels, model_forward_dict=model_forward_out
+                    )
 
                 try:
                     self.optimizer.zero_grad()
@@ -387,7 +503,10 @@ class Engine(ClassNursery):
                         "loss in the model output"
                     )
                 num_iterations += 1
-                if (num_iterations + 1) % self.log_train_metrics_every == 0:
+                if (
+                    self.calc_train_metrics
+                    and (num_iterations + 1) % self.log_train_metrics_every == 0
+                ):
                     metrics = self.train_metric_calc.report_metrics()
                     for label_namespace, table in metrics.items():
                         self.msg_printer.divider(
@@ -414,11 +533,22 @@ class Engine(ClassNursery):
         average_loss = self.train_loss_meter.get_average()
         self.msg_printer.text("Average Loss: {0}".format(average_loss))
         self.train_logger.info(f"Average loss @ Epoch {epoch_num+1} - {average_loss}")
-        metric = self.train_metric_calc.get_metric()
+        metric = self.train_metric_calc.get_metric() if self.calc_train_metrics else {}
+
+        if isinstance(self.train_loader.batch_sampler, BucketBatchSampler):
+            padding_stats = self.train_loader.batch_sampler.get_padding_stats()
+            self.msg_printer.text(
+                f"Pad tokens: {padding_stats['padded_tokens']} "
+                f"(removed {padding_stats['padding_removed']} by bucketing) "
+                f"for {padding_stats['num_tokens']} tokens"
+            )
+            self.train_logger.info(
+                f"Padding stats @ Epoch {epoch_num+1} - {padding_stats}"
+            )
 
         if self.use_wandb:
             wandb.log({"train_loss": average_loss}, step=epoch_num + 1)
-            if self.track_for_best != "loss":
+            if self.track_for_best != "loss" and self.calc_train_metrics:
                 for label_namespace in self.label_namespaces:
                     wandb.log(
                         {
@@ -467,10 +597,7 @@ class Engine(ClassNursery):
         )
         while True:
             try:
-                lines_labels = next(valid_iter)
-                lines_labels = list(zip(*lines_labels))
-                lines = lines_labels[0]
-                labels = lines_labels[1]
+                lines, labels = self.get_lines_labels(next(valid_iter))
                 batch_size = len(lines)
 
                 with torch.no_grad():
@@ -595,10 +722,7 @@ class Engine(ClassNursery):
         test_iter = iter(self.test_loader)
         while True:
             try:
-                lines_labels = next(test_iter)
-                lines_labels = list(zip(*lines_labels))
-                lines = lines_labels[0]
-                labels = lines_labels[1]
+                lines, labels = self.get_lines_labels(next(test_iter))
 
                 with torch.no_grad():
                     model_forward_out = self.model(
@@ -699,6 +823,27 @@ class Engine(ClassNursery):
         iterator = iter(loader)
         return iterator
 
+    @staticmethod
+    def get_lines_labels(batch: Union[Batch, List[Any]]) -> (List[Any], List[Any]):
+        """ Returns the lines and the labels of a batch from the DataLoader
+
+        Parameters
+        ----------
+        batch : Union[Batch, List[Any]]
+            Either a ``Batch`` made by ``NumericalizingCollate`` or a list
+            of (line, label) tuples
+
+        Returns
+        -------
+        List[Any], List[Any]
+            The lines and the labels of the batch
+        """
+        if isinstance(batch, Batch):
+            return batch.lines, batch.labels
+
+        lines_labels = list(zip(*batch))
+        return lines_labels[0], lines_labels[1]
+
     def load_model_from_file(self, filename: str):
         self.msg_printer.divider("LOADING MODEL FROM FILE")
         with self.msg_printer.loading(f"Loading Pytorch Model from file {filename}"):
@@ -0,0 +1,97 @@
+from typing import Dict, List, Optional
+import torch
+
+
+class ConfusionMatrix:
+    def __init__(self, num_classes: int):
+        """ A dense confusion matrix of size ``[num_classes, num_classes]`` that is
+        accumulated over batches. The rows are the true classes and the columns
+        are the predicted classes. Every batch is added with a single ``bincount``
+        and the counts of the different classes are derived only when they are needed
+
+        Parameters
+        ----------
+        num_classes : int
+            The number of classes. The matrix grows if larger class indices are seen
+        """
+        self.num_classes = num_classes
+        self.matrix = torch.zeros(num_classes, num_classes, dtype=torch.long)
+
+    def update(
+        self,
+        true_indices: torch.LongTensor,
+        predicted_indices: torch.LongTensor,
+        mask: Optional[torch.BoolTensor] = None,
+    ):
+        """ Adds the true and predicted class indices of a batch
+
+        Parameters
+        ----------
+        true_indices : torch.LongTensor
+            The true class indices of any shape
+        predicted_indices : torch.LongTensor
+            The predicted class indices of the same shape as ``true_indices``
+        mask : Optional[torch.BoolTensor]
+            True in those places where the pair of true and predicted class
+            is ignored. It should be of the same shape as ``true_indices``
+        """
+        true_indices = true_indices.reshape(-1).long()
+        predicted_indices = predicted_indices.reshape(-1).long().to(true_indices.device)
+        if mask is not None:
+            keep = ~mask.reshape(-1).bool().to(true_indices.device)
+            true_indices = true_indices[keep]
+            predicted_indices = predicted_indices[keep]
+
+        if true_indices.numel() == 0:
+            return
+
+        max_idx = int(torch.max(true_indices.max(), predicted_indices.max()))
+        if max_idx >= self.num_classes:
+            self._grow(max_idx + 1)
+
+        num_classes = self.num_classes
+        counts = torch.bincount(
+            true_indices * num_classes + predicted_indices,
+            minlength=num_classes * num_classes,
+        )
+        self.matrix = self.matrix.to(counts.device)
+        self.matrix += counts.view(num_classes, num_classes)
+
+    def _grow(self, num_classes: int):
+        matrix = torch.zeros(
+            num_classes, num_classes, dtype=torch.long, device=self.matrix.device
+        )
+        matrix[: self.num_classes, : self.num_classes] = self.matrix
+        self.matrix = matrix
+        self.num_classes = num_classes
+
+    def get_classes(self) -> List[int]:
+        """ Returns the classes that appear either as a true or a predicted class
+        """
+        matrix = self.matrix.cpu()
+        seen = (matrix.sum(dim=0) + matrix.sum(dim=1)) > 0
+        return seen.nonzero().view(-1).tolist()
+
+    def get_counters(self) -> (Dict[int, int], Dict[int, int], Dict[int, int]):
+        """ Returns the true positive, false positive and false negative counters
+
+        Returns
+        -------
+        Dict[int, int], Dict[int, int], Dict[int, int]
+            Mappings from the class index to the number of true positives,
+            false positives and false negatives for the classes that
+            have been seen
+        """
+        matrix = self.matrix.cpu()
+        tps = torch.diag(matrix)
+        fps = matrix.sum(dim=0) - tps
+        fns = matrix.sum(dim=1) - tps
+        classes = self.get_classes()
+
+        tp_counter = {class_: tps[class_].item() for class_ in classes}
+        fp_counter = {class_: fps[class_].item() for class_ in classes}
+        fn_counter = {class_: fns[class_].item() for class_ in classes}
+        return tp_counter, fp_counter, fn_counter
+
+    def reset(self):
+        self.matrix = torch.zeros_like(self.matrix)
@@ -0,0 +1,194 @@
+from typing import Dict, List, Tuple
+from collections import defaultdict
+
+
+def split_tag(tag: str) -> Tuple[str, str]:
+    """ Splits a tag like ``B-PER`` into the chunk tag ``B`` and the type ``PER``.
+    Tags without a type like ``O`` have the empty type. As in conlleval.perl, the type
+    is everything after the first dash
+
+    Parameters
+    ----------
+    tag : str
+
+    Returns
+    -------
+    Tuple[str, str]
+        The chunk tag and the type
+    """
+    parts = tag.split("-", 1)
+    chunk_tag = parts[0]
+    chunk_type = parts[1] if len(parts) > 1 else ""
+    return chunk_tag, chunk_type
+
+
+def is_chunk_end(prev_tag: str, tag: str, prev_type: str, type_: str) -> bool:
+    """ Returns True if a chunk ended between the previous and the current token
+    """
+    chunk_end = False
+    if prev_tag == "B" and tag in ("B", "O"):
+        chunk_end = True
+    if prev_tag == "I" and tag in ("B", "O"):
+        chunk_end = True
+    if prev_tag == "E" and tag in ("E", "I", "O"):
+        chunk_end = True
+    if prev_tag != "O" and prev_tag != "." and prev_type != type_:
+        chunk_end = True
+    # these chunks are assumed to have length 1
+    if prev_tag in ("]", "["):
+        chunk_end = True
+    return chunk_end
+
+
+def is_chunk_start(prev_tag: str, tag: str, prev_type: str, type_: str) -> bool:
+    """ Returns True if a chunk started between the previous and the current token
+    """
+    chunk_start = False
+    if tag == "B" and prev_tag in ("B", "I", "O"):
+        chunk_start = True
+    if prev_tag == "O" and tag in ("I", "E"):
+        chunk_start = True
+    if prev_tag == "E" and tag in ("E", "I"):
+        chunk_start = True
+    if tag != "O" and tag != "." and prev_type != type_:
+        chunk_start = True
+    # these chunks are assumed to have length 1
+    if tag in ("[", "]"):
+        chunk_start = True
+    return chunk_start
+
+
+class ConllEvalCounts:
+    def __init__(self):
+        """ Span level chunk counts with the semantics of the ``conlleval`` perl script
+        of the CoNLL shared tasks. A predicted chunk is correct only when it has
+        the same boundaries and type as a true chunk. The counts are accumulated
+        over the sentences that are added with ``update``
+        """
+        self.correct_chunks = 0
+        self.found_correct = 0
+        self.found_guessed = 0
+        self.correct_tags = 0
+        self.num_tokens = 0
+        self.type_correct_chunks: Dict[str, int] = defaultdict(int)
+        self.type_found_correct: Dict[str, int] = defaultdict(int)
+        self.type_found_guessed: Dict[str, int] = defaultdict(int)
+
+    def update(self, true_tags: List[str], predicted_tags: List[str]):
+        """ Adds the counts of one sentence
+
+        Parameters
+        ----------
+        true_tags : List[str]
+            The true tags of the tokens of the sentence
+        predicted_tags : List[str]
+            The predicted tags of the tokens of the sentence
+        """
+        last_correct, last_correct_type = "O", ""
+        last_guessed, last_guessed_type = "O", ""
+        in_correct = False
+
+        # the sentence is followed by a boundary which closes the open chunks
+        num_tokens = len(true_tags)
+        tag_pairs = list(zip(true_tags, predicted_tags)) + [("O", "O")]
+        for idx, (true_tag, predicted_tag) in enumerate(tag_pairs):
+            correct, correct_type = split_tag(true_tag)
+            guessed, guessed_type = split_tag(predicted_tag)
+
+            correct_end = is_chunk_end(
+                last_correct, correct, last_correct_type, correct_type
+            )
+            guessed_end = is_chunk_end(
+                last_guessed, guessed, last_guessed_type, guessed_type
+            )
+            correct_start = is_chunk_start(
+                last_correct, correct, last_correct_type, correct_type
+            )
+            guessed_start = is_chunk_start(
+                last_guessed, guessed, last_guessed_type, guessed_type
+            )
+
+            if in_correct:
+                if (
+                    correct_end
+                    and guessed_end
+                    and last_guessed_type == last_correct_type
+                ):
+                    in_correct = False
+                    self.correct_chunks += 1
+                    self.type_correct_chunks[last_correct_type] += 1
+                elif correct_end != guessed_end or guessed_type != correct_type:
+                    in_correct = False
+
+            if correct_start and guessed_start and guessed_type == correct_type:
+                in_correct = True
+
+            if correct_start:
+                self.found_correct += 1
+                self.type_found_correct[correct_type] += 1
+            if guessed_start:
+                self.found_guessed += 1
+                self.type_found_guessed[guessed_type] += 1
+
+            if idx < num_tokens:
+                if correct == guessed and guessed_type == correct_type:
+                    self.correct_tags += 1
+                self.num_tokens += 1
+
+            last_correct, last_correct_type = correct, correct_type
+            last_guessed, last_guessed_type = guessed, guessed_type
+
+    @staticmethod
+    def get_prf(
+        correct_chunks: int, found_guessed: int, found_correct: int
+    ) -> Tuple[float, float, float]:
+        precision = correct_chunks / found_guessed if found_guessed > 0 else 0.0
+        recall = correct_chunks / found_correct if found_correct > 0 else 0.0
+        fscore = (
+            2 * precision * recall / (precision + recall)
+            if precision + recall > 0
+            else 0.0
+        )
+        return precision, recall, fscore
+
+    def get_metrics(self) -> Dict[str, float]:
+        """ Returns the overall accuracy, precision, recall and fscore
+
+        Returns
+        -------
+        Dict[str, float]
+        """
+        precision, recall, fscore = self.get_prf(
+            self.correct_chunks, self.found_guessed, self.found_correct
+        )
+        accuracy = self.correct_tags / self.num_tokens if self.num_tokens > 0 else 0.0
+        return {
+            "accuracy": accuracy,
+            "precision": precision,
+            "recall": recall,
+            "fscore": fscore,
+        }
+
+    def get_type_metrics(self) -> Dict[str, Dict[str, float]]:
+        """ Returns the precision, recall and fscore of every chunk type
+
+        Returns
+        -------
+        Dict[str, Dict[str, float]]
+        """
+        chunk_types = set(self.type_found_correct.keys()).union(
+            self.type_found_guessed.keys()
+        )
+        type_metrics = {}
+        for chunk_type in sorted(chunk_types):
+            precision, recall, fscore = self.get_prf(
+                self.type_correct_chunks[chunk_type],
+                self.type_found_guessed[chunk_type],
+                self.type_found_correct[chunk_type],
+            )
+            type_metrics[chunk_type] = {
+                "precision": precision,
+                "recall": recall,
+                "fscore": fscore,
+            }
+        return type_metrics
@@ -1,14 +1,13 @@
 import torch
 from typing import Dict, Union, Any, Optional, List
 from wasabi import Printer
-from sciwing.utils.common import merge_dictionaries_with_sum
 from sciwing.data.line import Line
 from sciwing.data.label import Label
-import numpy as np
 import pandas as pd
 from sciwing.metrics.BaseMetric import BaseMetric
 from sciwing.data.datasets_manager import DatasetsManager
 from sciwing.metrics.classification_metrics_utils import ClassificationMetricsUtils
+from sciwing.metrics.confusion_matrix import ConfusionMatrix
 from sciwing.utils.class_nursery import ClassNursery
 
 
@@ -32,16 +31,12 @@ class PrecisionRecallFMeasure(BaseMetric, ClassNursery):
             self.label_namespace
         ]
 
-        # setup counters to calculate true positives, false positives,
-        # false negatives and true negatives
-        # The keys are the different class indices in the dataset and the
-        # values are the number of true positives, false positives, false negative
-        # true negatvies for the dataset
-
-        self.tp_counter = {}
-        self.fp_counter = {}
-        self.fn_counter = {}
-        self.tn_counter = {}
+        # The confusion matrix of the labels is accumulated over the batches
+        # The true positives, false positives and false negatives
+        # of the different classes are derived from it
+        self.confusion_matrix = ConfusionMatrix(
+            num_classes=self.datasets_manager.num_labels[self.label_namespace]
+        )
 
     def print_confusion_metrics(
         self,
@@ -123,9 +118,8 @@ class PrecisionRecallFMeasure(BaseMetric, ClassNursery):
     ) -> None:
         """ Updates the values being tracked for calculating the metric
 
-        For Precision Recall FMeasure we update the true positive,
-        false positive and false negative of the different classes
-        being tracked
+        For Precision Recall FMeasure we add the true and predicted labels
+        of the batch to the confusion matrix being tracked
 
         Parameters
         ----------
@@ -155,9 +149,6 @@ class PrecisionRecallFMeasure(BaseMetric, ClassNursery):
 
         labels_tensor = torch.LongTensor(labels_tensor)
         labels_tensor = labels_tensor.view(-1, 1)
-        labels_mask = torch.zeros_like(labels_tensor).type(torch.ByteTensor)
-
-        normalized_probs = normalized_probs.cpu()
 
         assert normalized_probs.ndimension() == 2, self.msg_printer.fail(
             "The predicted probs should "
@@ -175,52 +166,9 @@ class PrecisionRecallFMeasure(BaseMetric, ClassNursery):
         # TODO: for now k=1, change it to different number of ks
         top_probs, top_indices = normalized_probs.topk(k=1, dim=1)
 
-        # convert to 1d numpy
-        top_indices_numpy = top_indices.cpu().numpy().tolist()
-
-        # convert labels to 1 dimension
-        true_labels_numpy = labels_tensor.cpu().numpy().tolist()
-
-        labels_mask = labels_mask.tolist()
-
-        (
-            confusion_mtrx,
-            classes,
-        ) = self.classification_metrics_utils.get_confusion_matrix_and_labels(
-            true_tag_indices=true_labels_numpy,
-            predicted_tag_indices=top_indices_numpy,
-            true_masked_label_indices=labels_mask,
-        )
-
-        # For further confirmation on how I calculated this I searched for stackoverflow on
-        # 18th of July 2019. This seems to be the correct way to calculate tps, fps, fns
-        # You can refer to https://stackoverflow.com/a/43331484/2704763
-
-        # calculate tps
-        tps = np.around(np.diag(confusion_mtrx), decimals=4)
-
-        # calculate fps
-        fps = np.around(np.sum(confusion_mtrx, axis=0) - tps, decimals=4)
-
-        # calculate fns
-        fns = np.around(np.sum(confusion_mtrx, axis=1) - tps, decimals=4)
-
-        tps = tps.tolist()
-        fps = fps.tolist()
-        fns = fns.tolist()
-
-        class_tps_mapping = dict(zip(classes, tps))
-        class_fps_mapping = dict(zip(classes, fps))
-        class_fns_mapping = dict(zip(classes, fns))
-
-        self.tp_counter = merge_dictionaries_with_sum(
-            self.tp_counter, class_tps_mapping
-        )
-        self.fp_counter = merge_dictionaries_with_sum(
-            self.fp_counter, class_fps_mapping
-        )
-        self.fn_counter = merge_dictionaries_with_sum(
-            self.fn_counter, class_fns_mapping
+        self.confusion_matrix.update(
+            true_indices=labels_tensor.to(top_indices.device),
+            predicted_indices=top_indices,
         )
 
     def get_metric(self) -> Dict[str, Any]:
@@ -257,14 +205,13 @@ class PrecisionRecallFMeasure(BaseMetric, ClassNursery):
                 The micro fscore value considering all different classes
 
         """
+        tp_counter, fp_counter, fn_counter = self.confusion_matrix.get_counters()
         (
             precision_dict,
             recall_dict,
             fscore_dict,
         ) = self.classification_metrics_utils.get_prf_from_counters(
-            tp_counter=self.tp_counter,
-            fp_counter=self.fp_counter,
-            fn_counter=self.fn_counter,
+            tp_counter=tp_counter, fp_counter=fp_counter, fn_counter=fn_counter
         )
 
         # macro scores
@@ -277,9 +224,7 @@ class PrecisionRecallFMeasure(BaseMetric, ClassNursery):
             micro_recall,
             micro_fscore,
         ) = self.classification_metrics_utils.get_micro_prf_from_counters(
-            tp_counter=self.tp_counter,
-            fp_counter=self.fp_counter,
-            fn_counter=self.fn_counter,
+            tp_counter=tp_counter, fp_counter=fp_counter, fn_counter=fn_counter
         )
 
         # macro scores
@@ -298,9 +243,9 @@ class PrecisionRecallFMeasure(BaseMetric, ClassNursery):
                 "precision": precision_dict,
                 "recall": recall_dict,
                 "fscore": fscore_dict,
-                "num_tp": self.tp_counter,
-                "num_fp": self.fp_counter,
-                "num_fn": self.fn_counter,
+                "num_tp": tp_counter,
+                "num_fp": fp_counter,
+                "num_fn": fn_counter,
                 "macro_precision": macro_precision,
                 "macro_recall": macro_recall,
                 "macro_fscore": macro_fscore,
@@ -313,18 +258,22 @@ class PrecisionRecallFMeasure(BaseMetric, ClassNursery):
         return metric
 
     def reset(self) -> None:
-        """ Resets all the counters
+        """ Resets the confusion matrix from which the true positives,
+        false positives and false negatives are derived
+        """
+        self.confusion_matrix.reset()
 
-        Resets the ``tp_counter`` which is the true positive counter
-        Resets the ``fp_counter`` which is the false positive counter
-        Resets the ``fn_counter`` - which is the false negative counter
-        Resets the ``tn_counter`` - which is the true nagative counter
+    @property
+    def tp_counter(self) -> Dict[int, int]:
+        return self.confusion_matrix.get_counters()[0]
 
-        """
-        self.tp_counter = {}
-        self.fp_counter = {}
-        self.fn_counter = {}
-        self.tn_counter = {}
+    @property
+    def fp_counter(self) -> Dict[int, int]:
+        return self.confusion_matrix.get_counters()[1]
+
+    @property
+    def fn_counter(self) -> Dict[int, int]:
+        return self.confusion_matrix.get_counters()[2]
 
     def report_metrics(self, report_type="wasabi"):
         """ Reports metrics in a printable format
@@ -338,9 +287,8 @@ class PrecisionRecallFMeasure(BaseMetric, ClassNursery):
 
         """
         if report_type == "wasabi":
+            tp_counter, fp_counter, fn_counter = self.confusion_matrix.get_counters()
             table = self.classification_metrics_utils.generate_table_report_from_counters(
-                tp_counter=self.tp_counter,
-                fp_counter=self.fp_counter,
-                fn_counter=self.fn_counter,
+                tp_counter=tp_counter, fp_counter=fp_counter, fn_counter=fn_counter
             )
             return {self.label_namespace: table}
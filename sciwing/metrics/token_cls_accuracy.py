@@ -1,16 +1,15 @@
 from typing import Dict, Union, Any, List, Optional
 from sciwing.metrics.BaseMetric import BaseMetric
 import wasabi
-from sciwing.utils.common import merge_dictionaries_with_sum
-import numpy as np
 import pandas as pd
 from sciwing.metrics.classification_metrics_utils import ClassificationMetricsUtils
+from sciwing.metrics.confusion_matrix import ConfusionMatrix
 import torch
 from sciwing.utils.class_nursery import ClassNursery
 from sciwing.data.datasets_manager import DatasetsManager
 from sciwing.data.line import Line
 from sciwing.data.seq_label import SeqLabel
-from collections import defaultdict
+from sciwing.data.batch_collate import get_batch_tensors
 
 
 class TokenClassificationAccuracy(BaseMetric, ClassNursery):
@@ -28,11 +27,13 @@ class TokenClassificationAccuracy(BaseMetric, ClassNursery):
         self.msg_printer = wasabi.Printer()
         self.classification_metrics_utils = ClassificationMetricsUtils()
 
-        # a mapping between namespace and tp_counters for every class
-        self.tp_counter: Dict[str, Dict[str, Any]] = defaultdict(dict)
-        self.fp_counter: Dict[str, Dict[str, Any]] = defaultdict(dict)
-        self.fn_counter: Dict[str, Dict[str, Any]] = defaultdict(dict)
-        self.tn_counter: Dict[str, Dict[str, Any]] = defaultdict(dict)
+        # a mapping between namespace and the confusion matrix of its tags
+        self.confusion_matrices: Dict[str, ConfusionMatrix] = {
+            namespace: ConfusionMatrix(
+                num_classes=self.datasets_manager.num_labels[namespace]
+            )
+            for namespace in self.label_namespaces
+        }
 
     def calc_metric(
         self,
@@ -58,78 +59,38 @@ class TokenClassificationAccuracy(BaseMetric, ClassNursery):
 
         """
 
-        # get true labels for all namespaces
-        namespace_to_true_labels = defaultdict(list)
-        namespace_to_true_labels_mask = defaultdict(list)
-        namespace_to_pred_labels_mask = defaultdict(list)
-
         for namespace in self.label_namespaces:
             # List[List[int]]
             predicted_tags = model_forward_dict.get(
                 f"{self.predicted_tags_namespace_prefix}_{namespace}"
             )
+            # the model did not decode the tags of this namespace
+            if predicted_tags is None:
+                continue
             max_length = max([len(tags) for tags in predicted_tags])  # max num tokens
             numericalizer = self.datasets_manager.namespace_to_numericalizer[namespace]
-            pred_tags_mask = numericalizer.get_mask_for_batch_instances(
-                instances=predicted_tags
-            ).tolist()
-            namespace_to_pred_labels_mask[namespace] = pred_tags_mask
-
-            for label in labels:
-                true_labels = label.tokens[namespace]
-                true_labels = [tok.text for tok in true_labels]
-
-                true_labels = numericalizer.numericalize_instance(instance=true_labels)
-                true_labels = numericalizer.pad_instance(
-                    numericalized_text=true_labels,
-                    max_length=max_length,
-                    add_start_end_token=False,
-                )
-                labels_mask = numericalizer.get_mask_for_instance(
-                    instance=true_labels
-                ).tolist()
-                namespace_to_true_labels[namespace].append(true_labels)
-                namespace_to_true_labels_mask[namespace].append(labels_mask)
 
-        for namespace in self.label_namespaces:
-            labels_ = namespace_to_true_labels[namespace]
-            labels_mask_ = namespace_to_true_labels_mask[namespace]
-            pred_labels_mask_ = namespace_to_pred_labels_mask[namespace]
-            # List[List[int]]
-            predicted_tags = model_forward_dict.get(
-                f"{self.predicted_tags_namespace_prefix}_{namespace}"
+            # the predicted tags of the lines can be of different lengths
+            predicted_tags = numericalizer.pad_batch_instances(
+                instances=[list(tags) for tags in predicted_tags],
+                max_length=max_length,
+                add_start_end_token=False,
             )
-
-            (
-                confusion_mtrx,
-                classes,
-            ) = self.classification_metrics_utils.get_confusion_matrix_and_labels(
-                true_tag_indices=labels_,
-                predicted_tag_indices=predicted_tags,
-                true_masked_label_indices=labels_mask_,
-                pred_labels_mask=pred_labels_mask_,
+            predicted_tags = torch.LongTensor(predicted_tags)
+            pred_tags_mask = numericalizer.get_mask_for_tensor(predicted_tags)
+
+            true_labels, labels_mask = get_batch_tensors(
+                instances=labels,
+                namespace=namespace,
+                numericalizer=numericalizer,
+                max_length=max_length,
             )
 
-            tps = np.around(np.diag(confusion_mtrx), decimals=4)
-            fps = np.around(np.sum(confusion_mtrx, axis=0) - tps, decimals=4)
-            fns = np.around(np.sum(confusion_mtrx, axis=1) - tps, decimals=4)
-
-            tps = tps.tolist()
-            fps = fps.tolist()
-            fns = fns.tolist()
-
-            class_tps_mapping = dict(zip(classes, tps))
-            class_fps_mapping = dict(zip(classes, fps))
-            class_fns_mapping = dict(zip(classes, fns))
-
-            self.tp_counter[namespace] = merge_dictionaries_with_sum(
-                self.tp_counter.get(namespace, {}), class_tps_mapping
-            )
-            self.fp_counter[namespace] = merge_dictionaries_with_sum(
-                self.fp_counter.get(namespace, {}), class_fps_mapping
-            )
-            self.fn_counter[namespace] = merge_dictionaries_with_sum(
-                self.fn_counter.get(namespace, {}), class_fns_mapping
+            # the special tokens are not considered either as true or predicted tags
+            self.confusion_matrices[namespace].update(
+                true_indices=true_labels,
+                predicted_indices=predicted_tags,
+                mask=labels_mask | pred_tags_mask,
             )
 
     def get_metric(self) -> Dict[str, Union[Dict[str, float], float]]:
@@ -168,14 +129,15 @@ class TokenClassificationAccuracy(BaseMetric, ClassNursery):
         metrics = {}
 
         for namespace in self.label_namespaces:
+            (tp_counter, fp_counter, fn_counter,) = self.confusion_matrices[
+                namespace
+            ].get_counters()
             (
                 precision_dict,
                 recall_dict,
                 fscore_dict,
             ) = self.classification_metrics_utils.get_prf_from_counters(
-                tp_counter=self.tp_counter[namespace],
-                fp_counter=self.fp_counter[namespace],
-                fn_counter=self.fn_counter[namespace],
+                tp_counter=tp_counter, fp_counter=fp_counter, fn_counter=fn_counter
             )
 
             # macro scores
@@ -188,9 +150,7 @@ class TokenClassificationAccuracy(BaseMetric, ClassNursery):
                 micro_recall,
                 micro_fscore,
             ) = self.classification_metrics_utils.get_micro_prf_from_counters(
-                tp_counter=self.tp_counter[namespace],
-                fp_counter=self.fp_counter[namespace],
-                fn_counter=self.fn_counter[namespace],
+                tp_counter=tp_counter, fp_counter=fp_counter, fn_counter=fn_counter
             )
 
             # macro scores
@@ -208,9 +168,9 @@ class TokenClassificationAccuracy(BaseMetric, ClassNursery):
                 "precision": precision_dict,
                 "recall": recall_dict,
                 "fscore": fscore_dict,
-                "num_tp": self.tp_counter[namespace],
-                "num_fp": self.fp_counter[namespace],
-                "num_fn": self.fn_counter[namespace],
+                "num_tp": tp_counter,
+                "num_fp": fp_counter,
+                "num_fn": fn_counter,
                 "macro_precision": macro_precision,
                 "macro_recall": macro_recall,
                 "macro_fscore": macro_fscore,
@@ -235,10 +195,13 @@ class TokenClassificationAccuracy(BaseMetric, ClassNursery):
         reports = {}
         for namespace in self.label_namespaces:
             if report_type == "wasabi":
+                (tp_counter, fp_counter, fn_counter,) = self.confusion_matrices[
+                    namespace
+                ].get_counters()
                 report = self.classification_metrics_utils.generate_table_report_from_counters(
-                    tp_counter=self.tp_counter[namespace],
-                    fp_counter=self.fp_counter[namespace],
-                    fn_counter=self.fn_counter[namespace],
+                    tp_counter=tp_counter,
+                    fp_counter=fp_counter,
+                    fn_counter=fn_counter,
                     idx2labelname_mapping=self.datasets_manager.get_idx_label_mapping(
                         namespace
                     ),
@@ -247,10 +210,29 @@ class TokenClassificationAccuracy(BaseMetric, ClassNursery):
         return reports
 
     def reset(self):
-        self.tp_counter = {}
-        self.fp_counter = {}
-        self.fn_counter = {}
-        self.tn_counter = {}
+        for confusion_matrix in self.confusion_matrices.values():
+            confusion_matrix.reset()
+
+    @property
+    def tp_counter(self) -> Dict[str, Dict[int, int]]:
+        return {
+            namespace: confusion_matrix.get_counters()[0]
+            for namespace, confusion_matrix in self.confusion_matrices.items()
+        }
+
+    @property
+    def fp_counter(self) -> Dict[str, Dict[int, int]]:
+        return {
+            namespace: confusion_matrix.get_counters()[1]
+            for namespace, confusion_matrix in self.confusion_matrices.items()
+        }
+
+    @property
+    def fn_counter(self) -> Dict[str, Dict[int, int]]:
+        return {
+            namespace: confusion_matrix.get_counters()[2]
+            for namespace, confusion_matrix in self.confusion_matrices.items()
+        }
 
     def print_confusion_metrics(
         self,
@@ -1,6 +1,7 @@
 import torch.nn as nn
 from typing import List
 import sciwing.constants as constants
+from sciwing.data.datasets_manager import DatasetsManager
 from sciwing.modules.embedders.word_embedder import WordEmbedder
 from sciwing.modules.embedders.elmo_embedder import ElmoEmbedder
 from sciwing.modules.embedders.concat_embedders import ConcatEmbedders
@@ -13,6 +14,7 @@ from sciwing.infer.classification.classification_inference import (
     ClassificationInference,
 )
 from sciwing.utils.common import cached_path
+from sciwing.utils.file_prediction import FilePredictionMixin
 import pathlib
 import wasabi
 import json
@@ -22,13 +24,14 @@ MODELS_CACHE_DIR = PATHS["MODELS_CACHE_DIR"]
 DATA_DIR = PATHS["DATA_DIR"]
 
 
-class CitationIntentClassification(nn.Module):
+class CitationIntentClassification(nn.Module, FilePredictionMixin):
     def __init__(self):
         super(CitationIntentClassification, self).__init__()
         self.models_cache_dir = pathlib.Path(MODELS_CACHE_DIR)
         self.final_model_dir = self.models_cache_dir.joinpath(
             "citation_intent_clf_elmo", "checkpoints"
         )
+        self.datasets_manager_dir = self.final_model_dir.joinpath("datasets_manager")
         self.data_dir = pathlib.Path(DATA_DIR)
         self.msg_printer = wasabi.Printer()
         self._download_if_required()
@@ -72,31 +75,38 @@ class CitationIntentClassification(nn.Module):
         )
         return client
 
-    def predict_for_file(self, filename: str) -> List[str]:
-        with open(filename, "r") as fp:
-            lines = []
-            for line in fp:
-                line = line.strip()
-                lines.append(line)
-
-            predictions = self.infer.infer_batch(lines=lines)
-            for prediction, line in zip(predictions, lines):
-                self.msg_printer.text(title=line, text=prediction)
-
-        return predictions
-
     def predict_for_text(self, text: str):
         label = self.infer.on_user_input(line=text)
         self.msg_printer.text(title=text, text=label)
         return label
 
+    def predict_for_batch(self, texts: List[str]) -> List[str]:
+        """ Returns the predicted intents of the citations. Nothing is printed
+
+        Parameters
+        ----------
+        texts : List[str]
+            The citations
+
+        Returns
+        -------
+        List[str]
+            The predicted intent of every citation
+        """
+        return self.infer.infer_batch(lines=texts)
+
     def _get_data(self):
+        return DatasetsManager.load_for_inference(self.datasets_manager_dir)
+
+    def _save_datasets_manager(self):
+        # the models released before the vocab was stored with the model do not
+        # have it. It is built once from the training data after the download
         data_manager = TextClassificationDatasetManager(
             train_filename=self.data_dir.joinpath("scicite.train"),
             dev_filename=self.data_dir.joinpath("scicite.dev"),
             test_filename=self.data_dir.joinpath("scicite.test"),
         )
-        return data_manager
+        data_manager.save_for_inference(self.datasets_manager_dir)
 
     def _get_hparams(self):
         with open(self.final_model_dir.joinpath("hyperparams.json")) as fp:
@@ -109,3 +119,5 @@ class CitationIntentClassification(nn.Module):
             path=self.final_model_dir,
             url="https://parsect-models.s3-ap-southeast-1.amazonaws.com/citation_intent_clf_elmo.zip",
         )
+        if not self.datasets_manager_dir.joinpath("datasets_manager.json").is_file():
+            self._save_datasets_manager()
@@ -12,20 +12,21 @@ from sciwing.infer.seq_label_inference.seq_label_inference import (
     SequenceLabellingInference,
 )
 from sciwing.utils.common import cached_path
+from sciwing.utils.file_prediction import FilePredictionMixin
 import sciwing.constants as constants
+from sciwing.data.datasets_manager import DatasetsManager
 import pathlib
 import json
 import torch.nn as nn
 import wasabi
 from typing import List
-from collections import defaultdict
 
 PATHS = constants.PATHS
 MODELS_CACHE_DIR = PATHS["MODELS_CACHE_DIR"]
 DATA_DIR = PATHS["DATA_DIR"]
 
 
-class NeuralParscit(nn.Module):
+class NeuralParscit(nn.Module, FilePredictionMixin):
     """ It defines a neural parscit model. The model is used for citation string parsing. This model
     helps you use a pre-trained model who architecture is fixed and is trained by SciWING.
     You can also fine-tune the model on your own dataset.
@@ -40,6 +41,7 @@ class NeuralParscit(nn.Module):
         self.models_cache_dir = pathlib.Path(MODELS_CACHE_DIR)
         self.final_model_dir = self.models_cache_dir.joinpath("lstm_crf_parscit_final")
         self.model_filepath = self.final_model_dir.joinpath("best_model.pt")
+        self.datasets_manager_dir = self.final_model_dir.joinpath("datasets_manager")
         self.data_dir = pathlib.Path(DATA_DIR)
         self.msg_printer = wasabi.Printer()
         self._download_if_required()
@@ -99,24 +101,13 @@ class NeuralParscit(nn.Module):
         predictions = self.infer.on_user_input(line=line)
         return predictions
 
-    def predict_for_file(self, filename: str) -> List[str]:
-        predictions = defaultdict(list)
-        with open(filename, "r") as fp:
-            for line_idx, line in enumerate(fp):
-                line = line.strip()
-                pred_ = self._predict(line=line)
-                for namespace, prediction in pred_.items():
-                    predictions[namespace].append(prediction[0])
-                    stylized_string = self.vis_tagger.visualize_tokens(
-                        text=line.split(), labels=prediction[0].split()
-                    )
-                    self.msg_printer.divider(
-                        f"Predictions for Line: {line_idx+1} from {filename}"
-                    )
-                    print(stylized_string)
-                    print("\n")
-
-        return predictions[self.data_manager.label_namespaces[0]]
+    def show_prediction(self, line: str, prediction: str, line_idx: int, filename: str):
+        stylized_string = self.vis_tagger.visualize_tokens(
+            text=line.split(), labels=prediction.split()
+        )
+        self.msg_printer.divider(f"Predictions for Line: {line_idx+1} from {filename}")
+        print(stylized_string)
+        print("\n")
 
     def predict_for_text(self, text: str):
         predictions = self._predict(line=text)
@@ -128,13 +119,34 @@ class NeuralParscit(nn.Module):
             print(stylized_string)
             return prediction[0]
 
+    def predict_for_batch(self, texts: List[str]) -> List[str]:
+        """ Returns the predicted tags of the citations. Nothing is printed
+
+        Parameters
+        ----------
+        texts : List[str]
+            The citation strings
+
+        Returns
+        -------
+        List[str]
+            The space separated tags of every citation
+        """
+        predictions = self.infer.infer_batch(lines=texts)
+        return predictions[self.data_manager.label_namespaces[0]]
+
     def _get_data(self):
+        return DatasetsManager.load_for_inference(self.datasets_manager_dir)
+
+    def _save_datasets_manager(self):
+        # the models released before the vocab was stored with the model do not
+        # have it. It is built once from the training data after the download
         data_manager = SeqLabellingDatasetManager(
             train_filename=self.data_dir.joinpath("parscit.train"),
             dev_filename=self.data_dir.joinpath("parscit.dev"),
             test_filename=self.data_dir.joinpath("parscit.test"),
         )
-        return data_manager
+        data_manager.save_for_inference(self.datasets_manager_dir)
 
     def _get_hparams(self):
         with open(self.final_model_dir.joinpath("hyperparams.json")) as fp:
@@ -147,3 +159,5 @@ class NeuralParscit(nn.Module):
             path=self.final_model_dir,
             url="https://parsect-models.s3-ap-southeast-1.amazonaws.com/lstm_crf_parscit_final.zip",
         )
+        if not self.datasets_manager_dir.joinpath("datasets_manager.json").is_file():
+            self._save_datasets_manager()
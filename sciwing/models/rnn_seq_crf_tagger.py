@@ -7,8 +7,10 @@ from sciwing.modules.lstm2seqencoder import Lstm2SeqEncoder
 from sciwing.data.datasets_manager import DatasetsManager
 from sciwing.data.seq_label import SeqLabel
 from sciwing.data.line import Line
+from sciwing.data.batch_collate import get_batch_tensors
 from collections import defaultdict
 from sciwing.utils.class_nursery import ClassNursery
+from sciwing.utils.tensor_utils import batched_viterbi_decode
 
 
 class RnnSeqCrfTagger(nn.Module, ClassNursery):
@@ -29,7 +31,8 @@ class RnnSeqCrfTagger(nn.Module, ClassNursery):
         Parameters
         ----------
         rnn2seqencoder : Lstm2SeqEncoder
-            Lstm2SeqEncoder that encodes a set of instances to a sequence of hidden states
+            Lstm2SeqEncoder that encodes a set of instances to a sequence of hidden states.
+            The mask that it returns is used for decoding and for the CRF loss
         encoding_dim : int
             Hidden dimension of the lstm2seq encoder
         namespace_to_constraints: Dict[str, List[Tuple[int, int]]]
@@ -48,6 +51,9 @@ class RnnSeqCrfTagger(nn.Module, ClassNursery):
         self.crfs = nn.ModuleDict()
         self.linear_clfs = nn.ModuleDict()
         self.include_start_end_transitions = include_start_end_trainsitions
+        # the predicted tags of the training batches are used only for the
+        # training metrics. The ``Engine`` sets this from ``calc_train_metrics``
+        self.decode_during_training = True
 
         if namespace_to_constraints is None and self.tagging_type is not None:
             namespace_to_constraints = defaultdict(list)
@@ -104,7 +110,9 @@ class RnnSeqCrfTagger(nn.Module, ClassNursery):
                 Un-normalized probabilities over all the classes
                 of the shape ``[batch_size, num_classes]``
             predicted_tags: List[List[int]]
-                Set of predicted tags for the batch
+                Set of predicted tags for the batch. Every line has as many
+                tags as the number of tokens in it. This is absent for training
+                batches if ``decode_during_training`` is False
             loss: float
                 Loss value if this is a training forward pass
                 or validation loss. There will be no loss
@@ -112,59 +120,108 @@ class RnnSeqCrfTagger(nn.Module, ClassNursery):
         """
 
         # batch size, max_num_word_tokens, hidden_dim
-        encoding = self.rnn2seqencoder(lines=lines)
+        # mask: batch_size, max_time_steps
+        encoding, mask = self.rnn2seqencoder(lines=lines, return_mask=True)
         max_time_steps = encoding.size(1)
+        mask = mask.to(self.device)
+
+        decode = not is_training or self.decode_during_training
 
         output_dict = {}
         for namespace in self.label_namespaces:
             # batch size, time steps, num_classes
             namespace_logits = self.linear_clfs[namespace](encoding)
-            batch_size, time_steps, _ = namespace_logits.size()
             output_dict[f"logits_{namespace}"] = namespace_logits
-            predicted_tags = self.crfs[namespace].viterbi_tags(
-                logits=namespace_logits,
-                mask=torch.ones(
-                    size=(batch_size, time_steps), dtype=torch.long, device=self.device
-                ),
-            )
-            predicted_tags = [tag for tag, _ in predicted_tags]
-            output_dict[f"predicted_tags_{namespace}"] = predicted_tags
+            if decode:
+                predicted_tags = self.viterbi_tags(
+                    namespace=namespace, logits=namespace_logits, mask=mask
+                )
+                output_dict[f"predicted_tags_{namespace}"] = predicted_tags
 
         if is_training or is_validation:
-            labels_indices = defaultdict(list)
-            for label in labels:
-                for namespace in self.label_namespaces:
-                    numericalizer = self.datasets_manager.namespace_to_numericalizer[
-                        namespace
-                    ]
-                    label_ = label.tokens[namespace]
-                    label_ = [tok.text for tok in label_]
-                    label_instances = numericalizer.numericalize_instance(
-                        instance=label_
-                    )
-                    label_instances = numericalizer.pad_instance(
-                        numericalized_text=label_instances,
-                        max_length=max_time_steps,
-                        add_start_end_token=False,
-                    )
-                    label_instances = torch.tensor(
-                        label_instances, dtype=torch.long, device=self.device
-                    )
-                    labels_indices[namespace].append(label_instances)
-
+            # the crf needs at least one token in a line. Empty lines have no loss
+            has_tokens = mask.sum(dim=1) > 0
             losses = []
             for namespace in self.label_namespaces:
-                labels_tensor = labels_indices[namespace]
-                labels_tensor = torch.stack(labels_tensor)
-                batch_size, time_steps = labels_tensor.size()
-                mask = torch.ones(
-                    size=(batch_size, time_steps), dtype=torch.long, device=self.device
+                numericalizer = self.datasets_manager.namespace_to_numericalizer[
+                    namespace
+                ]
+                labels_tensor, _ = get_batch_tensors(
+                    instances=labels,
+                    namespace=namespace,
+                    numericalizer=numericalizer,
+                    max_length=max_time_steps,
+                    device=self.device,
                 )
                 logits_namespace = output_dict[f"logits_{namespace}"]
-                loss_ = -self.crfs[namespace](logits_namespace, labels_tensor, mask)
+                if not has_tokens.any():
+                    losses.append(logits_namespace.sum() * 0.0)
+                    continue
+                loss_ = -self.crfs[namespace](
+                    logits_namespace[has_tokens],
+                    labels_tensor[has_tokens],
+                    mask[has_tokens],
+                )
                 losses.append(loss_)
 
             loss = sum(losses)
             output_dict["loss"] = loss
 
         return output_dict
+
+    def viterbi_tags(
+        self, namespace: str, logits: torch.FloatTensor, mask: torch.LongTensor
+    ) -> List[List[int]]:
+        """ Decodes the best tags for the batch using the CRF of the namespace
+
+        This respects the constraints and the start and end transitions of the CRF
+        in the same way as the ``viterbi_tags`` of the CRF. But all the lines of
+        the batch are decoded together using tensor operations
+
+        Parameters
+        ----------
+        namespace : str
+            The label namespace
+        logits : torch.FloatTensor
+            The logits of size ``[batch_size, time_steps, num_tags]``
+        mask : torch.LongTensor
+            Mask of size ``[batch_size, time_steps]`` with 1 for the tokens and 0
+            for the padding
+
+        Returns
+        -------
+        List[List[int]]
+            The best tags for every line in the batch
+        """
+        crf = self.crfs[namespace]
+        num_tags = logits.size(2)
+        start_tag = num_tags
+        end_tag = num_tags + 1
+        constraint_mask = crf._constraint_mask.detach()
+
+        with torch.no_grad():
+            transitions = crf.transitions.detach() * constraint_mask[
+                :num_tags, :num_tags
+            ] + -10000.0 * (1 - constraint_mask[:num_tags, :num_tags])
+
+            start_transitions = -10000.0 * (1 - constraint_mask[start_tag, :num_tags])
+            end_transitions = -10000.0 * (1 - constraint_mask[:num_tags, end_tag])
+            if self.include_start_end_transitions:
+                start_transitions = (
+                    start_transitions
+                    + crf.start_transitions.detach()
+                    * constraint_mask[start_tag, :num_tags]
+                )
+                end_transitions = (
+                    end_transitions
+                    + crf.end_transitions.detach() * constraint_mask[:num_tags, end_tag]
+                )
+
+            predicted_tags = batched_viterbi_decode(
+                logits=logits.detach(),
+                transitions=transitions,
+                mask=mask,
+                start_transitions=start_transitions,
+                end_transitions=end_transitions,
+            )
+        return predicted_tags
@@ -1,4 +1,5 @@
 import sciwing.constants as constants
+from sciwing.data.datasets_manager import DatasetsManager
 from sciwing.datasets.classification.text_classification_dataset import (
     TextClassificationDatasetManager,
 )
@@ -11,6 +12,7 @@ from sciwing.infer.classification.classification_inference import (
     ClassificationInference,
 )
 from sciwing.utils.common import cached_path
+from sciwing.utils.file_prediction import FilePredictionMixin
 import pathlib
 import json
 import wasabi
@@ -22,11 +24,12 @@ MODELS_CACHE_DIR = PATHS["MODELS_CACHE_DIR"]
 DATA_DIR = PATHS["DATA_DIR"]
 
 
-class SectLabel:
+class SectLabel(FilePredictionMixin):
     def __init__(self):
         self.models_cache_dir = pathlib.Path(MODELS_CACHE_DIR)
         self.final_model_dir = self.models_cache_dir.joinpath("sectlabel_elmo_bilstm")
         self.model_filepath = self.final_model_dir.joinpath("best_model.pt")
+        self.datasets_manager_dir = self.final_model_dir.joinpath("datasets_manager")
         self.data_dir = pathlib.Path(DATA_DIR)
         self.msg_printer = wasabi.Printer()
         self._download_if_required()
@@ -79,24 +82,31 @@ class SectLabel:
         )
         return client
 
-    def predict_for_file(self, filename: str) -> List[str]:
-        lines = []
-        with open(filename) as fp:
-            for line in fp:
-                lines.append(line)
-
-        predictions = self.infer.infer_batch(lines=lines)
-        for line, prediction in zip(lines, predictions):
-            self.msg_printer.text(title=line, text=prediction)
-
-        return predictions
-
     def predict_for_text(self, text: str) -> str:
         prediction = self.infer.on_user_input(line=text)
         self.msg_printer.text(title=text, text=prediction)
         return prediction
 
+    def predict_for_batch(self, texts: List[str]) -> List[str]:
+        """ Returns the predicted labels of the texts. Nothing is printed
+
+        Parameters
+        ----------
+        texts : List[str]
+
+        Returns
+        -------
+        List[str]
+            The predicted label of every text
+        """
+        return self.infer.infer_batch(lines=texts)
+
     def _get_data(self):
+        return DatasetsManager.load_for_inference(self.datasets_manager_dir)
+
+    def _save_datasets_manager(self):
+        # the models released before the vocab was stored with the model do not
+        # have it. It is built once from the training data after the download
         train_filename = self.data_dir.joinpath("sectLabel.train")
         dev_filename = self.data_dir.joinpath("sectLabel.dev")
         test_filename = self.data_dir.joinpath("sectLabel.test")
@@ -106,8 +116,7 @@ class SectLabel:
             dev_filename=dev_filename,
             test_filename=test_filename,
         )
-
-        return data_manager
+        data_manager.save_for_inference(self.datasets_manager_dir)
 
     def _get_hparams(self):
         with open(self.final_model_dir.joinpath("hyperparams.json")) as fp:
@@ -119,3 +128,5 @@ class SectLabel:
             path=self.final_model_dir,
             url="https://parsect-models.s3-ap-southeast-1.amazonaws.com/sectlabel_elmo_bilstm.zip",
         )
+        if not self.datasets_manager_dir.joinpath("datasets_manager.json").is_file():
+            self._save_datasets_manager()
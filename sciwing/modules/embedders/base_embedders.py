@@ -10,3 +10,16 @@ class BaseEmbedder(metaclass=ABCMeta):
     @abstractmethod
     def get_embedding_dimension(self):
         pass
+
+    def should_store_token_embeddings(self) -> bool:
+        """ Whether the embedder should set the embeddings on the tokens of the lines.
+
+        The embedders set ``store_token_embeddings`` in their constructor. It is
+        False by default, because the lines of a dataset live for the whole run and
+        the embeddings set on their tokens are never freed
+
+        Returns
+        -------
+        bool
+        """
+        return getattr(self, "store_token_embeddings", False)
@@ -25,6 +25,7 @@ class BertEmbedder(nn.Module, BaseEmbedder, ClassNursery):
         bert_type: str = "bert-base-uncased",
         word_tokens_namespace="tokens",
         device: Union[torch.device, str] = torch.device("cpu"),
+        store_token_embeddings: bool = False,
     ):
         """ Bert Embedder that embeds the given instance to BERT embeddings
 
@@ -73,10 +74,16 @@ class BertEmbedder(nn.Module, BaseEmbedder, ClassNursery):
 
         device :  Union[torch.device, str]
             The device on which the model is run.
+
+        store_token_embeddings : bool
+            If True, the detached embedding of every word token is set on the token.
+            The lines of a dataset keep these for the whole run, so this is off
+            by default
         """
         super(BertEmbedder, self).__init__()
 
         self.datasets_manager = datasets_manager
+        self.store_token_embeddings = store_token_embeddings
         self.dropout_value = dropout_value
         self.aggregation_type = aggregation_type
         self.bert_type = bert_type
@@ -203,6 +210,7 @@ class BertEmbedder(nn.Module, BaseEmbedder, ClassNursery):
             raise ValueError(f"The aggregation type {self.aggregation_type}")
 
         # fill up the appropriate embeddings in the tokens of the lines
+        store_token_embeddings = self.should_store_token_embeddings()
         batch_embeddings = []
         for idx, line in enumerate(lines):
             word_tokens = line.tokens[self.word_tokens_namespace]  # word tokens
@@ -238,7 +246,8 @@ class BertEmbedder(nn.Module, BaseEmbedder, ClassNursery):
                 # TODO: Have different strategies for this
                 emb = token_embeddings[idx]
                 line_embeddings.append(emb)
-                token.set_embedding(name=self.embedder_name, value=emb)
+                if store_token_embeddings:
+                    token.set_embedding(name=self.embedder_name, value=emb.detach())
                 idx += len_sub_tokens
 
             for i in range(padding_length_words):
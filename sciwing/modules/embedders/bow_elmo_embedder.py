@@ -1,12 +1,15 @@
 import torch
+import numpy as np
 from allennlp.commands.elmo import ElmoEmbedder
+from allennlp.commands.elmo import DEFAULT_OPTIONS_FILE, DEFAULT_WEIGHT_FILE
 import wasabi
-from typing import List, Union
+from typing import List, Union, Optional
 import torch.nn as nn
 from sciwing.utils.class_nursery import ClassNursery
 from sciwing.data.line import Line
 from sciwing.data.datasets_manager import DatasetsManager
 from sciwing.modules.embedders.base_embedders import BaseEmbedder
+from sciwing.modules.embedders.elmo_embedding_cache import ElmoEmbeddingCache
 
 
 class BowElmoEmbedder(nn.Module, BaseEmbedder, ClassNursery):
@@ -16,6 +19,10 @@ class BowElmoEmbedder(nn.Module, BaseEmbedder, ClassNursery):
         layer_aggregation: str = "sum",
         device: Union[str, torch.device] = torch.device("cpu"),
         word_tokens_namespace="tokens",
+        cache_filename: Optional[str] = None,
+        store_token_embeddings: bool = False,
+        options_file: str = DEFAULT_OPTIONS_FILE,
+        weight_file: str = DEFAULT_WEIGHT_FILE,
     ):
         """ Bag of words Elmo Embedder which aggregates elmo embedding for every token
 
@@ -40,6 +47,22 @@ class BowElmoEmbedder(nn.Module, BaseEmbedder, ClassNursery):
 
         word_tokens_namespace: int
             Namespace where all the word tokens are stored
+
+        cache_filename: Optional[str]
+            An HDF5 file where the aggregated embeddings of lines are cached.
+            ELMo is run only for the lines that are not in the cache. The cache
+            can be filled before training with ``sciwing precompute elmo``
+
+        store_token_embeddings: bool
+            Set the ELMo embedding of every token on the token. The lines of a
+            dataset keep these for the whole run, so this is off by default
+
+        options_file: str
+            The path or url of the ELMo options file
+
+        weight_file: str
+            The path or url of the ELMo weights file. The options and the weights
+            are part of the key of the cached embeddings
         """
         super(BowElmoEmbedder, self).__init__()
         self.dataset_manager = datasets_manager
@@ -57,6 +80,14 @@ class BowElmoEmbedder(nn.Module, BaseEmbedder, ClassNursery):
         else:
             self.cuda_device_id = -1
         self.msg_printer = wasabi.Printer()
+        self.cache_filename = cache_filename
+        self.store_token_embeddings = store_token_embeddings
+        self.options_file = options_file
+        self.weight_file = weight_file
+        self.model_id = f"{self.options_file}\x1f{self.weight_file}"
+        self.cache = (
+            ElmoEmbeddingCache(cache_filename) if cache_filename is not None else None
+        )
 
         assert (
             self.layer_aggregation_type in self.allowed_layer_aggregation_types
@@ -67,7 +98,11 @@ class BowElmoEmbedder(nn.Module, BaseEmbedder, ClassNursery):
 
         # load the elmo embedders
         with self.msg_printer.loading("Creating Elmo object"):
-            self.elmo = ElmoEmbedder(cuda_device=self.cuda_device_id)
+            self.elmo = ElmoEmbedder(
+                options_file=self.options_file,
+                weight_file=self.weight_file,
+                cuda_device=self.cuda_device_id,
+            )
         self.msg_printer.good("Finished Loading Elmo object")
 
     def forward(self, lines: List[Line]) -> torch.Tensor:
@@ -86,9 +121,6 @@ class BowElmoEmbedder(nn.Module, BaseEmbedder, ClassNursery):
 
 
         """
-        # [np.array] - A generator of embeddings
-        # each array in the list is of the shape (3, #words_in_sentence, 1024)
-
         batch_tokens = []
         token_lengths = []
         for line in lines:
@@ -98,8 +130,9 @@ class BowElmoEmbedder(nn.Module, BaseEmbedder, ClassNursery):
             token_lengths.append(len(line_tokens))
 
         max_len = max(token_lengths)
-        embedded = list(self.elmo.embed_sentences(batch_tokens))
+        embedded = self.get_aggregated_embeddings(batch_tokens)
 
+        store_token_embeddings = self.should_store_token_embeddings()
         batch_embeddings = []
 
         for idx, (line, embedding) in enumerate(zip(lines, embedded)):
@@ -109,31 +142,9 @@ class BowElmoEmbedder(nn.Module, BaseEmbedder, ClassNursery):
             embedding = torch.FloatTensor(embedding)
             embedding = embedding.to(self.device)
 
-            # 3, #words_in_sentence, 1024
-
-            # aggregate of word embeddings
-            if self.layer_aggregation_type == "sum":
-                # words_in_sentence, 1024
-                embedding = torch.sum(embedding, dim=0)
-
-            elif self.layer_aggregation_type == "average":
-                # mean across all layers
-                embedding = torch.mean(embedding, dim=0)
-
-            elif self.layer_aggregation_type == "last":
-                # words_in_sentence, 1024
-                embedding = embedding[-1, :, :]
-
-            elif self.layer_aggregation_type == "first":
-                # words_in_sentence, 1024
-                embedding = embedding[0, :, :]
-            else:
-                raise ValueError(
-                    f"Layer aggregation can be one of sum, average, last and first"
-                )
-
             for token, token_emb in zip(tokens, embedding):
-                token.set_embedding(self.embedder_name, token_emb)
+                if store_token_embeddings:
+                    token.set_embedding(self.embedder_name, token_emb)
                 line_embeddings.append(token_emb)
 
             # for batching
@@ -147,5 +158,106 @@ class BowElmoEmbedder(nn.Module, BaseEmbedder, ClassNursery):
         batch_embeddings = torch.stack(batch_embeddings)
         return batch_embeddings
 
+    def get_aggregated_embeddings(
+        self, batch_tokens: List[List[str]]
+    ) -> List[np.ndarray]:
+        """ Returns the layer aggregated ELMo embeddings for every line.
+        The embeddings are read from the cache if one is configured and ELMo
+        is run only for the lines that are missing from it
+
+        Parameters
+        ----------
+        batch_tokens : List[List[str]]
+            The tokens of every line in the batch
+
+        Returns
+        -------
+        List[np.ndarray]
+            Embeddings of size ``[#words_in_sentence, 1024]`` for every line
+        """
+        if self.cache is None:
+            # each array in the list is of the shape (3, #words_in_sentence, 1024)
+            embedded = self.elmo.embed_sentences(batch_tokens)
+            return [self.aggregate_layers(embedding) for embedding in embedded]
+
+        keys = [
+            self.cache.get_key(
+                line_tokens, self.layer_aggregation_type, model_id=self.model_id
+            )
+            for line_tokens in batch_tokens
+        ]
+        aggregated_embeddings = [self.cache.get(key) for key in keys]
+        miss_indices = [
+            idx
+            for idx, embedding in enumerate(aggregated_embeddings)
+            if embedding is None
+        ]
+
+        if len(miss_indices) > 0:
+            miss_tokens = [batch_tokens[idx] for idx in miss_indices]
+            embedded = self.elmo.embed_sentences(miss_tokens)
+            for idx, embedding in zip(miss_indices, embedded):
+                embedding = self.aggregate_layers(embedding)
+                self.cache.put(keys[idx], embedding)
+                aggregated_embeddings[idx] = embedding
+            self.cache.flush()
+
+        return aggregated_embeddings
+
+    def aggregate_layers(self, embedding: np.ndarray) -> np.ndarray:
+        """ Aggregates the three layers of ELMo representations
+
+        Parameters
+        ----------
+        embedding : np.ndarray
+            ELMo representation of size ``[3, #words_in_sentence, 1024]``
+
+        Returns
+        -------
+        np.ndarray
+            Aggregated representation of size ``[#words_in_sentence, 1024]``
+        """
+        if self.layer_aggregation_type == "sum":
+            # words_in_sentence, 1024
+            embedding = np.sum(embedding, axis=0)
+
+        elif self.layer_aggregation_type == "average":
+            # mean across all layers
+            embedding = np.mean(embedding, axis=0)
+
+        elif self.layer_aggregation_type == "last":
+            # words_in_sentence, 1024
+            embedding = embedding[-1, :, :]
+
+        elif self.layer_aggregation_type == "first":
+            # words_in_sentence, 1024
+            embedding = embedding[0, :, :]
+        else:
+            raise ValueError(
+                f"Layer aggregation can be one of sum, average, last and first"
+            )
+        return embedding.astype(np.float32)
+
+    def precompute(self, lines: List[Line], batch_size: int = 32):
+        """ Fills the cache with the ELMo embeddings of the lines
+
+        Parameters
+        ----------
+        lines : List[Line]
+            The lines whose embeddings are cached
+        batch_size : int
+            The number of lines passed to ELMo at once
+        """
+        assert self.cache is not None, self.msg_printer.fail(
+            "Pass a cache_filename to precompute the elmo embeddings"
+        )
+        for start in range(0, len(lines), batch_size):
+            batch_lines = lines[start : start + batch_size]
+            batch_tokens = [
+                [tok.text for tok in line.tokens[self.word_tokens_namespace]]
+                for line in batch_lines
+            ]
+            self.get_aggregated_embeddings(batch_tokens)
+
     def get_embedding_dimension(self) -> int:
         return 1024
@@ -1,9 +1,10 @@
 import torch.nn as nn
-from typing import List, Union
+from typing import List, Union, Dict
 from sciwing.modules.embedders.base_embedders import BaseEmbedder
 from sciwing.utils.class_nursery import ClassNursery
 from sciwing.data.datasets_manager import DatasetsManager
 from sciwing.data.line import Line
+from sciwing.data.batch_collate import get_batch_tensors
 import torch
 
 
@@ -16,6 +17,7 @@ class CharEmbedder(nn.Module, BaseEmbedder, ClassNursery):
         word_tokens_namespace: str = "tokens",
         char_tokens_namespace: str = "char_tokens",
         device: Union[str, torch.device] = torch.device("cpu"),
+        store_token_embeddings: bool = False,
     ):
         """ This is a character embedder that takes in lines and collates the character
         embeddings for all the tokens in the lines.
@@ -33,6 +35,10 @@ class CharEmbedder(nn.Module, BaseEmbedder, ClassNursery):
         hidden_dimension : int
             The hidden dimension of the LSTM which will be used to get
             character embeddings
+        store_token_embeddings : bool
+            Whether the detached character embeddings are set on the word tokens.
+            The lines of a dataset keep these for the whole run, so this is off
+            by default
         """
         super(CharEmbedder, self).__init__()
         self.char_embedding_dimension = char_embedding_dimension
@@ -41,6 +47,7 @@ class CharEmbedder(nn.Module, BaseEmbedder, ClassNursery):
         self.datasets_manager = datasets_manager
         self.hidden_dimension = hidden_dimension
         self.device = torch.device(device) if isinstance(device, str) else device
+        self.store_token_embeddings = store_token_embeddings
 
         self.char_vocab = self.datasets_manager.namespace_to_vocab[
             self.char_tokens_namespace
@@ -56,9 +63,15 @@ class CharEmbedder(nn.Module, BaseEmbedder, ClassNursery):
             self.word_tokens_namespace
         ]
         self.idx2items = self.char_vocab.idx2token
+        self.char_pad_idx = self.char_vocab.get_idx_from_token(
+            self.char_vocab.pad_token
+        )
         self.num_embeddings = len(self.idx2items)
         self.embedder_name = "char_embedding"
 
+        # word index -> numericalized characters of the word in the word vocab
+        self.word_idx2char_ids: Dict[int, List[int]] = {}
+
         self.embedding = nn.Embedding(
             self.num_embeddings, self.char_embedding_dimension
         )
@@ -88,80 +101,102 @@ class CharEmbedder(nn.Module, BaseEmbedder, ClassNursery):
         max_token_length = max(token_lengths)
         max_line_length = max(line_lengths)
 
-        # numericalized version of all the characters in the lines
-        batch_numericalized = []  # batch_size * max_line_length * max_token_length
-        for line in lines:
-            word_tokens = line.tokens[self.word_tokens_namespace]
-            word_tokens = [tok.text for tok in word_tokens]
-            word_tokens_num = self.word_numericalizer.numericalize_instance(
-                instance=word_tokens
-            )
-            word_tokens_num_padded = self.word_numericalizer.pad_instance(
-                numericalized_text=word_tokens_num,
-                max_length=max_line_length,
-                add_start_end_token=False,
-            )
-            word_tokens_padded = [
-                self.word_vocab.get_token_from_idx(token)
-                for token in word_tokens_num_padded
-            ]
-
-            line_numericalized = []
-            for token in word_tokens_padded:
-                char_tokens = [char for char in token]
-                char_numericalized = self.char_numericalizer.numericalize_instance(
-                    char_tokens
-                )
-                char_numericalized = self.char_numericalizer.pad_instance(
-                    numericalized_text=char_numericalized,
-                    max_length=max_token_length,
-                    add_start_end_token=False,
-                )  # max_num_chars
-                char_numericalized = torch.tensor(
-                    char_numericalized, device=self.device, dtype=torch.long
-                )
-                line_numericalized.append(char_numericalized)
-            line_numericalized = torch.stack(
-                line_numericalized
-            )  # max_line_length * max_num_chars
-            batch_numericalized.append(line_numericalized)
-
-        batch_numericalized = torch.stack(batch_numericalized)
-        batch_numericalized = batch_numericalized.view(
-            batch_size * max_line_length, max_token_length
+        # numericalized version of all the words in the lines
+        # batch_size, max_line_length
+        batch_word_idxs, _ = get_batch_tensors(
+            instances=lines,
+            namespace=self.word_tokens_namespace,
+            numericalizer=self.word_numericalizer,
+            max_length=max_line_length,
+        )
+
+        # the char lstm runs only once for every unique word in the batch
+        batch_word_idxs = batch_word_idxs.view(-1)
+        unique_word_idxs, unique_inverse = torch.unique(
+            batch_word_idxs, return_inverse=True
+        )
+
+        # num_unique_words * max_token_length
+        unique_words_numericalized = self.get_char_ids(
+            word_idxs=unique_word_idxs.tolist(), max_token_length=max_token_length
         )
 
         # get embedding for every character
 
-        # batch_size * max_line_length, max_token_length, char_emb_dim
-        embedded_tokens = self.embedding(batch_numericalized)
+        # num_unique_words, max_token_length, char_emb_dim
+        embedded_tokens = self.embedding(unique_words_numericalized)
 
         # pass through bilstm
 
-        # output: batch_size * max_line_length, max_token_length, num_directions * hidden_size
-        # h_n = num_layers * num_directions, batch_size, hidden_dimension
-        # c_n = num_layers * num_directions, batch_size, hidden_dimension
+        # output: num_unique_words, max_token_length, num_directions * hidden_size
+        # h_n = num_layers * num_directions, num_unique_words, hidden_dimension
+        # c_n = num_layers * num_directions, num_unique_words, hidden_dimension
         output, (h_n, c_n) = self.char_rnn(embedded_tokens)
 
         # concat forward and backward hidden states
         forward_hidden = h_n[0, :, :]
         backward_hidden = h_n[1, :, :]
         encoding = torch.cat([forward_hidden, backward_hidden], dim=1)
+
+        # scatter the encodings of the unique words back to their positions
+        encoding = encoding[unique_inverse.to(self.device)]
         encoding = encoding.view(
             batch_size, max_line_length, -1
         )  # batch_size, max_line_length, embedding_dimension
 
         # set the character embeddings in the line tokens
-        for idx, line in enumerate(lines):
-            line_tokens = line.tokens[self.word_tokens_namespace]
-            line_embeddings = encoding[idx]
+        if self.should_store_token_embeddings():
+            for idx, line in enumerate(lines):
+                line_tokens = line.tokens[self.word_tokens_namespace]
+                line_embeddings = encoding[idx].detach()
 
-            # note: line_tokens has no padding tokens
-            # the zip will get the embeddings for non pad tokens here
-            for token, embedding in zip(line_tokens, line_embeddings):
-                token.set_embedding(self.embedder_name, embedding)
+                # note: line_tokens has no padding tokens
+                # the zip will get the embeddings for non pad tokens here
+                for token, embedding in zip(line_tokens, line_embeddings):
+                    token.set_embedding(self.embedder_name, embedding)
 
         return encoding
 
+    def get_char_ids(
+        self, word_idxs: List[int], max_token_length: int
+    ) -> torch.LongTensor:
+        """ Returns the padded character ids of the words in the word vocab
+
+        The numericalized characters of every word are cached the first time the
+        word is seen and the padded tensor is filled in one shot using a mask
+
+        Parameters
+        ----------
+        word_idxs : List[int]
+            The indices of the words in the word vocab
+        max_token_length : int
+            The characters of every word are padded or clipped to this length
+
+        Returns
+        -------
+        torch.LongTensor
+            The character ids of size ``[len(word_idxs), max_token_length]``
+        """
+        words_char_ids = []
+        for word_idx in word_idxs:
+            char_ids = self.word_idx2char_ids.get(word_idx)
+            if char_ids is None:
+                word = self.word_vocab.get_token_from_idx(word_idx)
+                char_ids = self.char_numericalizer.numericalize_instance(list(word))
+                self.word_idx2char_ids[word_idx] = char_ids
+            words_char_ids.append(char_ids[:max_token_length])
+
+        lengths = torch.LongTensor([len(char_ids) for char_ids in words_char_ids])
+        flat_char_ids = torch.LongTensor(
+            [char_id for char_ids in words_char_ids for char_id in char_ids]
+        )
+        mask = torch.arange(max_token_length).unsqueeze(0) < lengths.unsqueeze(1)
+
+        char_ids = torch.full(
+            (len(words_char_ids), max_token_length), self.char_pad_idx, dtype=torch.long
+        )
+        char_ids[mask] = flat_char_ids
+        return char_ids.to(self.device)
+
     def get_embedding_dimension(self) -> int:
         return self.hidden_dimension * 2
@@ -0,0 +1,83 @@
+import hashlib
+import pathlib
+import h5py
+import numpy as np
+from typing import List, Optional
+
+
+class ElmoEmbeddingCache:
+    def __init__(self, cache_filename: str):
+        """ An on-disk HDF5 cache of the aggregated ELMo embeddings of lines.
+
+        The ELMo weights are frozen and the embedding of a tokenized line never
+        changes. Every line is stored as a ``[num_words, 1024]`` float32 dataset
+        keyed by a hash of the ELMo model, its tokens and the layer aggregation.
+
+        Parameters
+        ----------
+        cache_filename : str
+            The HDF5 file where the embeddings are stored. It is created
+            if it does not exist
+        """
+        self.cache_filename = pathlib.Path(cache_filename)
+        self._file = None
+
+    @property
+    def file(self) -> h5py.File:
+        if self._file is None:
+            self.cache_filename.parent.mkdir(parents=True, exist_ok=True)
+            self._file = h5py.File(str(self.cache_filename), "a")
+        return self._file
+
+    @staticmethod
+    def get_key(tokens: List[str], layer_aggregation: str, model_id: str = "") -> str:
+        """ Returns the key of the line in the cache
+
+        Parameters
+        ----------
+        tokens : List[str]
+            The tokens of the line
+        layer_aggregation : str
+            The aggregation of the ELMo layers
+        model_id : str
+            Identifies the ELMo options and weights that produced the embedding,
+            so that a different model does not read stale embeddings
+
+        Returns
+        -------
+        str
+            A hexadecimal hash of the model, the tokens and the layer aggregation
+        """
+        key = "\x1f".join([model_id, layer_aggregation] + tokens)
+        return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        if key not in self.file:
+            return None
+        return self.file[key][()]
+
+    def put(self, key: str, embedding: np.ndarray):
+        if key in self.file:
+            return
+        self.file.create_dataset(key, data=np.asarray(embedding, dtype=np.float32))
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.file
+
+    def __len__(self) -> int:
+        return len(self.file)
+
+    def flush(self):
+        if self._file is not None:
+            self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __getstate__(self):
+        # open hdf5 handles cannot be pickled. The file is reopened lazily
+        state = self.__dict__.copy()
+        state["_file"] = None
+        return state
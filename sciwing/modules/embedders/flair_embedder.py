@@ -17,6 +17,7 @@ class FlairEmbedder(nn.Module, ClassNursery, BaseEmbedder):
         datasets_manager: DatasetsManager = None,
         device: Union[str, torch.device] = "cpu",
         word_tokens_namespace: str = "tokens",
+        store_token_embeddings: bool = False,
     ):
         """ Flair Embeddings. This is used to produce Named Entity Recognition. Note: This only
         works if your tokens are produced by splitting based on white space
@@ -27,6 +28,9 @@ class FlairEmbedder(nn.Module, ClassNursery, BaseEmbedder):
         datasets_manager
         device
         word_tokens_namespace
+        store_token_embeddings
+            Whether to set the detached embeddings on the tokens. The lines of a
+            dataset keep these for the whole run, so this is off by default
         """
         super(FlairEmbedder, self).__init__()
         self.allowed_type = ["en", "news"]
@@ -37,6 +41,7 @@ class FlairEmbedder(nn.Module, ClassNursery, BaseEmbedder):
         self.datasets_manager = datasets_manager
         self.device = torch.device(device) if isinstance(device, str) else device
         self.word_tokens_namespace = word_tokens_namespace
+        self.store_token_embeddings = store_token_embeddings
 
     def forward(self, lines: List[Line]):
         sentences = []
@@ -73,12 +78,13 @@ class FlairEmbedder(nn.Module, ClassNursery, BaseEmbedder):
         batch_embeddings = torch.stack(batch_embeddings)
         batch_embeddings = batch_embeddings.to(self.device)
 
-        for idx, line in enumerate(lines):
-            line_embeddings = batch_embeddings[idx]
-            for token, emb in zip(
-                line.tokens[self.word_tokens_namespace], line_embeddings
-            ):
-                token.set_embedding(name=self.embedder_name, value=emb)
+        if self.should_store_token_embeddings():
+            for idx, line in enumerate(lines):
+                line_embeddings = batch_embeddings[idx].detach()
+                for token, emb in zip(
+                    line.tokens[self.word_tokens_namespace], line_embeddings
+                ):
+                    token.set_embedding(name=self.embedder_name, value=emb)
 
         return batch_embeddings
 
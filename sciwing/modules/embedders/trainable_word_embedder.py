@@ -5,6 +5,7 @@ import torch
 import torch.nn as nn
 from typing import List
 from sciwing.data.line import Line
+from sciwing.data.batch_collate import get_batch_tensors
 from sciwing.utils.class_nursery import ClassNursery
 
 
@@ -38,12 +39,14 @@ class TrainableWordEmbedder(nn.Module, BaseEmbedder, ClassNursery):
         self.word_tokens_namespace = word_tokens_namespace
         self.device = torch.device(device) if isinstance(device, str) else device
         self.word_tokens_namespace = word_tokens_namespace
-        self.embedding_loader = EmbeddingLoader(embedding_type=embedding_type)
-        self.embedder_name = self.embedding_loader.embedding_type
-        self.embedding_dimension = self.get_embedding_dimension()
         self.vocab = self.datasets_manager.namespace_to_vocab[
             self.word_tokens_namespace
         ]
+        self.embedding_loader = EmbeddingLoader(
+            embedding_type=embedding_type, vocab=self.vocab
+        )
+        self.embedder_name = self.embedding_loader.embedding_type
+        self.embedding_dimension = self.get_embedding_dimension()
         self.numericalizer = self.datasets_manager.namespace_to_numericalizer[
             self.word_tokens_namespace
         ]
@@ -54,23 +57,11 @@ class TrainableWordEmbedder(nn.Module, BaseEmbedder, ClassNursery):
         )
 
     def forward(self, lines: List[Line]) -> torch.FloatTensor:
-        line_lengths = [len(line.tokens[self.word_tokens_namespace]) for line in lines]
-        max_line_length = max(line_lengths)
-
-        numericalized_tokens = []
-        for line in lines:
-            tokens = line.tokens[self.word_tokens_namespace]
-            tokens = [tok.text for tok in tokens]
-            tokens = self.numericalizer.numericalize_instance(instance=tokens)
-            tokens = self.numericalizer.pad_instance(
-                numericalized_text=tokens,
-                max_length=max_line_length,
-                add_start_end_token=False,
-            )
-            numericalized_tokens.append(tokens)
-
-        numericalized_tokens = torch.tensor(
-            numericalized_tokens, dtype=torch.long, device=self.device
+        numericalized_tokens, _ = get_batch_tensors(
+            instances=lines,
+            namespace=self.word_tokens_namespace,
+            numericalizer=self.numericalizer,
+            device=self.device,
         )
         embedding = self.embedding(numericalized_tokens)
         return embedding
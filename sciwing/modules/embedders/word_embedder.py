@@ -1,8 +1,13 @@
 import torch.nn as nn
 import torch
-from typing import List, Union
+import numpy as np
+import threading
+from collections import OrderedDict
+from typing import List, Union, Dict, Optional
 from sciwing.utils.class_nursery import ClassNursery
 from sciwing.data.line import Line
+from sciwing.data.columnar_lines import ColumnarTokens
+from sciwing.data.streaming_dataset import StreamingDataset
 from sciwing.vocab.embedding_loader import EmbeddingLoader
 from sciwing.modules.embedders.base_embedders import BaseEmbedder
 from sciwing.data.datasets_manager import DatasetsManager
@@ -15,10 +20,17 @@ class WordEmbedder(nn.Module, BaseEmbedder, ClassNursery):
         datasets_manager: DatasetsManager = None,
         word_tokens_namespace="tokens",
         device: Union[torch.device, str] = torch.device("cpu"),
+        store_token_embeddings: bool = False,
+        max_cached_tokens: int = 50000,
     ):
         """ Word Embedder embeds the tokens using the desired embeddings. These are static
         embeddings.
 
+        The embeddings of all the word tokens in the datasets are gathered once into a
+        frozen embedding matrix. Every batch is embedded by indexing into this matrix.
+        Tokens that are not in the datasets are added to a bounded least recently used
+        section of the matrix when they are first seen.
+
         Parameters
         ----------
         embedding_type : str
@@ -29,6 +41,13 @@ class WordEmbedder(nn.Module, BaseEmbedder, ClassNursery):
             The namespace where the word tokens are stored in your data
         device: Union[torch.device, str]
             The device on which this embedder is run
+        store_token_embeddings: bool
+            Set the detached embeddings on the tokens of the lines. The lines of a
+            dataset keep these for the whole run, so this is off by default
+        max_cached_tokens: int
+            The maximum number of tokens outside the datasets whose embeddings are
+            kept in the matrix. The least recently used ones that are not in the
+            current batch are replaced
         """
         super(WordEmbedder, self).__init__()
 
@@ -39,6 +58,21 @@ class WordEmbedder(nn.Module, BaseEmbedder, ClassNursery):
         self.embedding_dimension = self.get_embedding_dimension()
         self.word_tokens_namespace = word_tokens_namespace
         self.device = torch.device(device) if isinstance(device, str) else device
+        self.store_token_embeddings = store_token_embeddings
+        self.max_cached_tokens = max_cached_tokens
+
+        self.pad_row = 0
+        self.token2row: Dict[str, int] = {}
+        self.cached_token2row: "OrderedDict[str, int]" = OrderedDict()
+        self.num_rows = 1
+        self._lock = threading.Lock()
+        # the matrix is derived from the embeddings and is not saved with the model
+        self.register_buffer(
+            "embedding_matrix",
+            torch.zeros(1, self.embedding_dimension, device=self.device),
+            persistent=False,
+        )
+        self.build_embedding_matrix()
 
     def forward(self, lines: List[Line]) -> torch.FloatTensor:
         """ This will only consider the "tokens" present in the line. The namespace
@@ -55,53 +89,217 @@ class WordEmbedder(nn.Module, BaseEmbedder, ClassNursery):
             It returns the embedding of the size ``[batch_size, max_num_timesteps, embedding_dimension]``
 
         """
+        token2row = self.token2row
+        # the rows of the tokens in the datasets never change. -1 marks the tokens
+        # that are not in the datasets
+        lines_rows = [
+            [
+                token2row.get(token.text, -1)
+                for token in line.tokens[self.word_tokens_namespace]
+            ]
+            for line in lines
+        ]
+        max_line_length = max(len(rows) for rows in lines_rows)
 
-        for line in lines:
-            for token in line.tokens[self.word_tokens_namespace]:
-                try:
-                    emb = self.embedding_loader.embeddings[token.text]
-                    emb = torch.tensor(emb, dtype=torch.float, device=self.device)
-                except KeyError:
-                    try:
-                        emb = self.embedding_loader.embeddings[token.text.lower()]
-                        emb = torch.tensor(emb, dtype=torch.float, device=self.device)
-                    except KeyError:
-                        emb = torch.zeros(
-                            self.embedding_dimension,
-                            device=self.device,
-                            dtype=torch.float,
-                        )
-
-                token.set_embedding(name=self.embedder_name, value=emb)
-
-        # return the [batch_size, longest_sequence, embedding_dimension]
-        # This module store all the information in the tokens and the sentences
-
-        line_lengths = [len(line.tokens[self.word_tokens_namespace]) for line in lines]
-        max_line_length = max(line_lengths)
-
-        batch_embeddings = []
-        for idx, length in enumerate(line_lengths):
-            sentence_embedding = []
-            padding_length = max_line_length - length
-            line = lines[idx]
-            tokens = line.tokens[self.word_tokens_namespace]
-            for token in tokens:
-                token_embedding = token.get_embedding(name=self.embedder_name)
-                sentence_embedding.append(token_embedding)
-            for i in range(padding_length):
-                zeros = torch.randn(
-                    self.embedding_loader.embedding_dimension,
-                    device=self.device,
-                    dtype=torch.float,
-                )
-                sentence_embedding.append(zeros)
+        missing_tokens = {
+            token.text: None
+            for line, rows in zip(lines, lines_rows)
+            if -1 in rows
+            for token in line.tokens[self.word_tokens_namespace]
+            if token.text not in token2row
+        }
+        if not missing_tokens:
+            return self._embed_rows(lines, lines_rows, max_line_length)
+
+        # the rows of the cached tokens can be replaced by other threads
+        with self._lock:
+            missing_token2row = dict(
+                zip(missing_tokens, self.get_rows_for_tokens(list(missing_tokens)))
+            )
+            for line, rows in zip(lines, lines_rows):
+                if -1 not in rows:
+                    continue
+                tokens = line.tokens[self.word_tokens_namespace]
+                rows[:] = [
+                    missing_token2row[token.text] if row == -1 else row
+                    for token, row in zip(tokens, rows)
+                ]
+            return self._embed_rows(lines, lines_rows, max_line_length)
+
+    def _embed_rows(
+        self, lines: List[Line], lines_rows: List[List[int]], max_line_length: int
+    ) -> torch.FloatTensor:
+        # the padding is embedded using the zero row of the embedding matrix
+        batch_rows = torch.LongTensor(
+            [
+                rows + [self.pad_row] * (max_line_length - len(rows))
+                for rows in lines_rows
+            ]
+        )
 
-            sentence_embedding = torch.stack(sentence_embedding)
-            batch_embeddings.append(sentence_embedding)
+        # batch_size, max_line_length, embedding_dimension
+        batch_embeddings = nn.functional.embedding(
+            batch_rows.to(self.embedding_matrix.device), self.embedding_matrix
+        )
+
+        if self.should_store_token_embeddings():
+            for idx, line in enumerate(lines):
+                tokens = line.tokens[self.word_tokens_namespace]
+                for token, embedding in zip(tokens, batch_embeddings[idx].detach()):
+                    token.set_embedding(name=self.embedder_name, value=embedding)
 
-        batch_embeddings = torch.stack(batch_embeddings)
         return batch_embeddings
 
+    def build_embedding_matrix(self):
+        """ Builds the embedding matrix for all the word tokens in the datasets
+        of the ``datasets_manager``. The embedding matrix is frozen. The first
+        row is all zeros and is used for padding and for the tokens that do not
+        have an embedding
+
+        """
+        self.token2row = {}
+        self.cached_token2row = OrderedDict()
+        self.num_rows = 1
+        self.embedding_matrix = torch.zeros(
+            1, self.embedding_dimension, device=self.embedding_matrix.device
+        )
+
+        if self.datasets_manager is None:
+            return
+
+        datasets = [
+            self.datasets_manager.train_dataset,
+            self.datasets_manager.dev_dataset,
+            self.datasets_manager.test_dataset,
+        ]
+        tokens = set()
+        for dataset in datasets:
+            if dataset is None:
+                continue
+            # the tokens of streaming datasets are cached when they are first seen,
+            # instead of tokenizing the whole file here
+            if isinstance(dataset, StreamingDataset):
+                continue
+            lines = dataset.lines
+            if isinstance(lines, ColumnarTokens):
+                tokens.update(lines.get_unique_tokens(self.word_tokens_namespace))
+                continue
+            for line in lines:
+                tokens.update(
+                    token.text for token in line.tokens[self.word_tokens_namespace]
+                )
+
+        rows = []
+        for token in tokens:
+            emb = self.get_token_embedding(token)
+            if emb is None:
+                self.token2row[token] = self.pad_row
+            else:
+                self.token2row[token] = len(rows) + 1
+                rows.append(emb)
+
+        if rows:
+            rows = torch.tensor(
+                np.array(rows), dtype=torch.float, device=self.embedding_matrix.device
+            )
+            self.embedding_matrix = torch.cat([self.embedding_matrix, rows], dim=0)
+        self.num_rows = len(self.embedding_matrix)
+
+    def get_token_embedding(self, token: str) -> Optional[np.array]:
+        """ Returns the pretrained embedding of the token or of its lower case form
+
+        Parameters
+        ----------
+        token : str
+
+        Returns
+        -------
+        Optional[np.array]
+            None if the token does not have an embedding
+        """
+        embeddings = self.embedding_loader.embeddings
+        try:
+            return embeddings[token]
+        except KeyError:
+            try:
+                return embeddings[token.lower()]
+            except KeyError:
+                return None
+
+    def get_rows_for_tokens(self, tokens: List[str]) -> List[int]:
+        """ Returns the rows of the embedding matrix for tokens that are not in the
+        datasets. They are written to the least recently used rows of the cache.
+        Tokens without an embedding use the padding row and are not cached
+
+        Parameters
+        ----------
+        tokens : List[str]
+            The unique tokens of a batch that are not in the datasets
+
+        Returns
+        -------
+        List[int]
+            The row of the embedding matrix for every token
+        """
+        # the cached tokens of the batch become the most recently used ones, so the
+        # least recently used token is never a token of the batch
+        batch_tokens = set(tokens)
+        for token in tokens:
+            if token in self.cached_token2row:
+                self.cached_token2row.move_to_end(token)
+
+        rows = []
+        for token in tokens:
+            row = self.cached_token2row.get(token)
+            if row is not None:
+                rows.append(row)
+                continue
+
+            emb = self.get_token_embedding(token)
+            if emb is None:
+                rows.append(self.pad_row)
+                continue
+
+            oldest_token = next(iter(self.cached_token2row), None)
+            # the cache grows beyond the limit only if a single batch has more
+            # tokens than the limit
+            if (
+                len(self.cached_token2row) >= self.max_cached_tokens
+                and oldest_token not in batch_tokens
+            ):
+                row = self.cached_token2row.pop(oldest_token)
+            else:
+                row = self._allocate_row()
+
+            self.embedding_matrix[row] = torch.tensor(
+                emb, dtype=torch.float, device=self.embedding_matrix.device
+            )
+            self.cached_token2row[token] = row
+            rows.append(row)
+
+        return rows
+
+    def _allocate_row(self) -> int:
+        # the matrix grows geometrically so that the rows are not copied for every batch
+        if self.num_rows == len(self.embedding_matrix):
+            capacity = 2 * len(self.embedding_matrix)
+            embedding_matrix = self.embedding_matrix.new_zeros(
+                capacity, self.embedding_dimension
+            )
+            embedding_matrix[: self.num_rows] = self.embedding_matrix
+            self.embedding_matrix = embedding_matrix
+        row = self.num_rows
+        self.num_rows += 1
+        return row
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        super(WordEmbedder, self).__setstate__(state)
+        self._lock = threading.Lock()
+
     def get_embedding_dimension(self) -> int:
         return self.embedding_loader.embedding_dimension
@@ -3,7 +3,7 @@ from sciwing.utils.class_nursery import ClassNursery
 from sciwing.data.contextual_lines import LineWithContext
 from sciwing.modules.lstm2seqencoder import Lstm2SeqEncoder
 from sciwing.modules.embedders.base_embedders import BaseEmbedder
-from typing import List, Union
+from typing import List, Union, Tuple
 import torch
 
 
@@ -39,14 +39,20 @@ class Lstm2SeqAttnContextEncoder(nn.Module, ClassNursery):
         self.context_embedder = context_embedder
         self.device = device
 
-    def forward(self, lines: List[LineWithContext]) -> torch.Tensor:
+    def forward(
+        self, lines: List[LineWithContext], return_mask: bool = False
+    ) -> Union[torch.Tensor, Tuple[torch.Tensor, torch.LongTensor]]:
 
         main_lines = []
         for line in lines:
             main_lines.append(line.line)
 
         # batch_size, number_of_time_steps, hidden_dimension
-        encoding = self.rnn2seqencoder(lines=main_lines)
+        mask = None
+        if return_mask:
+            encoding, mask = self.rnn2seqencoder(lines=main_lines, return_mask=True)
+        else:
+            encoding = self.rnn2seqencoder(lines=main_lines)
         num_timesteps = encoding.size(1)
 
         # batch_size, max_num_context_lines, hidden_dimension
@@ -94,4 +100,7 @@ class Lstm2SeqAttnContextEncoder(nn.Module, ClassNursery):
         final_encoding = torch.stack(attn_encoding, dim=1)
         final_encoding = torch.cat([encoding, final_encoding], dim=2)
 
+        if return_mask:
+            return final_encoding, mask
+
         return final_encoding
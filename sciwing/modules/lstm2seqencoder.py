@@ -1,8 +1,10 @@
 import torch
 import torch.nn as nn
 import wasabi
-from typing import List
+from typing import List, Union, Tuple
+from torch.nn.utils.rnn import pack_padded_sequence, pad_packed_sequence
 from sciwing.utils.class_nursery import ClassNursery
+from sciwing.utils.tensor_utils import get_mask, get_lengths
 from sciwing.data.line import Line
 
 
@@ -19,6 +21,8 @@ class Lstm2SeqEncoder(nn.Module, ClassNursery):
         device: torch.device = torch.device("cpu"),
         add_projection_layer: bool = True,
         projection_activation: str = "Tanh",
+        use_packed_sequence: bool = False,
+        word_tokens_namespace: str = "tokens",
     ):
         """Encodes a set of tokens to a set of hidden states.
 
@@ -48,6 +52,12 @@ class Lstm2SeqEncoder(nn.Module, ClassNursery):
             Adds a projection layer after the lstm over the hidden activation
         projection_activation: str
             Refer to torch.nn activations. Use any class name as a projection here
+        use_packed_sequence: bool
+            If True, the lengths of the lines are calculated from the tokens in
+            ``word_tokens_namespace`` and the LSTM is run only over the
+            non-pad time steps using packed sequences
+        word_tokens_namespace: str
+            The namespace of the tokens used to calculate the length of the lines
         """
         super(Lstm2SeqEncoder, self).__init__()
         self.embedder = embedder
@@ -64,6 +74,8 @@ class Lstm2SeqEncoder(nn.Module, ClassNursery):
         self.msg_printer = wasabi.Printer()
         self.add_projection_layer = add_projection_layer
         self.projection_activation = projection_activation
+        self.use_packed_sequence = use_packed_sequence
+        self.word_tokens_namespace = word_tokens_namespace
         self.projection_activation_module = getattr(
             torch.nn, self.projection_activation
         )()
@@ -98,7 +110,8 @@ class Lstm2SeqEncoder(nn.Module, ClassNursery):
         lines: List[Line],
         c0: torch.FloatTensor = None,
         h0: torch.FloatTensor = None,
-    ) -> torch.Tensor:
+        return_mask: bool = False,
+    ) -> Union[torch.Tensor, Tuple[torch.Tensor, torch.LongTensor]]:
         """
 
             Parameters
@@ -109,13 +122,17 @@ class Lstm2SeqEncoder(nn.Module, ClassNursery):
                 The initial state vector for the LSTM
             h0 : torch.FloatTensor
                 The initial hidden state for the LSTM
+            return_mask : bool
+                If True, a mask of size ``[batch_size, max_num_timesteps]`` is also
+                returned. It has 1 for the tokens of the lines and 0 for the padding
 
             Returns
             -------
-            torch.Tensor
+            Union[torch.Tensor, Tuple[torch.Tensor, torch.LongTensor]]
                 Returns the vector encoding of the set of instances
                 [batch_size, hidden_dim] if single direction
-                [batch_size, 2*hidden_dim] if bidirectional
+                [batch_size, 2*hidden_dim] if bidirectional.
+                The mask is also returned if ``return_mask`` is True
         """
 
         embeddings = self.embedder(lines=lines)
@@ -130,7 +147,25 @@ class Lstm2SeqEncoder(nn.Module, ClassNursery):
         # output = batch_size, sequence_length, num_directions * hidden_size
         # h_n = num_layers * num_directions, batch_size, hidden_dimension
         # c_n = num_layers * num_directions, batch_size, hidden_dimension
-        output, (_, _) = self.rnn(embeddings, (h0, c0))
+        lengths = None
+        if self.use_packed_sequence or return_mask:
+            lengths = get_lengths(
+                lines=lines,
+                namespace=self.word_tokens_namespace,
+                max_length=seq_length,
+            )
+
+        if self.use_packed_sequence:
+            # pack_padded_sequence does not take empty lines
+            packed_embeddings = pack_padded_sequence(
+                embeddings, lengths.clamp(min=1), batch_first=True, enforce_sorted=False
+            )
+            packed_output, (_, _) = self.rnn(packed_embeddings, (h0, c0))
+            output, _ = pad_packed_sequence(
+                packed_output, batch_first=True, total_length=seq_length
+            )
+        else:
+            output, (_, _) = self.rnn(embeddings, (h0, c0))
 
         if self.bidirectional:
             output = output.view(batch_size, seq_length, self.num_directions, -1)
@@ -150,6 +185,10 @@ class Lstm2SeqEncoder(nn.Module, ClassNursery):
                 self.projection_layer(encoding)
             )
 
+        if return_mask:
+            mask = get_mask(batch_size=batch_size, max_size=seq_length, lengths=lengths)
+            return encoding, mask.to(self.device)
+
         return encoding
 
     def get_initial_hidden(self, batch_size: int):
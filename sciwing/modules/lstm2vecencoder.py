@@ -1,9 +1,11 @@
 import torch
 import torch.nn as nn
 import wasabi
-from typing import Union, List
+from typing import Union, List, Tuple
+from torch.nn.utils.rnn import pack_padded_sequence
 from sciwing.data.line import Line
 from sciwing.utils.class_nursery import ClassNursery
+from sciwing.utils.tensor_utils import get_mask, get_lengths
 
 
 class LSTM2VecEncoder(nn.Module, ClassNursery):
@@ -16,6 +18,8 @@ class LSTM2VecEncoder(nn.Module, ClassNursery):
         combine_strategy: str = "concat",
         rnn_bias: bool = True,
         device: Union[str, torch.device] = torch.device("cpu"),
+        use_packed_sequence: bool = False,
+        word_tokens_namespace: str = "tokens",
     ):
         """LSTM2Vec encoder that encodes a series of tokens to a single vector representation
 
@@ -35,6 +39,13 @@ class LSTM2VecEncoder(nn.Module, ClassNursery):
             Whether to use the bias layer in RNN. Should be set to false only for debugging purposes
         device : Union[str, torch.device]
             The device on which the model is run
+        use_packed_sequence: bool
+            If True, the lengths of the lines are calculated from the tokens in
+            ``word_tokens_namespace`` and the LSTM is run only over the
+            non-pad time steps using packed sequences. The final hidden states
+            are then those of the last token of every line rather than the padding
+        word_tokens_namespace: str
+            The namespace of the tokens used to calculate the length of the lines
         """
         super(LSTM2VecEncoder, self).__init__()
         self.embedder = embedder
@@ -48,6 +59,8 @@ class LSTM2VecEncoder(nn.Module, ClassNursery):
         self.allowed_combine_strategies = ["sum", "concat"]
         self.rnn_bias = rnn_bias
         self.device = torch.device(device) if isinstance(device, str) else device
+        self.use_packed_sequence = use_packed_sequence
+        self.word_tokens_namespace = word_tokens_namespace
         self.msg_printer = wasabi.Printer()
 
         assert (
@@ -72,7 +85,8 @@ class LSTM2VecEncoder(nn.Module, ClassNursery):
         lines: List[Line],
         c0: torch.FloatTensor = None,
         h0: torch.FloatTensor = None,
-    ) -> torch.FloatTensor:
+        return_mask: bool = False,
+    ) -> Union[torch.FloatTensor, Tuple[torch.FloatTensor, torch.LongTensor]]:
         """
 
         Parameters
@@ -83,13 +97,17 @@ class LSTM2VecEncoder(nn.Module, ClassNursery):
             The initial state vector for the LSTM
         h0 : torch.FloatTensor
             The initial hidden state for the LSTM
+        return_mask : bool
+            If True, a mask of size ``[batch_size, max_num_timesteps]`` is also
+            returned. It has 1 for the tokens of the lines and 0 for the padding
 
         Returns
         -------
-        torch.Tensor
+        Union[torch.FloatTensor, Tuple[torch.FloatTensor, torch.LongTensor]]
             Returns the vector encoding of the set of instances
             [batch_size, hidden_dim] if single direction
-            [batch_size, 2*hidden_dim] if bidirectional
+            [batch_size, 2*hidden_dim] if bidirectional.
+            The mask is also returned if ``return_mask`` is True
         """
 
         batch_size = len(lines)
@@ -102,7 +120,26 @@ class LSTM2VecEncoder(nn.Module, ClassNursery):
         # output = batch_size, sequence_length, num_layers * num_directions
         # h_n = num_layers * num_directions, batch_size, hidden_dimension
         # c_n = num_layers * num_directions, batch_size, hidden_dimension
-        output, (h_n, c_n) = self.rnn(embedded_tokens, (h0, c0))
+        seq_length = embedded_tokens.size(1)
+        lengths = None
+        if self.use_packed_sequence or return_mask:
+            lengths = get_lengths(
+                lines=lines,
+                namespace=self.word_tokens_namespace,
+                max_length=seq_length,
+            )
+
+        if self.use_packed_sequence:
+            # pack_padded_sequence does not take empty lines
+            packed_embedded_tokens = pack_padded_sequence(
+                embedded_tokens,
+                lengths.clamp(min=1),
+                batch_first=True,
+                enforce_sorted=False,
+            )
+            output, (h_n, c_n) = self.rnn(packed_embedded_tokens, (h0, c0))
+        else:
+            output, (h_n, c_n) = self.rnn(embedded_tokens, (h0, c0))
 
         # for a discourse on bi-directional RNNs and LSTMS
         # and what h_n and c_n contain refer to
@@ -121,6 +158,10 @@ class LSTM2VecEncoder(nn.Module, ClassNursery):
         else:
             encoding = h_n[0, :, :]
 
+        if return_mask:
+            mask = get_mask(batch_size=batch_size, max_size=seq_length, lengths=lengths)
+            return encoding, mask.to(self.device)
+
         return encoding
 
     def get_initial_hidden(self, batch_size: int):
@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Dict, Optional, Tuple, Union
 from sciwing.vocab.vocab import Vocab
 from sciwing.numericalizers.base_numericalizer import BaseNumericalizer
 import torch
@@ -15,6 +15,7 @@ class Numericalizer(BaseNumericalizer):
 
         """
         super().__init__(vocabulary)
+        self._special_token_indices = None
         self.vocabulary = vocabulary
 
         if vocabulary and not self.vocabulary.vocab:
@@ -92,23 +93,23 @@ class Numericalizer(BaseNumericalizer):
             Padded instance
 
         """
-        start_token_idx = self.vocabulary.get_idx_from_token(
-            self.vocabulary.start_token
-        )
-        end_token_idx = self.vocabulary.get_idx_from_token(self.vocabulary.end_token)
-        pad_token_idx = self.vocabulary.get_idx_from_token(self.vocabulary.pad_token)
+        special_token_indices = self.get_special_token_indices()
+        start_token_idx = special_token_indices["start"]
+        end_token_idx = special_token_indices["end"]
+        pad_token_idx = special_token_indices["pad"]
 
         if not add_start_end_token:
             numericalized_text = numericalized_text[:max_length]
         else:
             max_length = max_length if max_length > 2 else 2
-            numericalized_text = numericalized_text[: max_length - 2]
-            numericalized_text.append(end_token_idx)
-            numericalized_text.insert(0, start_token_idx)
+            numericalized_text = (
+                [start_token_idx]
+                + numericalized_text[: max_length - 2]
+                + [end_token_idx]
+            )
 
         pad_length = max_length - len(numericalized_text)
-        for i in range(pad_length):
-            numericalized_text.append(pad_token_idx)
+        numericalized_text = numericalized_text + [pad_token_idx] * pad_length
 
         assert len(numericalized_text) == max_length
 
@@ -149,28 +150,124 @@ class Numericalizer(BaseNumericalizer):
     @vocabulary.setter
     def vocabulary(self, value):
         self._vocabulary = value
+        self._special_token_indices = None
 
-    def get_mask_for_instance(self, instance: List[int]) -> torch.BoolTensor:
-        start_token_idx = self.vocabulary.get_idx_from_token(
-            self.vocabulary.start_token
-        )
-        end_token_idx = self.vocabulary.get_idx_from_token(self.vocabulary.end_token)
-        pad_token_idx = self.vocabulary.get_idx_from_token(self.vocabulary.pad_token)
-        unk_token_idx = self.vocabulary.get_idx_from_token(self.vocabulary.unk_token)
-        masked_tokens = [start_token_idx, end_token_idx, pad_token_idx, unk_token_idx]
+    def get_special_token_indices(self) -> Dict[str, int]:
+        """ Returns the indices of the special tokens of the vocab.
+        They are looked up only once for every vocabulary
 
-        assert len(set(masked_tokens)) == 4
-        mask = [1 if token in masked_tokens else 0 for token in instance]
-        mask = torch.BoolTensor(mask)
+        Returns
+        -------
+        Dict[str, int]
+            Mapping from ``start``, ``end``, ``pad`` and ``unk`` to their indices
+        """
+        if self._special_token_indices is None:
+            self._special_token_indices = {
+                "start": self.vocabulary.get_idx_from_token(
+                    self.vocabulary.start_token
+                ),
+                "end": self.vocabulary.get_idx_from_token(self.vocabulary.end_token),
+                "pad": self.vocabulary.get_idx_from_token(self.vocabulary.pad_token),
+                "unk": self.vocabulary.get_idx_from_token(self.vocabulary.unk_token),
+            }
+        return self._special_token_indices
+
+    def get_mask_for_instance(self, instance: List[int]) -> torch.BoolTensor:
+        mask = self.get_mask_for_tensor(torch.LongTensor(instance))
         return mask
 
     def get_mask_for_batch_instances(
         self, instances: List[List[int]]
     ) -> torch.BoolTensor:
-        masks = []
+        masks = self.get_mask_for_tensor(torch.LongTensor(instances))
+        return masks
+
+    def get_mask_for_tensor(self, tensor: torch.LongTensor) -> torch.BoolTensor:
+        """ Returns the mask for a tensor of numericalized tokens. The start, end,
+        pad and unk tokens are masked
+
+        Parameters
+        ----------
+        tensor : torch.LongTensor
+            Tensor of numericalized tokens of any shape
+
+        Returns
+        -------
+        torch.BoolTensor
+            True wherever there is a special token
+        """
+        masked_tokens = list(self.get_special_token_indices().values())
+        assert len(set(masked_tokens)) == 4
+
+        masked_tokens = torch.tensor(masked_tokens, dtype=torch.long).to(tensor.device)
+        mask = torch.eq(tensor.unsqueeze(-1), masked_tokens).any(dim=-1)
+        return mask
+
+    def numericalize_batch_to_tensor(
+        self,
+        instances: List[List[str]],
+        max_length: Optional[int] = None,
+        add_start_end_token: bool = False,
+        device: Union[str, torch.device] = torch.device("cpu"),
+    ) -> Tuple[torch.LongTensor, torch.BoolTensor]:
+        """ Numericalizes and pads a batch of tokenized instances into a tensor
+
+        The tokens are looked up once and written into a preallocated tensor
+        that is filled with the pad index
+
+        Parameters
+        ----------
+        instances : List[List[str]]
+            A list of tokenized instances
+        max_length : Optional[int]
+            The length to pad or clip every instance to. The length of the longest
+            instance (including the start and end tokens) is used if it is None
+        add_start_end_token : bool
+            If true, start and end token will be added to every instance
+        device : Union[str, torch.device]
+            The device of the returned tensors
+
+        Returns
+        -------
+        Tuple[torch.LongTensor, torch.BoolTensor]
+            The padded instances and their mask, both of size
+            ``[len(instances), max_length]``. The mask is True for the start,
+            end, pad and unk tokens
+        """
+        special_token_indices = self.get_special_token_indices()
+        unk_token_idx = special_token_indices["unk"]
+        if not self.vocabulary.token2idx:
+            self.vocabulary.token2idx = self.vocabulary.get_token2idx_mapping()
+        token2idx = self.vocabulary.token2idx
+
+        num_special_tokens = 2 if add_start_end_token else 0
+        if max_length is None:
+            max_length = max([len(instance) for instance in instances], default=0)
+            max_length += num_special_tokens
+        if add_start_end_token:
+            max_length = max(max_length, 2)
+        max_num_tokens = max_length - num_special_tokens
+
+        indices = []
         for instance in instances:
-            mask = self.get_mask_for_instance(instance=instance).tolist()
-            masks.append(mask)
+            instance = instance[:max_num_tokens]
+            if add_start_end_token:
+                indices.append(special_token_indices["start"])
+            indices.extend(token2idx.get(token, unk_token_idx) for token in instance)
+            if add_start_end_token:
+                indices.append(special_token_indices["end"])
+
+        lengths = torch.LongTensor(
+            [
+                min(len(instance), max_num_tokens) + num_special_tokens
+                for instance in instances
+            ]
+        )
+        filled = torch.arange(max_length).unsqueeze(0) < lengths.unsqueeze(1)
+        padded = torch.full(
+            (len(instances), max_length), special_token_indices["pad"], dtype=torch.long
+        )
+        padded[filled] = torch.LongTensor(indices)
+        padded = padded.to(device)
 
-        masks = torch.BoolTensor(masks)
-        return masks
+        return padded, self.get_mask_for_tensor(padded)
@@ -1,12 +1,18 @@
 import spacy
-from typing import List
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple
 from wasabi import Printer
 from sciwing.tokenizers.BaseTokenizer import BaseTokenizer
 from sciwing.utils.custom_spacy_tokenizers import CustomSpacyWhiteSpaceTokenizer
 
 
 class WordTokenizer(BaseTokenizer):
-    def __init__(self, tokenizer: str = "spacy"):
+    # they change how fast the texts are tokenized but not the tokens
+    runtime_attributes = ["batch_size", "n_process"]
+
+    def __init__(
+        self, tokenizer: str = "spacy", batch_size: int = 1000, n_process: int = 1
+    ):
         """ WordTokenizers split the text into tokens
 
         Parameters
@@ -22,18 +28,27 @@ class WordTokenizer(BaseTokenizer):
                 Tokenize words according to space
             spacy-whtiespace
                 Same as vanilla but implemented using custom white space tokenizer from spacy
+        batch_size : int
+            The number of texts that spacy tokenizes together in ``tokenize_batch``
+        n_process : int
+            The number of processes that tokenize the texts in ``tokenize_batch``.
+            If it is greater than 1, the texts are split into chunks of ``batch_size``
+            that are tokenized in a pool of processes. The pool is created the first
+            time it is used and is shared by the tokenizers of the same type
 
 
         """
         super(WordTokenizer, self).__init__()
         self.msg_printer = Printer()
         self.tokenizer = tokenizer
+        self.batch_size = batch_size
+        self.n_process = n_process
         self.allowed_tokenizers = ["spacy", "nltk", "vanilla", "spacy-whitespace"]
         assert self.tokenizer in self.allowed_tokenizers, AssertionError(
             f"The word tokenizer can be {self.allowed_tokenizers}"
         )
 
-        if self.tokenizer == "spacy" or "spacy-whitespace":
+        if self.is_spacy_tokenizer():
             self.nlp = spacy.load("en_core_web_sm")
             self.nlp.remove_pipe("parser")
             self.nlp.remove_pipe("tagger")
@@ -56,19 +71,18 @@ class WordTokenizer(BaseTokenizer):
             A set of tokens
 
         """
-        if self.tokenizer == "spacy" or self.tokenizer == "spacy-whitespace":
+        if self.is_spacy_tokenizer():
             doc = self.nlp(text)
-            tokens = [
-                token.text for token in doc if bool(token.text.strip())
-            ]  # add token text only if they are not empty
-            return tokens
+            return self._get_doc_tokens(doc)
 
         if self.tokenizer == "vanilla":
             tokens = text.split()
             return tokens
 
     def tokenize_batch(self, texts: List[str]) -> List[List[str]]:
-        """ Tokenize a batch of sentences
+        """ Tokenize a batch of sentences. The spacy tokenizers tokenize the
+        texts in batches of ``batch_size`` with ``nlp.pipe``. If ``n_process`` is
+        greater than 1, the batches are tokenized in a pool of processes
 
         Parameters
         ----------
@@ -79,7 +93,62 @@ class WordTokenizer(BaseTokenizer):
         List[List[str]]
 
         """
+        if self.n_process > 1 and len(texts) > self.batch_size:
+            # the spacy that is pinned does not run ``nlp.pipe`` in many processes
+            executor = _get_executor(
+                tokenizer=self.tokenizer,
+                batch_size=self.batch_size,
+                n_process=self.n_process,
+            )
+            chunks = [
+                texts[start : start + self.batch_size]
+                for start in range(0, len(texts), self.batch_size)
+            ]
+            tokenized = []
+            for chunk_tokenized in executor.map(_tokenize_chunk, chunks):
+                tokenized.extend(chunk_tokenized)
+            return tokenized
+
+        if self.is_spacy_tokenizer():
+            docs = self.nlp.pipe(texts, batch_size=self.batch_size)
+            return [self._get_doc_tokens(doc) for doc in docs]
+
         tokenized = []
         for text in texts:
             tokenized.append(self.tokenize(text))
         return tokenized
+
+    def is_spacy_tokenizer(self) -> bool:
+        return self.tokenizer == "spacy" or self.tokenizer == "spacy-whitespace"
+
+    @staticmethod
+    def _get_doc_tokens(doc) -> List[str]:
+        # add token text only if they are not empty
+        return [token.text for token in doc if bool(token.text.strip())]
+
+
+# the pools that tokenize in many processes and the tokenizer of a pool process
+_executors: Dict[Tuple[str, int, int], ProcessPoolExecutor] = {}
+_worker_tokenizer: WordTokenizer = None
+
+
+def _get_executor(
+    tokenizer: str, batch_size: int, n_process: int
+) -> ProcessPoolExecutor:
+    key = (tokenizer, batch_size, n_process)
+    if key not in _executors:
+        _executors[key] = ProcessPoolExecutor(
+            max_workers=n_process,
+            initializer=_init_worker_tokenizer,
+            initargs=(tokenizer, batch_size),
+        )
+    return _executors[key]
+
+
+def _init_worker_tokenizer(tokenizer: str, batch_size: int):
+    global _worker_tokenizer
+    _worker_tokenizer = WordTokenizer(tokenizer=tokenizer, batch_size=batch_size)
+
+
+def _tokenize_chunk(texts: List[str]) -> List[List[str]]:
+    return _worker_tokenizer.tokenize_batch(texts)
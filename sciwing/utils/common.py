@@ -1,4 +1,4 @@
-from typing import Dict, List, Any, Iterable, Iterator
+from typing import Dict, List, Any, Iterable, Iterator, Callable, Tuple
 
 import math
 import requests
@@ -17,6 +17,7 @@ import psutil
 import pathlib
 from sklearn.model_selection import StratifiedShuffleSplit, ShuffleSplit
 import collections
+import itertools
 
 PATHS = constants.PATHS
 FILES = constants.FILES
@@ -604,6 +605,51 @@ def chunks(seq, n):
         yield seq[i : i + n]
 
 
+def predict_in_batches(
+    lines: Iterable[str],
+    predict_batch: Callable[[List[str]], List[Any]],
+    batch_size: int = 64,
+    window_size: int = 1024,
+) -> Iterator[Tuple[str, Any]]:
+    """ Predicts the lines in batches and yields the lines with their predictions
+    in the order of the lines.
+
+    The lines are read ``window_size`` at a time. The lines of a window are sorted by
+    their length and are predicted ``batch_size`` at a time, so that the lines of
+    a batch need little padding. Only one window is held in memory
+
+    Parameters
+    ----------
+    lines : Iterable[str]
+        The lines. This can be a file object or any other iterator
+    predict_batch : Callable[[List[str]], List[Any]]
+        Returns the prediction for every line of a batch
+    batch_size : int
+        The number of lines that are predicted together
+    window_size : int
+        The number of lines that are sorted by length together
+
+    Returns
+    -------
+    Iterator[Tuple[str, Any]]
+        The line and its prediction
+    """
+    lines = iter(lines)
+    while True:
+        window = list(itertools.islice(lines, window_size))
+        if len(window) == 0:
+            return
+
+        order = sorted(range(len(window)), key=lambda idx: len(window[idx]))
+        predictions = [None] * len(window)
+        for batch_indices in chunks(order, batch_size):
+            batch_predictions = predict_batch([window[idx] for idx in batch_indices])
+            for idx, prediction in zip(batch_indices, batch_predictions):
+                predictions[idx] = prediction
+
+        yield from zip(window, predictions)
+
+
 def create_class(classname: str, module_name: str) -> type:
     """ Given the classname and module, creates a class object and returns it
 
@@ -0,0 +1,102 @@
+import contextlib
+from typing import Any, Iterator, List, Optional, Tuple
+from sciwing.utils.common import predict_in_batches
+
+
+class FilePredictionMixin:
+    """ Predicts the lines of a file in batches. The class using this mixin
+    should define ``predict_for_batch``, which returns the prediction of every text
+    in a batch, and a ``msg_printer``. Override ``show_prediction`` to change how
+    a line and its prediction are printed
+    """
+
+    def predict_for_batch(self, texts: List[str]) -> List[Any]:
+        raise NotImplementedError
+
+    def iter_predictions_for_file(
+        self, filename: str, batch_size: int = 64
+    ) -> Iterator[Tuple[str, Any]]:
+        """ Predicts the lines of the file in batches of lines with similar lengths.
+        The file is read lazily
+
+        Parameters
+        ----------
+        filename : str
+            The file with one line per prediction
+        batch_size : int
+            The number of lines that are predicted together
+
+        Returns
+        -------
+        Iterator[Tuple[str, Any]]
+            Every line with its prediction in the order of the file
+        """
+        with open(filename) as fp:
+            lines = (line.strip() for line in fp)
+            yield from predict_in_batches(
+                lines=lines, predict_batch=self.predict_for_batch, batch_size=batch_size
+            )
+
+    def predict_for_file(
+        self,
+        filename: str,
+        batch_size: int = 64,
+        output_filename: Optional[str] = None,
+        show: bool = True,
+    ) -> List[Any]:
+        """ Predicts the lines of the file in batches
+
+        Parameters
+        ----------
+        filename : str
+            The file with one line per prediction
+        batch_size : int
+            The number of lines that are predicted together
+        output_filename : Optional[str]
+            If passed, the predictions are written to this file, one per line
+            in the order of the lines
+        show : bool
+            If True, every line and its prediction are printed
+
+        Returns
+        -------
+        List[Any]
+            The predictions in the order of the lines
+        """
+        predictions = []
+        with contextlib.ExitStack() as stack:
+            out_fp = None
+            if output_filename is not None:
+                out_fp = stack.enter_context(open(output_filename, "w"))
+
+            for line_idx, (line, prediction) in enumerate(
+                self.iter_predictions_for_file(filename=filename, batch_size=batch_size)
+            ):
+                predictions.append(prediction)
+                if out_fp is not None:
+                    out_fp.write(f"{prediction}\n")
+                if show:
+                    self.show_prediction(
+                        line=line,
+                        prediction=prediction,
+                        line_idx=line_idx,
+                        filename=filename,
+                    )
+
+        return predictions
+
+    def show_prediction(self, line: str, prediction: Any, line_idx: int, filename: str):
+        """ Prints a line of the file with its prediction
+
+        Parameters
+        ----------
+        line : str
+            The line of the file
+        prediction : Any
+            The prediction for the line
+        line_idx : int
+            The index of the line in the file
+        filename : str
+            The file that is predicted
+        """
+        self.msg_printer.text(title=line, text=prediction)
@@ -1,5 +1,5 @@
 import torch
-from typing import Union
+from typing import Union, List, Any
 
 
 def has_tensor(obj) -> bool:
@@ -44,6 +44,30 @@ def move_to_device(obj, cuda_device: torch.device):
         return obj
 
 
+def get_lengths(lines: List[Any], namespace: str, max_length: int) -> torch.LongTensor:
+    """ Returns the number of tokens in every line
+
+    Parameters
+    ----------
+    lines : List[Line]
+        A list of lines
+    namespace : str
+        The namespace of the tokens that are counted
+    max_length : int
+        The number of time steps of the embeddings. The lengths are clipped
+        to ``max_length``. Empty lines have length 0, so clamp the lengths to
+        at least 1 before passing them to ``pack_padded_sequence``
+
+    Returns
+    -------
+    torch.LongTensor
+        The lengths of the lines of size ``[batch_size]``. This is always on cpu
+    """
+    lengths = [len(line.tokens[namespace]) for line in lines]
+    lengths = torch.LongTensor(lengths).clamp(max=max_length)
+    return lengths
+
+
 def get_mask(batch_size: int, max_size: int, lengths: torch.LongTensor):
     """ Returns mask given the lengths tensor. A convenience method
 
@@ -82,3 +106,81 @@ def get_mask(batch_size: int, max_size: int, lengths: torch.LongTensor):
     mask = torch.cat(mask, dim=0)
     mask = torch.LongTensor(mask)
     return mask
+
+
+def batched_viterbi_decode(
+    logits: torch.FloatTensor,
+    transitions: torch.FloatTensor,
+    mask: torch.Tensor,
+    start_transitions: torch.FloatTensor = None,
+    end_transitions: torch.FloatTensor = None,
+) -> List[List[int]]:
+    """ Viterbi decoding for a batch of sequences of different lengths
+
+    Unlike a per-sentence Viterbi decoder, all the sentences of the batch are
+    decoded together. The loop is only over the time steps. The sequences are
+    assumed to be left aligned, i.e. the mask is 1 for the first ``length`` time
+    steps of every sequence and 0 for the rest
+
+    Parameters
+    ----------
+    logits : torch.FloatTensor
+        The unary potentials of size ``[batch_size, time_steps, num_tags]``
+    transitions : torch.FloatTensor
+        The transition potentials of size ``[num_tags, num_tags]``. ``transitions[i, j]``
+        is the score of transitioning from tag ``i`` to tag ``j``
+    mask : torch.Tensor
+        Mask of size ``[batch_size, time_steps]`` with 1 for the positions of the
+        sequences and 0 for the padding
+    start_transitions : torch.FloatTensor
+        Score of starting with every tag of size ``[num_tags]``
+    end_transitions : torch.FloatTensor
+        Score of ending with every tag of size ``[num_tags]``
+
+    Returns
+    -------
+    List[List[int]]
+        The best tag sequence for every sequence in the batch. Every sequence
+        has as many tags as the number of 1s in its mask
+    """
+    batch_size, time_steps, num_tags = logits.size()
+    mask = mask.bool()
+    lengths = mask.long().sum(dim=1).tolist()
+
+    # batch_size, num_tags
+    scores = logits[:, 0, :]
+    if start_transitions is not None:
+        scores = scores + start_transitions.unsqueeze(0)
+
+    # the back pointers for the padded time steps point to the same tag
+    # so that backtracking from the last time step passes through them unchanged
+    identity_pointers = (
+        torch.arange(num_tags, device=logits.device)
+        .unsqueeze(0)
+        .expand(batch_size, num_tags)
+    )
+    back_pointers = []
+    for time_step in range(1, time_steps):
+        # batch_size, num_tags (previous), num_tags (current)
+        transition_scores = scores.unsqueeze(2) + transitions.unsqueeze(0)
+        max_scores, max_indices = transition_scores.max(dim=1)
+        step_mask = mask[:, time_step].unsqueeze(1)
+        scores = torch.where(step_mask, max_scores + logits[:, time_step, :], scores)
+        back_pointers.append(torch.where(step_mask, max_indices, identity_pointers))
+
+    if end_transitions is not None:
+        scores = scores + end_transitions.unsqueeze(0)
+
+    _, best_last_tags = scores.max(dim=1)
+    best_tags = [best_last_tags]
+    for step_back_pointers in reversed(back_pointers):
+        best_last_tags = step_back_pointers.gather(
+            1, best_last_tags.unsqueeze(1)
+        ).squeeze(1)
+        best_tags.append(best_last_tags)
+    best_tags.reverse()
+
+    # batch_size, time_steps
+    best_tags = torch.stack(best_tags, dim=1).tolist()
+    best_tags = [tags[:length] for tags, length in zip(best_tags, lengths)]
+    return best_tags
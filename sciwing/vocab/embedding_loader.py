@@ -1,11 +1,12 @@
 import os
 import sciwing.constants as constants
-from typing import Dict, Union
+from typing import Dict, Union, Optional, Set
 import numpy as np
 from tqdm import tqdm
 from wasabi import Printer
 import gensim
 from sciwing.vocab.vocab import Vocab
+from sciwing.vocab.mmap_embeddings import MmapEmbeddings
 import torch
 
 
@@ -20,16 +21,34 @@ class EmbeddingLoader:
 
     """
 
-    def __init__(self, embedding_type: Union[str] = "glove_6B_50"):
+    def __init__(
+        self,
+        embedding_type: Union[str] = "glove_6B_50",
+        use_binary_cache: bool = True,
+        vocab: Optional[Vocab] = None,
+    ):
         """
 
         Parameters
         ----------
         embedding_type : str
             The type of embedding that needs to be loaded
+        use_binary_cache : bool
+            If True, the text embedding files are converted once into a float32 ``.npy``
+            matrix and a token file in the ``EMBEDDING_CACHE_DIR``. Later loads memory map
+            the matrix which is near instant and shares the memory across processes
+        vocab : Optional[Vocab]
+            If a vocab is passed, only the embeddings of the tokens in the vocab and their
+            lower cased versions are kept. The embedding file or the binary cache is
+            streamed once and the memory used is proportional to the size of the vocab
         """
         self.embedding_dimension = None
         self.embedding_type = embedding_type
+        self.use_binary_cache = use_binary_cache
+        self.vocab = vocab
+        self.vocab_tokens: Optional[Set[str]] = (
+            self.get_tokens_for_vocab(vocab) if vocab is not None else None
+        )
 
         self.allowed_embedding_types = [
             "glove_6B_50",
@@ -89,6 +108,9 @@ class EmbeddingLoader:
         """
         embedding_dim = int(self.embedding_type.split("_")[-1])
         self.embedding_dimension = embedding_dim
+        if self.use_binary_cache:
+            return self.load_text_embedding_with_binary_cache()
+
         glove_embeddings: Dict[str, np.array] = {}
         with self.msg_printer.loading("Loading GLOVE embeddings"):
             with open(self.embedding_filename, "r") as fp:
@@ -98,6 +120,8 @@ class EmbeddingLoader:
                 ):
                     values = line.split()
                     word = values[0]
+                    if self.vocab_tokens is not None and word not in self.vocab_tokens:
+                        continue
                     embedding = np.array([float(value) for value in values[1:]])
                     glove_embeddings[word] = embedding
 
@@ -111,6 +135,9 @@ class EmbeddingLoader:
     def load_lample_conll_embedding(self) -> Dict[str, np.array]:
         embedding_dim = 100
         self.embedding_dimension = embedding_dim
+        if self.use_binary_cache:
+            return self.load_text_embedding_with_binary_cache()
+
         lample_conll_embedding: Dict[str, np.array] = {}
         with open(self.embedding_filename, "r") as fp:
             for line in tqdm(
@@ -119,16 +146,78 @@ class EmbeddingLoader:
             ):
                 values = line.split()
                 word = values[0]
+                if self.vocab_tokens is not None and word not in self.vocab_tokens:
+                    continue
                 embedding = values[1:]
                 embedding = list(map(lambda value: float(value), embedding))
                 embedding = np.array(embedding)
                 lample_conll_embedding[word] = embedding
         return lample_conll_embedding
 
+    def load_text_embedding_with_binary_cache(self) -> MmapEmbeddings:
+        """ Loads a text embedding file through the binary cache
+
+        If the cache for the embedding type is not present in ``EMBEDDING_CACHE_DIR``
+        or the embedding file has changed since the cache was written, the text file is
+        parsed once and written to the cache. The matrix is then memory mapped
+
+        Returns
+        -------
+        MmapEmbeddings
+            A mapping from the token to its embedding
+        """
+        embeddings = MmapEmbeddings.load(
+            cache_dir=EMBEDDING_CACHE_DIR,
+            cache_name=self.embedding_type,
+            source_filename=self.embedding_filename,
+        )
+        if embeddings is not None:
+            return self._restrict_to_vocab_tokens(embeddings)
+
+        with self.msg_printer.loading(
+            f"Converting {self.embedding_filename} to binary format"
+        ):
+            embeddings = MmapEmbeddings.from_text_file(self.embedding_filename)
+            embeddings.save(
+                cache_dir=EMBEDDING_CACHE_DIR,
+                cache_name=self.embedding_type,
+                source_filename=self.embedding_filename,
+            )
+        self.msg_printer.good(f"Cached {self.embedding_type} in {EMBEDDING_CACHE_DIR}")
+
+        embeddings = MmapEmbeddings.load(
+            cache_dir=EMBEDDING_CACHE_DIR,
+            cache_name=self.embedding_type,
+            source_filename=self.embedding_filename,
+        )
+        return self._restrict_to_vocab_tokens(embeddings)
+
+    def _restrict_to_vocab_tokens(self, embeddings: MmapEmbeddings) -> MmapEmbeddings:
+        if self.vocab_tokens is None:
+            return embeddings
+        return embeddings.restrict_to_tokens(self.vocab_tokens)
+
+    @staticmethod
+    def get_tokens_for_vocab(vocab: Vocab) -> Set[str]:
+        """ Returns the tokens whose embeddings are needed for the vocab.
+        These are the tokens of the vocab and their lower cased versions
+
+        Parameters
+        ----------
+        vocab : Vocab
+
+        Returns
+        -------
+        Set[str]
+        """
+        tokens = set(vocab.get_idx2token_mapping().values())
+        lower_tokens = set(token.lower() for token in tokens)
+        return tokens.union(lower_tokens)
+
     def get_embeddings_for_vocab(self, vocab: Vocab) -> torch.FloatTensor:
         idx2item = vocab.get_idx2token_mapping()
         len_vocab = len(idx2item)
-        embeddings = []
+        embeddings = np.empty((len_vocab, self.embedding_dimension), dtype=np.float32)
         for idx in range(len_vocab):
             item = idx2item.get(idx)
             try:
@@ -141,9 +230,9 @@ class EmbeddingLoader:
                 except KeyError:
                     # nothing is working, lets fill it with random integers from normal dist
                     emb = np.random.randn(self.embedding_dimension)
-            embeddings.append(emb)
+            embeddings[idx] = emb
 
-        embeddings = torch.tensor(embeddings, dtype=torch.float)
+        embeddings = torch.from_numpy(embeddings)
         return embeddings
 
     @property
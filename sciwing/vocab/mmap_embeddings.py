@@ -0,0 +1,174 @@
+import os
+import json
+import pathlib
+import numpy as np
+from collections.abc import Mapping
+from typing import Dict, Iterator, Optional, Iterable
+
+
+class MmapEmbeddings(Mapping):
+    def __init__(self, token2idx: Dict[str, int], matrix: np.ndarray):
+        """ A read-only mapping from a token to its embedding that is backed by a
+        single float32 matrix. The matrix is usually a memory map of a ``.npy`` file
+        so that loading is near instant and many processes share the same pages.
+
+        Parameters
+        ----------
+        token2idx : Dict[str, int]
+            Mapping from a token to its row in the matrix
+        matrix : np.ndarray
+            The embedding matrix of size ``[num_tokens, embedding_dimension]``
+        """
+        self.token2idx = token2idx
+        self.matrix = matrix
+
+    def __getitem__(self, token: str) -> np.ndarray:
+        return self.matrix[self.token2idx[token]]
+
+    def __contains__(self, token) -> bool:
+        return token in self.token2idx
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.token2idx)
+
+    def __len__(self) -> int:
+        return len(self.token2idx)
+
+    @property
+    def embedding_dimension(self) -> int:
+        return self.matrix.shape[1]
+
+    def restrict_to_tokens(self, tokens: Iterable[str]) -> "MmapEmbeddings":
+        """ Returns the embeddings of only the ``tokens`` that are present.
+        The rows are copied into memory, so the returned embeddings do not keep
+        the full memory map alive
+
+        Parameters
+        ----------
+        tokens : Iterable[str]
+
+        Returns
+        -------
+        MmapEmbeddings
+        """
+        present_tokens = [token for token in tokens if token in self.token2idx]
+        rows = [self.token2idx[token] for token in present_tokens]
+        matrix = np.array(self.matrix[np.array(rows, dtype=np.int64)])
+        token2idx = dict(zip(present_tokens, range(len(present_tokens))))
+        return MmapEmbeddings(token2idx=token2idx, matrix=matrix)
+
+    @staticmethod
+    def get_cache_filenames(cache_dir: str, cache_name: str) -> Dict[str, pathlib.Path]:
+        cache_dir = pathlib.Path(cache_dir)
+        return {
+            "matrix": cache_dir.joinpath(f"{cache_name}.npy"),
+            "tokens": cache_dir.joinpath(f"{cache_name}.tokens.txt"),
+            "meta": cache_dir.joinpath(f"{cache_name}.meta.json"),
+        }
+
+    @staticmethod
+    def get_source_signature(source_filename: str) -> Dict[str, int]:
+        stat = os.stat(source_filename)
+        return {"size": stat.st_size, "mtime": int(stat.st_mtime)}
+
+    @classmethod
+    def from_text_file(cls, filename: str) -> "MmapEmbeddings":
+        """ Parses a text file with one token followed by its embedding on every line.
+        This is the format of the GloVe and the Lample CoNLL embeddings
+
+        Parameters
+        ----------
+        filename : str
+            The text embedding file
+
+        Returns
+        -------
+        MmapEmbeddings
+            Embeddings backed by an in-memory float32 matrix
+        """
+        token2idx: Dict[str, int] = {}
+        rows = []
+        with open(filename, "r") as fp:
+            for line in fp:
+                values = line.split()
+                if not values:
+                    continue
+                word = values[0]
+                if word in token2idx:
+                    continue
+                token2idx[word] = len(rows)
+                rows.append(np.array(values[1:], dtype=np.float32))
+
+        return cls(token2idx=token2idx, matrix=np.stack(rows))
+
+    def save(self, cache_dir: str, cache_name: str, source_filename: str):
+        """ Saves the embeddings in the binary format to the ``cache_dir``
+
+        The matrix is saved as a float32 ``.npy`` file and the tokens are saved
+        one per line in their row order. The files are first written to temporary
+        files and then moved, so that processes reading the cache never see
+        partially written files
+
+        Parameters
+        ----------
+        cache_dir : str
+            The directory where the cache is stored
+        cache_name : str
+            The name of the cache. Usually the embedding type
+        source_filename : str
+            The text file from which the embeddings were parsed. The cache is
+            rebuilt if this file changes
+        """
+        filenames = self.get_cache_filenames(cache_dir, cache_name)
+        pid = os.getpid()
+
+        tmp_matrix_filename = filenames["matrix"].with_suffix(f".{pid}.tmp.npy")
+        np.save(str(tmp_matrix_filename), np.asarray(self.matrix, dtype=np.float32))
+
+        tmp_tokens_filename = filenames["tokens"].with_suffix(f".{pid}.tmp")
+        tokens = sorted(self.token2idx.keys(), key=lambda token: self.token2idx[token])
+        with open(tmp_tokens_filename, "w", encoding="utf-8") as fp:
+            fp.write("\n".join(tokens))
+
+        tmp_meta_filename = filenames["meta"].with_suffix(f".{pid}.tmp")
+        with open(tmp_meta_filename, "w") as fp:
+            json.dump(self.get_source_signature(source_filename), fp)
+
+        os.replace(tmp_matrix_filename, filenames["matrix"])
+        os.replace(tmp_tokens_filename, filenames["tokens"])
+        os.replace(tmp_meta_filename, filenames["meta"])
+
+    @classmethod
+    def load(
+        cls, cache_dir: str, cache_name: str, source_filename: str
+    ) -> Optional["MmapEmbeddings"]:
+        """ Loads the embeddings from the binary cache with the matrix memory mapped
+
+        Parameters
+        ----------
+        cache_dir : str
+            The directory where the cache is stored
+        cache_name : str
+            The name of the cache. Usually the embedding type
+        source_filename : str
+            The text file from which the cache was built
+
+        Returns
+        -------
+        Optional[MmapEmbeddings]
+            None if the cache does not exist or is stale
+        """
+        filenames = cls.get_cache_filenames(cache_dir, cache_name)
+        if not all(filename.is_file() for filename in filenames.values()):
+            return None
+
+        with open(filenames["meta"]) as fp:
+            signature = json.load(fp)
+        if signature != cls.get_source_signature(source_filename):
+            return None
+
+        with open(filenames["tokens"], "r", encoding="utf-8") as fp:
+            tokens = fp.read().split("\n")
+        token2idx = dict(zip(tokens, range(len(tokens))))
+        matrix = np.load(str(filenames["matrix"]), mmap_mode="r")
+        return cls(token2idx=token2idx, matrix=matrix)
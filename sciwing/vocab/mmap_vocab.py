@@ -0,0 +1,331 @@
+import os
+import zlib
+import functools
+import pathlib
+import numpy as np
+from collections.abc import Mapping
+from typing import Dict, Iterator, Tuple, Union, Any, Optional
+
+
+class VocabTables:
+    ARRAY_NAMES = [
+        "strings",
+        "offsets",
+        "freqs",
+        "indices",
+        "orig_indices",
+        "hash_table",
+        "idx2position",
+    ]
+
+    def __init__(self, arrays: Dict[str, np.ndarray], directory: Optional[str] = None):
+        """ The tokens of a vocab stored in a few flat arrays. The arrays are usually
+        memory maps of ``.npy`` files, so loading is near instant and the worker
+        processes share the same pages instead of holding their own dicts.
+
+        Every token has a position. The arrays are
+
+        strings
+            The utf-8 bytes of all the tokens one after the other
+        offsets
+            The token at a position is ``strings[offsets[position]: offsets[position + 1]]``
+        freqs
+            The frequency of the token at a position
+        indices
+            The index of the token at a position
+        orig_indices
+            The index of the token before the vocab was clipped. It is -1 for tokens
+            that were added after the vocab was built
+        hash_table
+            An open addressing hash table from the crc32 of a token to its position.
+            Empty slots are -1
+        idx2position
+            The position of the token that is returned for an index. It is -1 for
+            indices without a token
+
+        Parameters
+        ----------
+        arrays : Dict[str, np.ndarray]
+            Mapping from the names in ``ARRAY_NAMES`` to the arrays
+        directory : Optional[str]
+            The directory from which the arrays are memory mapped. If this is set,
+            the tables are pickled as the directory and are memory mapped again
+            when unpickled in another process
+        """
+        self.arrays = arrays
+        self.directory = directory
+        self.strings = arrays["strings"]
+        self.offsets = arrays["offsets"]
+        self.freqs = arrays["freqs"]
+        self.indices = arrays["indices"]
+        self.orig_indices = arrays["orig_indices"]
+        self.hash_table = arrays["hash_table"]
+        self.idx2position = arrays["idx2position"]
+        self.hash_mask = len(self.hash_table) - 1
+
+        # indexing memoryviews returns python ints and bytes, which is much faster
+        # than indexing the numpy arrays one element at a time
+        self._strings_view = memoryview(np.ascontiguousarray(self.strings))
+        self._offsets_view = memoryview(np.ascontiguousarray(self.offsets))
+        self._hash_table_view = memoryview(np.ascontiguousarray(self.hash_table))
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        if self.directory is not None:
+            return {"directory": self.directory}
+        return {"arrays": self.arrays}
+
+    def __setstate__(self, state: Dict[str, Any]):
+        if "directory" in state:
+            arrays = self.load_arrays(state["directory"])
+        else:
+            arrays = state["arrays"]
+        self.__init__(arrays=arrays, directory=state.get("directory"))
+
+    @classmethod
+    def from_vocab(
+        cls,
+        vocab: Dict[str, Tuple[Union[int, float], int]],
+        orig_vocab: Dict[str, Tuple[Union[int, float], int]],
+    ) -> "VocabTables":
+        """ Makes the tables of a vocab in memory
+
+        Parameters
+        ----------
+        vocab : Dict[str, Tuple[Union[int, float], int]]
+            The mapping from token to its frequency and index
+        orig_vocab : Dict[str, Tuple[Union[int, float], int]]
+            The mapping from token to its frequency and index before clipping
+
+        Returns
+        -------
+        VocabTables
+        """
+        tokens = list(vocab.keys())
+        encoded_tokens = [token.encode("utf-8") for token in tokens]
+        lengths = np.array([len(encoded) for encoded in encoded_tokens], dtype=np.int64)
+        offsets = np.zeros(len(tokens) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        strings = np.frombuffer(b"".join(encoded_tokens), dtype=np.uint8)
+
+        freqs = np.array([vocab[token][0] for token in tokens], dtype=np.float64)
+        indices = np.array([vocab[token][1] for token in tokens], dtype=np.int64)
+        orig_indices = np.array(
+            [orig_vocab[token][1] if token in orig_vocab else -1 for token in tokens],
+            dtype=np.int64,
+        )
+
+        # the table is at most half full so that the probe sequences are short
+        table_size = 8
+        while table_size < 2 * len(tokens):
+            table_size *= 2
+        hash_table = np.full(table_size, -1, dtype=np.int64)
+        hash_mask = table_size - 1
+        for position, encoded in enumerate(encoded_tokens):
+            slot = zlib.crc32(encoded) & hash_mask
+            while hash_table[slot] != -1:
+                slot = (slot + 1) & hash_mask
+            hash_table[slot] = position
+
+        # many tokens can share an index after clipping. As in
+        # ``Vocab.get_idx2token_mapping`` the last token with an index is used
+        max_idx = int(indices.max()) if len(indices) > 0 else -1
+        idx2position = np.full(max_idx + 1, -1, dtype=np.int64)
+        idx2position[indices] = np.arange(len(tokens), dtype=np.int64)
+
+        arrays = {
+            "strings": strings,
+            "offsets": offsets,
+            "freqs": freqs,
+            "indices": indices,
+            "orig_indices": orig_indices,
+            "hash_table": hash_table,
+            "idx2position": idx2position,
+        }
+        return cls(arrays=arrays)
+
+    def save(self, directory: str):
+        """ Saves every array as a ``.npy`` file in the directory. The files are
+        first written to temporary files and then moved
+
+        Parameters
+        ----------
+        directory : str
+        """
+        directory = pathlib.Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        pid = os.getpid()
+        for name in self.ARRAY_NAMES:
+            tmp_filename = directory.joinpath(f"{name}.{pid}.tmp.npy")
+            np.save(str(tmp_filename), np.asarray(self.arrays[name]))
+            os.replace(tmp_filename, directory.joinpath(f"{name}.npy"))
+
+    @classmethod
+    def load_arrays(cls, directory: str) -> Dict[str, np.ndarray]:
+        directory = pathlib.Path(directory)
+        return {
+            name: np.load(str(directory.joinpath(f"{name}.npy")), mmap_mode="r")
+            for name in cls.ARRAY_NAMES
+        }
+
+    @classmethod
+    def load(cls, directory: str) -> "VocabTables":
+        """ Memory maps the tables saved in the directory
+
+        Parameters
+        ----------
+        directory : str
+
+        Returns
+        -------
+        VocabTables
+        """
+        return cls(arrays=cls.load_arrays(directory), directory=str(directory))
+
+    def get_position(self, token: str) -> int:
+        """ Returns the position of the token or -1 if it is not in the vocab
+        """
+        encoded = token.encode("utf-8")
+        hash_table = self._hash_table_view
+        slot = zlib.crc32(encoded) & self.hash_mask
+        while True:
+            position = hash_table[slot]
+            if position == -1 or self.get_token_bytes(position) == encoded:
+                return position
+            slot = (slot + 1) & self.hash_mask
+
+    def get_token_bytes(self, position: int) -> bytes:
+        start = self._offsets_view[position]
+        end = self._offsets_view[position + 1]
+        return self._strings_view[start:end].tobytes()
+
+    def get_token(self, position: int) -> str:
+        return self.get_token_bytes(position).decode("utf-8")
+
+    def get_freq(self, position: int) -> Union[int, float]:
+        freq = float(self.freqs[position])
+        return int(freq) if freq.is_integer() else freq
+
+    def get_vocab_len(self) -> int:
+        return int(np.count_nonzero(np.bincount(self.indices)))
+
+    def get_max_idx(self) -> int:
+        return int(self.indices.max()) if len(self.indices) > 0 else -1
+
+
+class MmapVocabMapping(Mapping):
+    def __init__(self, tables: VocabTables):
+        """ A read-only mapping over the ``VocabTables`` of a vocab
+
+        Parameters
+        ----------
+        tables : VocabTables
+        """
+        self.tables = tables
+
+    def __len__(self) -> int:
+        return len(self.tables)
+
+    def __iter__(self) -> Iterator:
+        for position in range(len(self.tables)):
+            yield self.tables.get_token(position)
+
+
+class MmapToken2Idx(MmapVocabMapping):
+    """ Mapping from a token to its index. The most recently looked up tokens are
+    cached, because the same tokens are numericalized again and again
+    """
+
+    def __init__(self, tables: VocabTables, cache_size: int = 65536):
+        """
+
+        Parameters
+        ----------
+        tables : VocabTables
+        cache_size : int
+            The maximum number of tokens whose index is cached
+        """
+        super(MmapToken2Idx, self).__init__(tables)
+        self.cache_size = cache_size
+        self._get_idx = functools.lru_cache(maxsize=cache_size)(self._lookup_idx)
+
+    def _lookup_idx(self, token: str) -> int:
+        position = self.tables.get_position(token)
+        if position == -1:
+            return -1
+        return int(self.tables.indices[position])
+
+    def __getitem__(self, token: str) -> int:
+        idx = self._get_idx(token)
+        if idx == -1:
+            raise KeyError(token)
+        return idx
+
+    def __contains__(self, token) -> bool:
+        return self._get_idx(token) != -1
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {"tables": self.tables, "cache_size": self.cache_size}
+
+    def __setstate__(self, state: Dict[str, Any]):
+        self.__init__(state["tables"], cache_size=state.get("cache_size", 65536))
+
+
+class MmapIdx2Token(MmapVocabMapping):
+    """ Mapping from an index to its token
+    """
+
+    def __getitem__(self, idx: int) -> str:
+        if not 0 <= idx < len(self.tables.idx2position):
+            raise KeyError(idx)
+        position = int(self.tables.idx2position[idx])
+        if position == -1:
+            raise KeyError(idx)
+        return self.tables.get_token(position)
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(np.asarray(self.tables.idx2position) != -1))
+
+    def __iter__(self) -> Iterator[int]:
+        idx2position = np.asarray(self.tables.idx2position)
+        return iter(np.nonzero(idx2position != -1)[0].tolist())
+
+
+class MmapFreqIdx(MmapVocabMapping):
+    def __init__(self, tables: VocabTables, orig: bool = False):
+        """ Mapping from a token to its frequency and index
+
+        Parameters
+        ----------
+        tables : VocabTables
+        orig : bool
+            If True, this is the mapping before the vocab was clipped. The tokens that
+            were added after the vocab was built are not part of it
+        """
+        super(MmapFreqIdx, self).__init__(tables)
+        self.orig = orig
+
+    def _get_indices(self) -> np.ndarray:
+        return self.tables.orig_indices if self.orig else self.tables.indices
+
+    def __getitem__(self, token: str) -> Tuple[Union[int, float], int]:
+        position = self.tables.get_position(token)
+        if position == -1:
+            raise KeyError(token)
+        idx = int(self._get_indices()[position])
+        if idx == -1:
+            raise KeyError(token)
+        return self.tables.get_freq(position), idx
+
+    def __len__(self) -> int:
+        if not self.orig:
+            return len(self.tables)
+        return int(np.count_nonzero(np.asarray(self.tables.orig_indices) != -1))
+
+    def __iter__(self) -> Iterator[str]:
+        indices = self._get_indices()
+        for position in range(len(self.tables)):
+            if indices[position] != -1:
+                yield self.tables.get_token(position)
@@ -1,13 +1,19 @@
-from typing import List, Dict, Tuple, Optional, Callable
+from typing import List, Dict, Tuple, Optional, Callable, Iterable, Any
 from collections import Counter
 from operator import itemgetter
 import json
 import os
+import pathlib
 from wasabi import Printer
 import wasabi
-from copy import deepcopy
 from sciwing.data.token import Token
-from sciwing.utils.common import flatten
+from sciwing.vocab.mmap_vocab import (
+    VocabTables,
+    MmapVocabMapping,
+    MmapFreqIdx,
+    MmapToken2Idx,
+    MmapIdx2Token,
+)
 
 
 class Vocab:
@@ -31,7 +37,8 @@ class Vocab:
         Parameters
         ----------
         instances : Optional[List[List[str]]]
-            A list of tokenized instances
+            A list of tokenized instances. More instances can be counted
+            with ``count_instances`` before the vocab is built
         max_num_tokens : int
             The maximum number of tokens to be used in the vocab
             All the other tokens above this number will be replaced
@@ -72,7 +79,6 @@ class Vocab:
             example methods look at instance_preprocessing module in sciwing.preprocessing
         """
 
-        self.instances = instances
         self.max_num_tokens = max_num_tokens
         self.min_count = min_count
         self.unk_token = unk_token
@@ -82,6 +88,8 @@ class Vocab:
         self.special_token_freq = special_token_freq
         self.vocab = None
         self.orig_vocab = None
+        # the frequency of every token in the order in which they were first seen
+        self.token_counter: Counter = Counter()
         self.idx2token = None
         self.token2idx = None
         self.store_location = store_location
@@ -113,53 +121,81 @@ class Vocab:
             self.special_vocab = {}
 
         if instances is not None:
-            self.instances = list(
-                flatten(instances)
-            )  # just flatten the entire instance
-            if isinstance(self.instances[0], Token):
-                self.instances = [tok.text for tok in self.instances]
-            if self.preprocessing_pipeline:
-                self.instances = self.apply_preprocessing()
-
-    def apply_preprocessing(self):
-        instances = deepcopy(self.instances)
+            self.count_instances(instances)
+
+    def count_instances(self, instances: Iterable[Iterable[Any]]):
+        """ Counts the tokens of the instances. The instances are consumed
+        one at a time, so they can be a generator over the lines of a dataset
+        that is being parsed. Only the counts of the tokens are kept
+
+        Parameters
+        ----------
+        instances : Iterable[Iterable[Any]]
+            The tokenized instances. The tokens can be strings or ``Token``
+        """
+        for instance in instances:
+            self.count_instance(instance)
+
+    def count_instance(self, instance: Iterable[Any]):
+        """ Counts the tokens of a single instance
+
+        Parameters
+        ----------
+        instance : Iterable[Any]
+            The tokens of the instance. They can be strings, ``Token`` or
+            nested lists of them
+        """
+        tokens = self._get_token_texts(instance)
+        if self.preprocessing_pipeline:
+            tokens = self.apply_preprocessing(tokens)
+        self.token_counter.update(tokens)
+
+    @classmethod
+    def _get_token_texts(cls, instance: Any) -> List[str]:
+        if isinstance(instance, str):
+            return [instance]
+        if isinstance(instance, Token):
+            return [instance.text]
+
+        texts = []
+        for token in instance:
+            if isinstance(token, str):
+                texts.append(token)
+            elif isinstance(token, Token):
+                texts.append(token.text)
+            else:
+                texts.extend(cls._get_token_texts(token))
+        return texts
+
+    def apply_preprocessing(self, tokens: List[str]) -> List[str]:
         for preprocessor in self.preprocessing_pipeline:
-            instances = preprocessor(instances)
+            tokens = preprocessor(tokens)
 
-        return instances
+        return tokens
 
     def map_tokens_to_freq_idx(self) -> Dict[str, Tuple[int, int]]:
         """
-        Build vocab from instances
+        Build vocab from the counted tokens
         return the word -> (freq, idx)
         :return:
         """
-        all_tokens = deepcopy(self.instances)
-
-        # counter will map a list to Dict[str, count] values
-        counter = Counter(all_tokens)
-
-        # order the order in decreasing order of their frequencies
-        # List[Tuple]
-        counter = sorted(counter.items(), key=itemgetter(1), reverse=True)
+        # The tokens are ordered in decreasing order of their frequencies.
+        # Tokens with the same frequency are ordered by the reverse of the order
+        # in which they were first seen. The special tokens have the highest
+        # frequencies and come first. They replace the tokens of the
+        # instances that are the same as them
+        tokens_freqs = [
+            (token, (freq, position))
+            for position, (token, freq) in enumerate(self.token_counter.items())
+            if token not in self.special_vocab
+        ]
+        tokens_freqs.extend(self.special_vocab.items())
+        tokens_freqs.sort(key=itemgetter(1), reverse=True)
 
         vocab = {}
-
-        for idx, (token, freq) in enumerate(counter):
-            vocab[token] = (freq, len(self.special_vocab) + idx)
-
-        # merge the two dictionaries
-        # courtesy https://stackoverflow.com/questions/38987/how-to-merge-two-dictionaries-in-a-single-expression
-        vocab = {**vocab, **self.special_vocab}
-
-        # BUG: if vocab and special vocab share same token, then
-        # the index of the vocab will get overwritten by special vocab
-        # the only way now is to recalculate indices based on frequencies
-        vocab = sorted(vocab.items(), key=itemgetter(1), reverse=True)
-        new_vocab = {}
-        for idx, (token, (freq, _)) in enumerate(vocab):
-            new_vocab[token] = (freq, idx)
-        return new_vocab
+        for idx, (token, (freq, _)) in enumerate(tokens_freqs):
+            vocab[token] = (freq, idx)
+        return vocab
 
     def clip_on_mincount(
         self, vocab: Dict[str, Tuple[int, int]]
@@ -206,26 +242,25 @@ class Vocab:
         :param token: type str
         :return:
         """
-        try:
-            vocab = self.vocab
-        except AttributeError:
+        if not self.vocab:
             self.msg_printer.fail("Please build vocab using build vocab")
-        tokens = vocab.keys()
-        indices = [idx for freq, idx in vocab.values()]
-        indices = sorted(indices, reverse=True)
-        highest_idx = indices[0]
 
-        if token not in tokens:
+        if isinstance(self.vocab, MmapVocabMapping):
+            self._load_into_memory()
+
+        if token not in self.vocab:
+            highest_idx = self.get_max_idx()
+            vocab_len = self.get_vocab_len()
             self.vocab[token] = (1, highest_idx + 1)
             self.idx2token[highest_idx + 1] = token
             self.token2idx[token] = highest_idx + 1
+            self._max_idx = highest_idx + 1
+            self._vocab_len = vocab_len + 1
             if save_vocab:
                 self.save_to_file(self.store_location)  # this can be expensive.
 
     def add_tokens(self, tokens: List[str]):
-        try:
-            vocab = self.vocab
-        except AttributeError:
+        if not self.vocab:
             self.msg_printer.fail("Please build vocab first")
 
         for token in tokens:
@@ -252,7 +287,8 @@ class Vocab:
             vocab = self.map_tokens_to_freq_idx()
 
             # dictionary are passed by reference. Be careful
-            self.orig_vocab = deepcopy(vocab)
+            # The values are tuples, so a shallow copy is enough
+            self.orig_vocab = dict(vocab)
 
             # set max num of tokens to maximum possible if it is not set
             if self.max_num_tokens is None:
@@ -273,8 +309,29 @@ class Vocab:
         if not self.vocab:
             raise ValueError("Build vocab first by calling build_vocab()")
 
-        length = len(set(idx for freq, idx in self.vocab.values()))
-        return length
+        # many tokens share the index of the unk token after clipping.
+        # The length is calculated once and updated when tokens are added
+        if self._vocab_len is None and isinstance(self.vocab, MmapVocabMapping):
+            self._vocab_len = self.vocab.tables.get_vocab_len()
+        if self._vocab_len is None:
+            self._vocab_len = len(set(idx for freq, idx in self.vocab.values()))
+        return self._vocab_len
+
+    def get_max_idx(self) -> int:
+        """ Returns the highest index of the vocab
+
+        Returns
+        -------
+        int
+        """
+        if not self.vocab:
+            raise ValueError("Build vocab first by calling build_vocab()")
+
+        if self._max_idx is None and isinstance(self.vocab, MmapVocabMapping):
+            self._max_idx = self.vocab.tables.get_max_idx()
+        if self._max_idx is None:
+            self._max_idx = max(idx for freq, idx in self.vocab.values())
+        return self._max_idx
 
     def get_orig_vocab_len(self) -> int:
         if not self.orig_vocab:
@@ -317,18 +374,9 @@ class Vocab:
             raise ValueError("Build vocab first by calling build_vocab()")
 
         vocab_state = dict()
-        vocab_state["options"] = {
-            "max_num_words": self.max_num_tokens,
-            "min_count": self.min_count,
-            "unk_token": self.unk_token,
-            "pad_token": self.pad_token,
-            "start_token": self.start_token,
-            "end_token": self.end_token,
-            "special_token_freq": self.special_token_freq,
-            "special_vocab": self.special_vocab,
-        }
-        vocab_state["vocab"] = self.vocab
-        vocab_state["orig_vocab"] = self.orig_vocab
+        vocab_state["options"] = self.get_options()
+        vocab_state["vocab"] = dict(self.vocab)
+        vocab_state["orig_vocab"] = dict(self.orig_vocab)
         try:
             with open(filename, "w") as fp:
                 json.dump(vocab_state, fp)
@@ -351,25 +399,7 @@ class Vocab:
                 # restore the object
                 # restore all the property values from the file
 
-                max_num_tokens = vocab_options["max_num_words"]
-                min_count = vocab_options["min_count"]
-                unk_token = vocab_options["unk_token"]
-                pad_token = vocab_options["pad_token"]
-                start_token = vocab_options["start_token"]
-                end_token = vocab_options["end_token"]
-                special_token_freq = vocab_options["special_token_freq"]
-                store_location = filename
-                vocab = cls(
-                    max_num_tokens=max_num_tokens,
-                    min_count=min_count,
-                    unk_token=unk_token,
-                    pad_token=pad_token,
-                    start_token=start_token,
-                    end_token=end_token,
-                    instances=None,
-                    special_token_freq=special_token_freq,
-                    store_location=store_location,
-                )
+                vocab = cls.from_options(options=vocab_options, store_location=filename)
 
                 # instead of building the vocab, set the vocab from vocab_dict
                 vocab.set_vocab(vocab=vocab_dict)
@@ -387,6 +417,104 @@ class Vocab:
                 "a json file".format(filename)
             )
 
+    def get_options(self) -> Dict[str, Any]:
+        """ Returns the options of the vocab that are saved with it
+        """
+        return {
+            "max_num_words": self.max_num_tokens,
+            "min_count": self.min_count,
+            "unk_token": self.unk_token,
+            "pad_token": self.pad_token,
+            "start_token": self.start_token,
+            "end_token": self.end_token,
+            "special_token_freq": self.special_token_freq,
+            "special_vocab": self.special_vocab,
+            "include_special_vocab": self.include_special_vocab,
+        }
+
+    @classmethod
+    def from_options(
+        cls, options: Dict[str, Any], store_location: Optional[str] = None
+    ) -> "Vocab":
+        """ Makes an empty vocab with the options returned by ``get_options``
+        """
+        return cls(
+            max_num_tokens=options["max_num_words"],
+            min_count=options["min_count"],
+            unk_token=options["unk_token"],
+            pad_token=options["pad_token"],
+            start_token=options["start_token"],
+            end_token=options["end_token"],
+            instances=None,
+            special_token_freq=options["special_token_freq"],
+            store_location=store_location,
+            include_special_vocab=options.get("include_special_vocab", True),
+        )
+
+    def save_to_binary_file(self, directory: str):
+        """ Saves the vocab in a compact binary format that can be memory mapped.
+        The tokens are stored as a single string table with offsets and a hash
+        index. See ``VocabTables`` for the format
+
+        Parameters
+        ----------
+        directory : str
+            The directory where the vocab is saved. The options of the vocab
+            are written last to ``options.json``
+        """
+        if not self.vocab:
+            raise ValueError("Build vocab first by calling build_vocab()")
+
+        directory = pathlib.Path(directory)
+        if isinstance(self.vocab, MmapVocabMapping):
+            tables = self.vocab.tables
+        else:
+            tables = VocabTables.from_vocab(
+                vocab=self.vocab, orig_vocab=self.orig_vocab
+            )
+        tables.save(str(directory))
+
+        tmp_filename = directory.joinpath(f"options.{os.getpid()}.tmp")
+        with open(tmp_filename, "w") as fp:
+            json.dump(self.get_options(), fp)
+        os.replace(tmp_filename, directory.joinpath("options.json"))
+
+    @classmethod
+    def load_from_binary_file(cls, directory: str) -> "Vocab":
+        """ Loads a vocab saved with ``save_to_binary_file``. The tables are memory
+        mapped and are not read into dicts. ``vocab``, ``orig_vocab``, ``token2idx``
+        and ``idx2token`` are read-only mappings over the tables. They are copied
+        into dicts only if tokens are added to the vocab
+
+        Parameters
+        ----------
+        directory : str
+            The directory where the vocab is saved
+
+        Returns
+        -------
+        Vocab
+        """
+        directory = pathlib.Path(directory)
+        with open(directory.joinpath("options.json")) as fp:
+            options = json.load(fp)
+
+        vocab = cls.from_options(options=options)
+        tables = VocabTables.load(str(directory))
+        vocab.set_vocab(MmapFreqIdx(tables))
+        vocab.set_orig_vocab(MmapFreqIdx(tables, orig=True))
+        vocab.set_token2idx(MmapToken2Idx(tables))
+        vocab.set_idx2token(MmapIdx2Token(tables))
+        return vocab
+
+    def _load_into_memory(self):
+        """ Copies the memory mapped vocab into dicts so that it can be changed
+        """
+        self.vocab = dict(self.vocab)
+        self.orig_vocab = dict(self.orig_vocab)
+        self.idx2token = self.get_idx2token_mapping()
+        self.token2idx = self.get_token2idx_mapping()
+
     def get_token_from_idx(self, idx: int) -> str:
         if not self.vocab:
             raise ValueError("Please build the vocab first")
@@ -486,6 +614,23 @@ class Vocab:
         sentence = " ".join(token)
         return sentence
 
+    @property
+    def instances(self) -> List[str]:
+        """ The counted tokens, each repeated as many times as it was counted.
+        Only the counts are stored, so the order of the tokens is not kept
+        """
+        return list(self.token_counter.elements())
+
+    @property
+    def vocab(self):
+        return self._vocab
+
+    @vocab.setter
+    def vocab(self, value):
+        self._vocab = value
+        self._vocab_len = None
+        self._max_idx = None
+
     @property
     def token2idx(self):
         return self._token2idx
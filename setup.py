@@ -24,7 +24,7 @@ setup(
         "wandb",
         "logzero",
         "typing",
-        "torch",
+        "torch>=1.7.0",
         "wasabi",
         "boto3",
         "tqdm",
@@ -48,5 +48,6 @@ setup(
         "tensorboardX",
         "Deprecated",
         "urllib3",
+        "h5py",
     ],
 )
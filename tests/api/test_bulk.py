@@ -0,0 +1,48 @@
+import pytest
+import json
+from sciwing.api.bulk import (
+    parse_bulk_body,
+    get_length_sorted_chunks,
+    stream_predictions,
+)
+
+
+class TestBulk:
+    @pytest.mark.parametrize(
+        "body, content_type",
+        [
+            (b'["first citation", "second / citation", "  "]', "application/json"),
+            (b"first citation\n\nsecond / citation\n", "text/plain"),
+        ],
+    )
+    def test_parse_bulk_body(self, body, content_type):
+        texts = parse_bulk_body(body=body, content_type=content_type)
+        assert texts == ["first citation", "second / citation"]
+
+    def test_parse_bulk_body_rejects_non_string_array(self):
+        with pytest.raises(ValueError):
+            parse_bulk_body(body=b'{"citation": 1}', content_type="application/json")
+
+    def test_length_sorted_chunks(self):
+        texts = ["a b c", "a", "a b c d", "a b"]
+        chunks = get_length_sorted_chunks(texts, chunk_size=2)
+        assert chunks == [[1, 3], [0, 2]]
+
+    def test_stream_predictions(self):
+        texts = ["a b c", "a", "a b c d", "a b"]
+        batches = []
+
+        def predict_batch(chunk_texts):
+            batches.append(chunk_texts)
+            return [len(text.split()) for text in chunk_texts]
+
+        lines = list(
+            stream_predictions(texts=texts, predict_batch=predict_batch, chunk_size=2)
+        )
+        results = [json.loads(line) for line in lines]
+        assert all(line.endswith("\n") for line in lines)
+        assert len(batches) == 2
+        assert sorted(result["index"] for result in results) == [0, 1, 2, 3]
+        for result in results:
+            assert result["text"] == texts[result["index"]]
+            assert result["tags"] == len(result["text"].split())
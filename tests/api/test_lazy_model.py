@@ -0,0 +1,41 @@
+import pytest
+import threading
+from collections import OrderedDict
+from sciwing.api.lazy_model import LazyModel
+
+
+@pytest.fixture
+def lazy_model():
+    return LazyModel(module_name="collections", class_name="OrderedDict")
+
+
+class TestLazyModel:
+    def test_not_loaded_before_use(self, lazy_model):
+        assert not lazy_model.is_loaded
+
+    def test_get_creates_model(self, lazy_model):
+        model = lazy_model.get()
+        assert isinstance(model, OrderedDict)
+        assert lazy_model.is_loaded
+
+    def test_get_returns_same_model(self, lazy_model):
+        lazy_model.warmup()
+        assert lazy_model.get() is lazy_model.get()
+
+    def test_model_created_once_across_threads(self, lazy_model):
+        models = []
+        threads = [
+            threading.Thread(target=lambda: models.append(lazy_model.get()))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert all(model is models[0] for model in models)
+
+    def test_warmup_records_load_error(self):
+        lazy_model = LazyModel(module_name="collections", class_name="NotAModel")
+        lazy_model.warmup()
+        assert not lazy_model.is_loaded
+        assert "AttributeError" in lazy_model.load_error
@@ -0,0 +1,73 @@
+import pytest
+import asyncio
+import threading
+from sciwing.api.micro_batcher import MicroBatcher
+
+
+class RecordingInfer:
+    def __init__(self):
+        self.batches = []
+
+    def __call__(self, items):
+        self.batches.append(list(items))
+        if "fail" in items:
+            raise ValueError("cannot infer")
+        return [item.upper() for item in items]
+
+
+def submit_all(batcher, items):
+    async def run():
+        results = await asyncio.gather(
+            *[batcher.submit(item) for item in items], return_exceptions=True
+        )
+        batcher.close()
+        return results
+
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(run())
+    finally:
+        loop.close()
+
+
+@pytest.fixture
+def infer():
+    return RecordingInfer()
+
+
+class TestMicroBatcher:
+    def test_results_in_order(self, infer):
+        batcher = MicroBatcher(infer_batch=infer, max_batch_size=8, max_wait_ms=50)
+        results = submit_all(batcher, ["a", "b", "c"])
+        assert results == ["A", "B", "C"]
+
+    def test_concurrent_requests_are_batched(self, infer):
+        batcher = MicroBatcher(infer_batch=infer, max_batch_size=8, max_wait_ms=50)
+        submit_all(batcher, ["a", "b", "c", "d"])
+        assert infer.batches == [["a", "b", "c", "d"]]
+
+    def test_max_batch_size(self, infer):
+        batcher = MicroBatcher(infer_batch=infer, max_batch_size=2, max_wait_ms=50)
+        results = submit_all(batcher, ["a", "b", "c", "d", "e"])
+        assert results == ["A", "B", "C", "D", "E"]
+        assert all(len(batch) <= 2 for batch in infer.batches)
+
+    def test_failure_fails_only_its_request(self, infer):
+        batcher = MicroBatcher(infer_batch=infer, max_batch_size=8, max_wait_ms=50)
+        results = submit_all(batcher, ["a", "fail", "c"])
+        assert results[0] == "A"
+        assert isinstance(results[1], ValueError)
+        assert results[2] == "C"
+
+    def test_run_batch_uses_the_batcher_thread(self):
+        threads = []
+
+        def infer_batch(items):
+            threads.append(threading.current_thread())
+            return [item.upper() for item in items]
+
+        batcher = MicroBatcher(infer_batch=infer_batch, max_batch_size=8)
+        assert batcher.run_batch(["a", "b"]) == ["A", "B"]
+        submit_all(batcher, ["c"])
+        assert threads[0] is threads[1]
+        assert threads[0] is not threading.current_thread()
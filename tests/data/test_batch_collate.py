@@ -0,0 +1,97 @@
+import pytest
+import torch
+from torch.utils.data import DataLoader
+from sciwing.data.batch_collate import (
+    Batch,
+    BatchInstances,
+    NumericalizingCollate,
+    get_batch_tensors,
+)
+from sciwing.datasets.seq_labeling.seq_labelling_dataset import (
+    SeqLabellingDatasetManager,
+)
+
+
+@pytest.fixture(scope="session")
+def seq_dataset_manager(tmpdir_factory):
+    train_file = tmpdir_factory.mktemp("train_data").join("train.txt")
+    train_file.write(
+        "word11_train###label1 word21_train###label2\n"
+        "word12_train###label1 word22_train###label2 word32_train###label3\n"
+        "word13_train###label3"
+    )
+    data_manager = SeqLabellingDatasetManager(
+        train_filename=str(train_file),
+        dev_filename=str(train_file),
+        test_filename=str(train_file),
+    )
+    return data_manager
+
+
+@pytest.fixture
+def collate(seq_dataset_manager):
+    return NumericalizingCollate(
+        namespace_to_numericalizer=seq_dataset_manager.namespace_to_numericalizer,
+        namespaces=["tokens", "seq_label"],
+        label_namespaces=seq_dataset_manager.label_namespaces,
+    )
+
+
+class TestBatchCollate:
+    def test_collate_makes_batch(self, seq_dataset_manager, collate):
+        dataset = seq_dataset_manager.train_dataset
+        batch = collate([dataset[idx] for idx in range(len(dataset))])
+
+        assert isinstance(batch, Batch)
+        assert isinstance(batch.lines, BatchInstances)
+        assert len(batch.lines) == len(batch.labels) == 3
+        assert set(batch.lines.namespace_to_tensors.keys()) == {"tokens"}
+        assert set(batch.labels.namespace_to_tensors.keys()) == {"seq_label"}
+
+        ids, mask = batch.labels.namespace_to_tensors["seq_label"]
+        assert ids.size() == mask.size() == (3, 3)
+
+    @pytest.mark.parametrize("namespace", ["tokens", "seq_label"])
+    def test_batch_tensors_same_as_numericalizer(
+        self, seq_dataset_manager, collate, namespace
+    ):
+        dataset = seq_dataset_manager.train_dataset
+        examples = [dataset[idx] for idx in range(len(dataset))]
+        batch = collate(examples)
+        instances = batch.labels if namespace == "seq_label" else batch.lines
+        numericalizer = seq_dataset_manager.namespace_to_numericalizer[namespace]
+
+        ids, mask = get_batch_tensors(
+            instances=instances, namespace=namespace, numericalizer=numericalizer
+        )
+        expected_ids, expected_mask = get_batch_tensors(
+            instances=list(instances), namespace=namespace, numericalizer=numericalizer
+        )
+        assert torch.equal(ids, expected_ids)
+        assert torch.equal(mask, expected_mask)
+
+    def test_different_max_length_is_numericalized_again(
+        self, seq_dataset_manager, collate
+    ):
+        dataset = seq_dataset_manager.train_dataset
+        batch = collate([dataset[idx] for idx in range(len(dataset))])
+        ids, mask = get_batch_tensors(
+            instances=batch.lines,
+            namespace="tokens",
+            numericalizer=seq_dataset_manager.namespace_to_numericalizer["tokens"],
+            max_length=5,
+        )
+        assert ids.size() == mask.size() == (3, 5)
+
+    def test_collate_in_workers(self, seq_dataset_manager, collate):
+        loader = DataLoader(
+            dataset=seq_dataset_manager.train_dataset,
+            batch_size=2,
+            num_workers=2,
+            collate_fn=collate,
+        )
+        batches = list(loader)
+        assert [len(batch) for batch in batches] == [2, 1]
+        for batch in batches:
+            assert "tokens" in batch.lines.namespace_to_tensors
+            assert "seq_label" in batch.labels.namespace_to_tensors
@@ -0,0 +1,50 @@
+import pytest
+from sciwing.data.bucket_batch_sampler import BucketBatchSampler
+import numpy as np
+
+
+@pytest.fixture
+def lengths():
+    np.random.seed(1729)
+    return np.random.randint(1, 100, size=200).tolist()
+
+
+class TestBucketBatchSampler:
+    @pytest.mark.parametrize("batch_size", [1, 3, 32])
+    def test_samples_every_index_once(self, lengths, batch_size):
+        sampler = BucketBatchSampler(lengths=lengths, batch_size=batch_size)
+        indices = [idx for batch in sampler for idx in batch]
+        assert sorted(indices) == list(range(len(lengths)))
+
+    def test_samples_only_given_indices(self, lengths):
+        indices = list(range(0, len(lengths), 2))
+        sampler = BucketBatchSampler(lengths=lengths, batch_size=8, indices=indices)
+        sampled = [idx for batch in sampler for idx in batch]
+        assert sorted(sampled) == indices
+
+    @pytest.mark.parametrize("drop_last", [True, False])
+    def test_len(self, lengths, drop_last):
+        sampler = BucketBatchSampler(
+            lengths=lengths, batch_size=7, bucket_size_multiplier=3, drop_last=drop_last
+        )
+        assert len(list(sampler)) == len(sampler)
+
+    def test_reduces_padding(self, lengths):
+        sampler = BucketBatchSampler(lengths=lengths, batch_size=16)
+        list(sampler)
+        padding_stats = sampler.get_padding_stats()
+        assert padding_stats["num_tokens"] == sum(lengths)
+        assert padding_stats["padded_tokens"] < padding_stats["unsorted_padded_tokens"]
+        assert padding_stats["padding_removed"] > 0
+
+    def test_shuffles_across_epochs(self, lengths):
+        sampler = BucketBatchSampler(lengths=lengths, batch_size=4)
+        first_epoch = list(sampler)
+        second_epoch = list(sampler)
+        assert first_epoch != second_epoch
+
+    def test_no_shuffle_is_deterministic(self, lengths):
+        sampler = BucketBatchSampler(lengths=lengths, batch_size=4, shuffle=False)
+        first_epoch = list(sampler)
+        second_epoch = list(sampler)
+        assert first_epoch == second_epoch
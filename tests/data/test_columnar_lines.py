@@ -0,0 +1,84 @@
+import pytest
+from sciwing.data.columnar_lines import (
+    ColumnarLines,
+    ColumnarLabels,
+    ColumnarSeqLabels,
+)
+from sciwing.data.line import Line
+from sciwing.tokenizers.word_tokenizer import WordTokenizer
+from sciwing.tokenizers.character_tokenizer import CharacterTokenizer
+
+
+@pytest.fixture
+def texts():
+    return ["This is a line", "This is another line", "Third"]
+
+
+@pytest.fixture
+def tokenizers():
+    return {"tokens": WordTokenizer(tokenizer="vanilla"), "chars": CharacterTokenizer()}
+
+
+@pytest.fixture
+def columnar_lines(texts, tokenizers):
+    lines = ColumnarLines(tokenizers=tokenizers)
+    for text in texts:
+        lines.append(text)
+    return lines
+
+
+class TestColumnarLines:
+    def test_len(self, columnar_lines, texts):
+        assert len(columnar_lines) == len(texts)
+
+    def test_lines_same_as_line(self, columnar_lines, texts, tokenizers):
+        for columnar_line, text in zip(columnar_lines, texts):
+            line = Line(text=text, tokenizers=tokenizers)
+            assert columnar_line.text == text
+            assert columnar_line.namespaces == line.namespaces
+            for namespace in line.namespaces:
+                expected = [tok.text for tok in line.tokens[namespace]]
+                tokens = [tok.text for tok in columnar_line.tokens[namespace]]
+                assert tokens == expected
+
+    def test_extend_same_as_append(self, columnar_lines, texts, tokenizers):
+        lines = ColumnarLines(tokenizers=tokenizers)
+        lines.extend(texts, batch_size=2)
+        assert lines.texts == columnar_lines.texts
+        for namespace in lines.namespaces:
+            for idx in range(len(texts)):
+                assert lines.get_tokens(idx, namespace) == columnar_lines.get_tokens(
+                    idx, namespace
+                )
+
+    def test_tokens_stored_once(self, columnar_lines):
+        assert columnar_lines.get_unique_tokens("tokens") == [
+            "This",
+            "is",
+            "a",
+            "line",
+            "another",
+            "Third",
+        ]
+
+    def test_get_lengths(self, columnar_lines):
+        assert columnar_lines.get_lengths("tokens").tolist() == [4, 4, 1]
+        assert columnar_lines.get_lengths("chars").tolist() == [14, 20, 5]
+
+    def test_index_out_of_range(self, columnar_lines):
+        with pytest.raises(IndexError):
+            columnar_lines[3]
+        assert columnar_lines[-1].text == "Third"
+
+    def test_labels(self):
+        labels = ColumnarLabels()
+        for text in ["label1", "label2", "label1"]:
+            labels.append(text)
+        assert [label.text for label in labels] == ["label1", "label2", "label1"]
+        assert labels[0].tokens["label"][0].text == "label1"
+
+    def test_seq_labels(self):
+        seq_labels = ColumnarSeqLabels(namespaces=["seq_label"])
+        seq_labels.append({"seq_label": ["B", "I", "O"]})
+        seq_label = seq_labels[0]
+        assert [tok.text for tok in seq_label.tokens["seq_label"]] == ["B", "I", "O"]
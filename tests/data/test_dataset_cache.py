@@ -0,0 +1,141 @@
+import pytest
+from sciwing.data.dataset_cache import DatasetCache
+from sciwing.data.columnar_lines import ColumnarLines
+from sciwing.datasets.classification.text_classification_dataset import (
+    TextClassificationDatasetManager,
+)
+from sciwing.datasets.seq_labeling.conll_dataset import CoNLLDataset
+from sciwing.tokenizers.word_tokenizer import WordTokenizer
+from sciwing.tokenizers.character_tokenizer import CharacterTokenizer
+
+
+@pytest.fixture
+def clf_files(tmpdir):
+    filenames = {}
+    for split in ["train", "dev", "test"]:
+        p = tmpdir.join(f"{split}.txt")
+        p.write(f"{split} line one###label1\n{split} line two###label2")
+        filenames[split] = str(p)
+    return filenames
+
+
+@pytest.fixture
+def conll_file(tmpdir):
+    p = tmpdir.join("conll.txt")
+    p.write(
+        "word1 O-Task O-Process O-Material\nword2 B-Task B-Process O-Material\n\n"
+        "word3 O-Task O-Process O-Material\n\n"
+    )
+    return str(p)
+
+
+def make_clf_dataset_manager(clf_files, cache_dir):
+    return TextClassificationDatasetManager(
+        train_filename=clf_files["train"],
+        dev_filename=clf_files["dev"],
+        test_filename=clf_files["test"],
+        tokenizers={
+            "tokens": WordTokenizer(tokenizer="vanilla"),
+            "char_tokens": CharacterTokenizer(),
+        },
+        cache_dir=cache_dir,
+    )
+
+
+class TestDatasetCache:
+    def test_cached_datasets_are_columnar(self, clf_files, tmpdir):
+        dataset_manager = make_clf_dataset_manager(clf_files, str(tmpdir.join("cache")))
+        assert isinstance(dataset_manager.train_dataset.lines, ColumnarLines)
+
+    def test_cache_hit_returns_same_lines_labels(self, clf_files, tmpdir):
+        cache_dir = str(tmpdir.join("cache"))
+        first = make_clf_dataset_manager(clf_files, cache_dir)
+        second = make_clf_dataset_manager(clf_files, cache_dir)
+
+        assert first.train_dataset.cache_key == second.train_dataset.cache_key
+        for split in ["train_dataset", "dev_dataset", "test_dataset"]:
+            first_dataset = getattr(first, split)
+            second_dataset = getattr(second, split)
+            assert len(first_dataset) == len(second_dataset)
+            for idx in range(len(first_dataset)):
+                first_line, first_label = first_dataset[idx]
+                second_line, second_label = second_dataset[idx]
+                assert first_line.text == second_line.text
+                for namespace in first_line.namespaces:
+                    first_tokens = [tok.text for tok in first_line.tokens[namespace]]
+                    second_tokens = [tok.text for tok in second_line.tokens[namespace]]
+                    assert first_tokens == second_tokens
+                assert first_label.text == second_label.text
+
+    def test_cache_hit_returns_same_vocab(self, clf_files, tmpdir):
+        cache_dir = str(tmpdir.join("cache"))
+        first = make_clf_dataset_manager(clf_files, cache_dir)
+        second = make_clf_dataset_manager(clf_files, cache_dir)
+
+        assert first.namespaces == second.namespaces
+        assert first.label_namespaces == second.label_namespaces
+        assert first.num_labels == second.num_labels
+        for namespace in first.namespaces:
+            first_vocab = first.namespace_to_vocab[namespace]
+            second_vocab = second.namespace_to_vocab[namespace]
+            assert first_vocab.token2idx == second_vocab.token2idx
+            assert (
+                first_vocab.include_special_vocab == second_vocab.include_special_vocab
+            )
+
+    def test_changed_file_changes_key(self, clf_files, tmpdir):
+        cache_dir = str(tmpdir.join("cache"))
+        first = make_clf_dataset_manager(clf_files, cache_dir)
+
+        with open(clf_files["train"], "a") as fp:
+            fp.write("\ntrain line three###label3")
+
+        second = make_clf_dataset_manager(clf_files, cache_dir)
+        assert first.train_dataset.cache_key != second.train_dataset.cache_key
+        assert len(second.train_dataset) == 3
+        assert second.num_labels["label"] == 3
+
+    def test_changed_tokenizer_changes_key(self, clf_files):
+        cache = DatasetCache(cache_dir="unused")
+        vanilla_key = cache.get_dataset_key(
+            dataset_class="TextClassificationDataset",
+            filename=clf_files["train"],
+            tokenizers={"tokens": WordTokenizer(tokenizer="vanilla")},
+        )
+        char_key = cache.get_dataset_key(
+            dataset_class="TextClassificationDataset",
+            filename=clf_files["train"],
+            tokenizers={"tokens": CharacterTokenizer()},
+        )
+        assert vanilla_key != char_key
+
+    @pytest.mark.parametrize("train_only", [None, "ner"])
+    def test_conll_cache_hit(self, conll_file, tmpdir, train_only):
+        cache_dir = str(tmpdir.join("cache"))
+        tokenizers = {"tokens": WordTokenizer(tokenizer="vanilla")}
+        expected = CoNLLDataset(
+            filename=conll_file, tokenizers=tokenizers, train_only=train_only
+        )
+        _ = CoNLLDataset(
+            filename=conll_file,
+            tokenizers=tokenizers,
+            train_only=train_only,
+            cache_dir=cache_dir,
+        )
+        cached = CoNLLDataset(
+            filename=conll_file,
+            tokenizers=tokenizers,
+            train_only=train_only,
+            cache_dir=cache_dir,
+        )
+
+        assert len(expected) == len(cached) == 2
+        for idx in range(len(expected)):
+            expected_line, expected_label = expected[idx]
+            cached_line, cached_label = cached[idx]
+            assert expected_line.text == cached_line.text
+            assert set(expected_label.tokens.keys()) == set(cached_label.tokens.keys())
+            for namespace in expected_label.tokens.keys():
+                expected_tags = [tok.text for tok in expected_label.tokens[namespace]]
+                cached_tags = [tok.text for tok in cached_label.tokens[namespace]]
+                assert expected_tags == cached_tags
@@ -3,6 +3,21 @@ from sciwing.datasets.classification.text_classification_dataset import (
     TextClassificationDatasetManager,
 )
 from sciwing.utils.class_nursery import ClassNursery
+from sciwing.data.datasets_manager import DatasetsManager, get_shard_ranges
+from sciwing.numericalizers.numericalizer import Numericalizer
+from sciwing.vocab.vocab import Vocab
+
+
+class CasedNumericalizer(Numericalizer):
+    def __init__(self, vocabulary: Vocab = None, lowercase: bool = False):
+        super().__init__(vocabulary)
+        self.lowercase = lowercase
+
+
+class VocabHoldingNumericalizer(Numericalizer):
+    def __init__(self, vocabulary: Vocab = None, other_vocab: Vocab = None):
+        super().__init__(vocabulary)
+        self.other_vocab = other_vocab
 
 
 @pytest.fixture(scope="session")
@@ -62,3 +77,94 @@ class TestDatasetManager:
         assert (
             ClassNursery.class_nursery["TextClassificationDatasetManager"] is not None
         )
+
+    def test_load_for_inference(self, clf_dataset_manager, tmpdir):
+        clf_dataset_manager.save_for_inference(str(tmpdir))
+        loaded = clf_dataset_manager.load_for_inference(str(tmpdir))
+
+        assert loaded.train_dataset is None
+        assert loaded.namespaces == clf_dataset_manager.namespaces
+        assert loaded.label_namespaces == clf_dataset_manager.label_namespaces
+        assert loaded.num_labels == clf_dataset_manager.num_labels
+        for namespace in clf_dataset_manager.namespaces:
+            vocab = clf_dataset_manager.namespace_to_vocab[namespace]
+            loaded_vocab = loaded.namespace_to_vocab[namespace]
+            assert vocab.token2idx == loaded_vocab.token2idx
+            assert (
+                loaded.namespace_to_numericalizer[namespace].vocabulary is loaded_vocab
+            )
+
+    def test_load_for_inference_restores_numericalizers(
+        self, clf_dataset_manager, tmpdir
+    ):
+        tokens_numericalizer = CasedNumericalizer(
+            vocabulary=clf_dataset_manager.namespace_to_vocab["tokens"], lowercase=True
+        )
+        clf_dataset_manager.namespace_to_numericalizer["tokens"] = tokens_numericalizer
+        try:
+            clf_dataset_manager.save_for_inference(str(tmpdir))
+        finally:
+            clf_dataset_manager.namespace_to_numericalizer["tokens"] = Numericalizer(
+                vocabulary=clf_dataset_manager.namespace_to_vocab["tokens"]
+            )
+        loaded = clf_dataset_manager.load_for_inference(str(tmpdir))
+        numericalizer = loaded.namespace_to_numericalizer["tokens"]
+        assert isinstance(numericalizer, CasedNumericalizer)
+        assert numericalizer.lowercase is True
+        assert numericalizer.vocabulary is loaded.namespace_to_vocab["tokens"]
+
+    def test_unserializable_argument_raises(self, clf_dataset_manager):
+        numericalizer = VocabHoldingNumericalizer(
+            other_vocab=clf_dataset_manager.namespace_to_vocab["tokens"]
+        )
+        with pytest.raises(ValueError):
+            DatasetsManager._get_object_config(numericalizer, exclude=("vocabulary",))
+
+    def test_make_line_after_load_for_inference(self, clf_dataset_manager, tmpdir):
+        clf_dataset_manager.save_for_inference(str(tmpdir))
+        loaded = clf_dataset_manager.load_for_inference(str(tmpdir))
+        line = loaded.make_line("train_line1")
+        expected = clf_dataset_manager.make_line("train_line1")
+        for namespace in expected.namespaces:
+            tokens = [token.text for token in line.tokens[namespace]]
+            expected_tokens = [token.text for token in expected.tokens[namespace]]
+            assert tokens == expected_tokens
+
+    @pytest.mark.parametrize("columnar", [False, True])
+    def test_vocab_counted_in_workers(self, tmpdir, columnar):
+        train_file = tmpdir.join("train_file.txt")
+        train_file.write(
+            "\n".join(
+                f"line{idx} word{idx % 3} common###label{idx % 4}" for idx in range(20)
+            )
+        )
+        managers = [
+            TextClassificationDatasetManager(
+                train_filename=str(train_file),
+                dev_filename=str(train_file),
+                test_filename=str(train_file),
+                columnar=columnar,
+                num_vocab_workers=num_vocab_workers,
+            )
+            for num_vocab_workers in [0, 2]
+        ]
+        sequential, parallel = managers
+        assert parallel.namespaces == sequential.namespaces
+        for namespace in sequential.namespaces:
+            vocab = sequential.namespace_to_vocab[namespace]
+            parallel_vocab = parallel.namespace_to_vocab[namespace]
+            assert parallel_vocab.vocab == vocab.vocab
+            assert parallel_vocab.idx2token == vocab.idx2token
+
+    @pytest.mark.parametrize(
+        "num_instances, num_shards", [(20, 8), (3, 8), (0, 2), (7, 1)]
+    )
+    def test_shard_ranges_cover_instances(self, num_instances, num_shards):
+        starts, ends = get_shard_ranges(num_instances, num_shards)
+        assert len(starts) <= num_shards
+        covered = [
+            idx
+            for start, end in zip(starts, ends)
+            for idx in range(start, min(end, num_instances))
+        ]
+        assert covered == list(range(num_instances))
@@ -1,5 +1,5 @@
 import pytest
-from sciwing.data.line import Line
+from sciwing.data.line import Line, make_lines
 from sciwing.tokenizers.word_tokenizer import WordTokenizer
 from sciwing.tokenizers.character_tokenizer import CharacterTokenizer
 
@@ -37,3 +37,21 @@ class TestLine:
         text = "Single line"
         line = Line(text=text, tokenizers={"tokens": WordTokenizer()})
         assert line.namespaces == ["tokens"]
+
+    @pytest.mark.parametrize("tokenizer", ["spacy", "vanilla", "spacy-whitespace"])
+    def test_make_lines_same_as_line(self, tokenizer):
+        texts = ["This is a line.", "Another line, with a comma", "Third"]
+        tokenizers = {
+            "tokens": WordTokenizer(tokenizer=tokenizer, batch_size=2),
+            "chars": CharacterTokenizer(),
+        }
+        lines = make_lines(texts, tokenizers=tokenizers)
+        assert len(lines) == len(texts)
+        for line, text in zip(lines, texts):
+            expected = Line(text=text, tokenizers=tokenizers)
+            assert line.text == text
+            assert line.namespaces == expected.namespaces
+            for namespace in expected.namespaces:
+                tokens = [tok.text for tok in line.tokens[namespace]]
+                expected_tokens = [tok.text for tok in expected.tokens[namespace]]
+                assert tokens == expected_tokens
@@ -0,0 +1,182 @@
+import pytest
+import random
+from torch.utils.data import DataLoader
+from sciwing.data.streaming_dataset import shuffle_buffer
+from sciwing.datasets.classification.text_classification_dataset import (
+    TextClassificationDataset,
+    TextClassificationDatasetManager,
+    StreamingTextClassificationDataset,
+)
+from sciwing.datasets.seq_labeling.seq_labelling_dataset import (
+    SeqLabellingDataset,
+    StreamingSeqLabellingDataset,
+)
+from sciwing.datasets.seq_labeling.conll_dataset import (
+    CoNLLDataset,
+    StreamingCoNLLDataset,
+)
+from sciwing.tokenizers.word_tokenizer import WordTokenizer
+
+
+@pytest.fixture
+def clf_file(tmpdir):
+    train_file = tmpdir.join("train_file.txt")
+    train_file.write(
+        "\n".join(f"line{idx} word{idx % 3}###label{idx % 4}" for idx in range(17))
+    )
+    return str(train_file)
+
+
+@pytest.fixture
+def seq_file(tmpdir):
+    train_file = tmpdir.join("seq_file.txt")
+    train_file.write(
+        "word1###label1 word2###label2\n\nword3###label3\nword4###label1 word5###label2"
+    )
+    return str(train_file)
+
+
+@pytest.fixture
+def conll_file(tmpdir):
+    train_file = tmpdir.join("conll_file.txt")
+    train_file.write(
+        "-DOCSTART- -X- -X- O\n\n"
+        "EU NNP B-NP B-ORG\nrejects VBZ B-VP O\n\n"
+        "Peter NNP B-NP B-PER\nBlackburn NNP I-NP I-PER\n\n"
+    )
+    return str(train_file)
+
+
+class TestStreamingDataset:
+    def test_shuffle_buffer_keeps_all_items(self):
+        items = list(range(100))
+        shuffled = list(shuffle_buffer(iter(items), 10, rng=random.Random(1)))
+        assert sorted(shuffled) == items
+        assert shuffled != items
+
+    def test_text_classification_same_as_dataset(self, clf_file):
+        tokenizers = {"tokens": WordTokenizer(tokenizer="vanilla")}
+        dataset = TextClassificationDataset(filename=clf_file, tokenizers=tokenizers)
+        streaming = StreamingTextClassificationDataset(
+            filename=clf_file, tokenizers=tokenizers
+        )
+        assert len(streaming) == len(dataset)
+        lines_labels = list(streaming)
+        for idx, (line, label) in enumerate(lines_labels):
+            assert line.text == dataset.lines[idx].text
+            assert label.text == dataset.labels[idx].text
+
+    def test_seq_labelling_same_as_dataset(self, seq_file):
+        tokenizers = {"tokens": WordTokenizer(tokenizer="vanilla")}
+        dataset = SeqLabellingDataset(filename=seq_file, tokenizers=tokenizers)
+        streaming = StreamingSeqLabellingDataset(
+            filename=seq_file, tokenizers=tokenizers
+        )
+        lines_labels = list(streaming)
+        assert len(lines_labels) == len(dataset) == 3
+        for idx, (line, label) in enumerate(lines_labels):
+            assert line.text == dataset.lines[idx].text
+            assert label.labels == dataset.labels[idx].labels
+
+    @pytest.mark.parametrize("train_only", [None, "ner"])
+    def test_conll_same_as_dataset(self, conll_file, train_only):
+        tokenizers = {"tokens": WordTokenizer(tokenizer="vanilla")}
+        dataset = CoNLLDataset(
+            filename=conll_file, tokenizers=tokenizers, train_only=train_only
+        )
+        streaming = StreamingCoNLLDataset(
+            filename=conll_file, tokenizers=tokenizers, train_only=train_only
+        )
+        lines_labels = list(streaming)
+        assert len(lines_labels) == len(dataset)
+        for idx, (line, label) in enumerate(lines_labels):
+            assert line.text == dataset.lines[idx].text
+            assert label.labels == dataset.labels[idx].labels
+
+    def test_shuffled_examples(self, clf_file):
+        streaming = StreamingTextClassificationDataset(
+            filename=clf_file,
+            tokenizers={"tokens": WordTokenizer(tokenizer="vanilla")},
+            shuffle_buffer_size=5,
+        )
+        texts = [line.text for line, _ in streaming]
+        expected = [line.text for line, _ in streaming.iter_lines_labels()]
+        assert sorted(texts) == sorted(expected)
+
+    def test_sharded_across_workers(self, clf_file):
+        streaming = StreamingTextClassificationDataset(
+            filename=clf_file,
+            tokenizers={"tokens": WordTokenizer(tokenizer="vanilla")},
+            shuffle_buffer_size=4,
+        )
+        loader = DataLoader(
+            dataset=streaming, batch_size=3, num_workers=2, collate_fn=list
+        )
+        texts = [line.text for batch in loader for line, _ in batch]
+        expected = [line.text for line, _ in streaming.iter_lines_labels()]
+        assert sorted(texts) == sorted(expected)
+
+    def test_streaming_vocab_same_as_dataset(self, clf_file):
+        managers = [
+            TextClassificationDatasetManager(
+                train_filename=clf_file,
+                dev_filename=clf_file,
+                test_filename=clf_file,
+                streaming=streaming,
+            )
+            for streaming in [False, True]
+        ]
+        manager, streaming_manager = managers
+        assert streaming_manager.label_namespaces == manager.label_namespaces
+        assert streaming_manager.num_labels == manager.num_labels
+        for namespace in manager.namespaces:
+            vocab = manager.namespace_to_vocab[namespace]
+            streaming_vocab = streaming_manager.namespace_to_vocab[namespace]
+            assert streaming_vocab.vocab == vocab.vocab
+
+    def test_streaming_vocab_counted_in_workers(self, clf_file):
+        managers = [
+            TextClassificationDatasetManager(
+                train_filename=clf_file,
+                dev_filename=clf_file,
+                test_filename=clf_file,
+                tokenizers={"tokens": WordTokenizer(tokenizer="vanilla")},
+                streaming=True,
+                num_vocab_workers=num_vocab_workers,
+            )
+            for num_vocab_workers in [0, 2]
+        ]
+        sequential, parallel = managers
+        assert parallel.label_namespaces == sequential.label_namespaces
+        for namespace in sequential.namespaces:
+            vocab = sequential.namespace_to_vocab[namespace]
+            parallel_vocab = parallel.namespace_to_vocab[namespace]
+            assert parallel_vocab.vocab == vocab.vocab
+            assert parallel_vocab.idx2token == vocab.idx2token
+
+    def test_range_lines_labels(self, clf_file):
+        streaming = StreamingTextClassificationDataset(
+            filename=clf_file, tokenizers={"tokens": WordTokenizer(tokenizer="vanilla")}
+        )
+        expected = [line.text for line, _ in streaming.iter_lines_labels()]
+        texts = [line.text for line, _ in streaming.iter_range_lines_labels(3, 7)]
+        assert texts == expected[3:7]
+
+    def test_lines_tokenized_in_batches(self, clf_file):
+        tokenizer = WordTokenizer(tokenizer="vanilla")
+        batch_sizes = []
+        tokenize_batch = tokenizer.tokenize_batch
+
+        def recording_tokenize_batch(texts):
+            batch_sizes.append(len(texts))
+            return tokenize_batch(texts)
+
+        tokenizer.tokenize_batch = recording_tokenize_batch
+        streaming = StreamingTextClassificationDataset(
+            filename=clf_file, tokenizers={"tokens": tokenizer}, tokenize_batch_size=5
+        )
+        lines_labels = list(streaming.iter_lines_labels())
+        assert len(lines_labels) == 17
+        assert batch_sizes == [5, 5, 5, 2]
+        for line, _ in lines_labels:
+            assert [token.text for token in line.tokens["tokens"]] == line.text.split()
@@ -40,3 +40,22 @@ class TestTextClassificationDataset:
         line_tokens = list(map(lambda token: token.text, line_tokens))
 
         assert set(tokens) == set(line_tokens)
+
+    def test_columnar_same_as_lines(self, test_file):
+        tokenizers = {"tokens": WordTokenizer(tokenizer="vanilla")}
+        dataset = TextClassificationDataset(
+            filename=str(test_file), tokenizers=tokenizers
+        )
+        columnar_dataset = TextClassificationDataset(
+            filename=str(test_file), tokenizers=tokenizers, columnar=True
+        )
+        assert len(columnar_dataset) == len(dataset)
+
+        for idx in range(len(dataset)):
+            line, label = dataset[idx]
+            columnar_line, columnar_label = columnar_dataset[idx]
+            assert columnar_line.text == line.text
+            assert [tok.text for tok in columnar_line.tokens["tokens"]] == [
+                tok.text for tok in line.tokens["tokens"]
+            ]
+            assert columnar_label.text == label.text
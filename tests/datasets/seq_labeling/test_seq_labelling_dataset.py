@@ -38,3 +38,22 @@ class TestSeqLabellingDataset:
             label_tokens = label.tokens["seq_label"]
             print(f"label tokens {label.tokens}")
             assert len(word_tokens) == len(label_tokens)
+
+    def test_columnar_same_as_lines(self, test_file):
+        tokenizers = {"tokens": WordTokenizer(tokenizer="vanilla")}
+        dataset = SeqLabellingDataset(filename=str(test_file), tokenizers=tokenizers)
+        columnar_dataset = SeqLabellingDataset(
+            filename=str(test_file), tokenizers=tokenizers, columnar=True
+        )
+        assert len(columnar_dataset) == len(dataset)
+
+        for idx in range(len(dataset)):
+            line, label = dataset[idx]
+            columnar_line, columnar_label = columnar_dataset[idx]
+            assert columnar_line.text == line.text
+            assert [tok.text for tok in columnar_line.tokens["tokens"]] == [
+                tok.text for tok in line.tokens["tokens"]
+            ]
+            assert [tok.text for tok in columnar_label.tokens["seq_label"]] == [
+                tok.text for tok in label.tokens["seq_label"]
+            ]
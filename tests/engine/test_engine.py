@@ -8,6 +8,12 @@ from sciwing.datasets.classification.text_classification_dataset import (
 from sciwing.data.line import Line
 from sciwing.data.label import Label
 from sciwing.metrics.precision_recall_fmeasure import PrecisionRecallFMeasure
+from sciwing.metrics.token_cls_accuracy import TokenClassificationAccuracy
+from sciwing.modules.lstm2seqencoder import Lstm2SeqEncoder
+from sciwing.models.rnn_seq_crf_tagger import RnnSeqCrfTagger
+from sciwing.datasets.seq_labeling.seq_labelling_dataset import (
+    SeqLabellingDatasetManager,
+)
 import torch
 import os
 from sciwing.utils.class_nursery import ClassNursery
@@ -86,6 +92,54 @@ def setup_engine_test_with_simple_classifier(
     return engine
 
 
+@pytest.fixture(scope="session")
+def seq_datasets_manager(tmpdir_factory):
+    train_file = tmpdir_factory.mktemp("seq_train_data").join("train.txt")
+    train_file.write(
+        "word11_train###label1 word21_train###label2\nword12_train###label1 word22_train###label2 word32_train###label3"
+    )
+
+    dev_file = tmpdir_factory.mktemp("seq_dev_data").join("dev.txt")
+    dev_file.write("word11_dev###label1 word21_dev###label2")
+
+    test_file = tmpdir_factory.mktemp("seq_test_data").join("test.txt")
+    test_file.write("word11_test###label1 word21_test###label2")
+
+    return SeqLabellingDatasetManager(
+        train_filename=str(train_file),
+        dev_filename=str(dev_file),
+        test_filename=str(test_file),
+    )
+
+
+@pytest.fixture
+def setup_engine_without_train_metrics(seq_datasets_manager, tmpdir_factory):
+    datasets_manager = seq_datasets_manager
+    word_embedder = WordEmbedder(embedding_type="glove_6B_50")
+    encoder = Lstm2SeqEncoder(embedder=word_embedder, hidden_dim=10)
+    tagger = RnnSeqCrfTagger(
+        rnn2seqencoder=encoder, encoding_dim=10, datasets_manager=datasets_manager
+    )
+
+    engine = Engine(
+        model=tagger,
+        datasets_manager=datasets_manager,
+        optimizer=torch.optim.Adam(params=tagger.parameters()),
+        batch_size=2,
+        save_dir=tmpdir_factory.mktemp("experiment_no_train_metrics"),
+        num_epochs=1,
+        save_every=1,
+        log_train_metrics_every=1,
+        train_metric=TokenClassificationAccuracy(datasets_manager=datasets_manager),
+        validation_metric=TokenClassificationAccuracy(
+            datasets_manager=datasets_manager
+        ),
+        test_metric=TokenClassificationAccuracy(datasets_manager=datasets_manager),
+        calc_train_metrics=False,
+    )
+    return engine
+
+
 class TestEngine:
     def test_train_loader(self, setup_engine_test_with_simple_classifier):
         engine = setup_engine_test_with_simple_classifier
@@ -133,5 +187,51 @@ class TestEngine:
         except:
             pytest.fail("Engine train epoch end failed")
 
+    def test_labels_without_special_tokens_are_not_collated(
+        self, clf_datasets_manager, tmpdir
+    ):
+        word_embedder = WordEmbedder(embedding_type="glove_6B_50")
+        classifier = SimpleClassifier(
+            encoder=BOW_Encoder(embedder=word_embedder),
+            encoding_dim=word_embedder.get_embedding_dimension(),
+            num_classes=2,
+            datasets_manager=clf_datasets_manager,
+        )
+        with pytest.raises(ValueError):
+            Engine(
+                model=classifier,
+                datasets_manager=clf_datasets_manager,
+                optimizer=torch.optim.Adam(params=classifier.parameters()),
+                batch_size=1,
+                save_dir=str(tmpdir.join("experiment")),
+                num_epochs=1,
+                save_every=1,
+                log_train_metrics_every=10,
+                train_metric=PrecisionRecallFMeasure(
+                    datasets_manager=clf_datasets_manager
+                ),
+                validation_metric=PrecisionRecallFMeasure(
+                    datasets_manager=clf_datasets_manager
+                ),
+                test_metric=PrecisionRecallFMeasure(
+                    datasets_manager=clf_datasets_manager
+                ),
+                collate_namespaces=["label"],
+            )
+
     def test_engine_in_class_nursery(self):
         assert ClassNursery.class_nursery["Engine"] is not None
+
+    def test_train_epoch_without_decoding(self, setup_engine_without_train_metrics):
+        engine = setup_engine_without_train_metrics
+        assert engine.model.decode_during_training is False
+        engine.train_epoch(0)
+
+    def test_metric_skips_namespaces_without_predictions(
+        self, setup_engine_without_train_metrics
+    ):
+        engine = setup_engine_without_train_metrics
+        lines, labels = engine.datasets_manager.train_dataset.get_lines_labels()
+        engine.train_metric_calc.calc_metric(
+            lines=lines, labels=labels, model_forward_dict={}
+        )
@@ -0,0 +1,63 @@
+import pytest
+import torch
+from sciwing.metrics.confusion_matrix import ConfusionMatrix
+from sklearn.metrics import confusion_matrix
+
+
+class TestConfusionMatrix:
+    def test_matrix_same_as_sklearn(self):
+        true_indices = torch.randint(0, 5, size=(4, 10))
+        predicted_indices = torch.randint(0, 5, size=(4, 10))
+        matrix = ConfusionMatrix(num_classes=5)
+        matrix.update(true_indices=true_indices, predicted_indices=predicted_indices)
+
+        expected = confusion_matrix(
+            true_indices.view(-1).numpy(),
+            predicted_indices.view(-1).numpy(),
+            labels=list(range(5)),
+        )
+        assert matrix.matrix.tolist() == expected.tolist()
+
+    def test_accumulates_over_batches(self):
+        matrix = ConfusionMatrix(num_classes=3)
+        matrix.update(
+            true_indices=torch.LongTensor([0, 1]),
+            predicted_indices=torch.LongTensor([0, 2]),
+        )
+        matrix.update(
+            true_indices=torch.LongTensor([1, 1]),
+            predicted_indices=torch.LongTensor([1, 2]),
+        )
+        tp_counter, fp_counter, fn_counter = matrix.get_counters()
+        assert tp_counter == {0: 1, 1: 1, 2: 0}
+        assert fp_counter == {0: 0, 1: 0, 2: 2}
+        assert fn_counter == {0: 0, 1: 2, 2: 0}
+
+    def test_masked_pairs_are_ignored(self):
+        matrix = ConfusionMatrix(num_classes=4)
+        matrix.update(
+            true_indices=torch.LongTensor([[2, 3, 1]]),
+            predicted_indices=torch.LongTensor([[2, 0, 1]]),
+            mask=torch.BoolTensor([[False, False, True]]),
+        )
+        assert matrix.get_classes() == [0, 2, 3]
+        assert matrix.matrix.sum().item() == 2
+
+    def test_grows_for_larger_classes(self):
+        matrix = ConfusionMatrix(num_classes=2)
+        matrix.update(
+            true_indices=torch.LongTensor([0, 4]),
+            predicted_indices=torch.LongTensor([0, 4]),
+        )
+        assert matrix.num_classes == 5
+        tp_counter, _, _ = matrix.get_counters()
+        assert tp_counter == {0: 1, 4: 1}
+
+    def test_reset(self):
+        matrix = ConfusionMatrix(num_classes=2)
+        matrix.update(
+            true_indices=torch.LongTensor([0, 1]),
+            predicted_indices=torch.LongTensor([1, 1]),
+        )
+        matrix.reset()
+        assert matrix.get_classes() == []
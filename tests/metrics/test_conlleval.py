@@ -0,0 +1,77 @@
+import pytest
+from sciwing.metrics.conlleval import ConllEvalCounts, split_tag
+
+
+class TestConllEval:
+    @pytest.mark.parametrize(
+        "tag, expected",
+        [
+            ("B-PER", ("B", "PER")),
+            ("O", ("O", "")),
+            ("I-LOC", ("I", "LOC")),
+            ("B-container-title", ("B", "container-title")),
+        ],
+    )
+    def test_split_tag(self, tag, expected):
+        assert split_tag(tag) == expected
+
+    def test_types_with_dashes_are_not_merged(self):
+        counts = ConllEvalCounts()
+        counts.update(
+            true_tags=["B-container-title", "I-container-title"],
+            predicted_tags=["B-container-name", "I-container-name"],
+        )
+        assert counts.correct_chunks == 0
+        type_metrics = counts.get_type_metrics()
+        assert set(type_metrics.keys()) == {"container-title", "container-name"}
+
+    def test_perfect_prediction(self):
+        counts = ConllEvalCounts()
+        tags = ["B-PER", "I-PER", "O", "B-LOC"]
+        counts.update(true_tags=tags, predicted_tags=tags)
+        metrics = counts.get_metrics()
+        assert counts.correct_chunks == counts.found_correct == 2
+        assert metrics["precision"] == metrics["recall"] == metrics["fscore"] == 1.0
+        assert metrics["accuracy"] == 1.0
+
+    def test_wrong_boundary_is_not_correct(self):
+        counts = ConllEvalCounts()
+        counts.update(
+            true_tags=["B-PER", "I-PER", "O"], predicted_tags=["B-PER", "O", "O"]
+        )
+        assert counts.found_correct == 1
+        assert counts.found_guessed == 1
+        assert counts.correct_chunks == 0
+        assert counts.correct_tags == 2
+
+    def test_wrong_type_is_not_correct(self):
+        counts = ConllEvalCounts()
+        counts.update(true_tags=["B-PER", "O"], predicted_tags=["B-LOC", "O"])
+        assert counts.correct_chunks == 0
+        type_metrics = counts.get_type_metrics()
+        assert set(type_metrics.keys()) == {"PER", "LOC"}
+
+    def test_i_after_o_starts_a_chunk(self):
+        counts = ConllEvalCounts()
+        counts.update(
+            true_tags=["O", "I-PER", "I-PER"], predicted_tags=["O", "I-PER", "I-PER"]
+        )
+        assert counts.found_correct == 1
+        assert counts.correct_chunks == 1
+
+    def test_counts_accumulate_over_sentences(self):
+        counts = ConllEvalCounts()
+        counts.update(true_tags=["B-PER"], predicted_tags=["B-PER"])
+        counts.update(true_tags=["B-PER", "B-LOC"], predicted_tags=["O", "B-LOC"])
+        metrics = counts.get_metrics()
+        assert metrics["precision"] == 1.0
+        assert metrics["recall"] == pytest.approx(2 / 3)
+        assert metrics["accuracy"] == pytest.approx(2 / 3)
+
+    def test_chunk_does_not_continue_into_next_sentence(self):
+        counts = ConllEvalCounts()
+        counts.update(true_tags=["O", "B-PER"], predicted_tags=["O", "B-PER"])
+        counts.update(true_tags=["I-PER"], predicted_tags=["B-PER"])
+        assert counts.correct_chunks == 2
+        assert counts.found_correct == 2
+        assert counts.found_guessed == 2
@@ -7,6 +7,8 @@ from sciwing.modules.embedders.concat_embedders import ConcatEmbedders
 from sciwing.datasets.seq_labeling.seq_labelling_dataset import (
     SeqLabellingDatasetManager,
 )
+from sciwing.data.seq_label import SeqLabel
+import torch
 
 
 @pytest.fixture(scope="session")
@@ -117,3 +119,48 @@ class TestParscitTagger:
             is_test=False,
         )
         assert output_dict["logits_seq_label"].size() == (2, 3, 7)
+
+    def test_predicted_tags_lengths(self, setup_parscit_tagger, seq_dataset_manager):
+        tagger, dataset_manager, options = setup_parscit_tagger
+        lines, labels = seq_dataset_manager.train_dataset.get_lines_labels()
+        output_dict = tagger(
+            lines=lines,
+            labels=labels,
+            is_training=False,
+            is_validation=True,
+            is_test=False,
+        )
+        predicted_tags = output_dict["predicted_tags_seq_label"]
+        assert [len(tags) for tags in predicted_tags] == [2, 3]
+
+    def test_empty_line_has_no_tags(self, setup_parscit_tagger, seq_dataset_manager):
+        tagger, dataset_manager, options = setup_parscit_tagger
+        lines, labels = seq_dataset_manager.train_dataset.get_lines_labels()
+        lines = [seq_dataset_manager.make_line(""), lines[0]]
+        labels = [SeqLabel(labels={"seq_label": []}), labels[0]]
+        output_dict = tagger(
+            lines=lines,
+            labels=labels,
+            is_training=False,
+            is_validation=True,
+            is_test=False,
+        )
+        predicted_tags = output_dict["predicted_tags_seq_label"]
+        assert [len(tags) for tags in predicted_tags] == [0, 2]
+        assert torch.isfinite(output_dict["loss"])
+
+    def test_no_decoding_during_training(
+        self, setup_parscit_tagger, seq_dataset_manager
+    ):
+        tagger, dataset_manager, options = setup_parscit_tagger
+        tagger.decode_during_training = False
+        lines, labels = seq_dataset_manager.train_dataset.get_lines_labels()
+        output_dict = tagger(
+            lines=lines,
+            labels=labels,
+            is_training=True,
+            is_validation=False,
+            is_test=False,
+        )
+        assert "predicted_tags_seq_label" not in output_dict.keys()
+        assert "loss" in output_dict.keys()
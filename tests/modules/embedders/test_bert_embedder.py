@@ -69,6 +69,7 @@ class TestBertEmbedder:
     @pytest.mark.slow
     def test_bert_embedder_tokens(self, setup_bert_embedder):
         bert_embedder, lines = setup_bert_embedder
+        bert_embedder.store_token_embeddings = True
         _ = bert_embedder(lines)
         emb_dim = bert_embedder.get_embedding_dimension()
         emb_name = bert_embedder.embedder_name
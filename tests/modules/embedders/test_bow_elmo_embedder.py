@@ -33,6 +33,7 @@ class TestBowElmoEncoder:
     @pytest.mark.slow
     def test_token_embeddings(self, setup_bow_elmo_encoder):
         bow_elmo_embedder, lines = setup_bow_elmo_encoder
+        bow_elmo_embedder.store_token_embeddings = True
         _ = bow_elmo_embedder(lines)
 
         for line in lines:
@@ -1,6 +1,7 @@
 import pytest
 from sciwing.modules.embedders.char_embedder import CharEmbedder
 from sciwing.data.line import Line
+from sciwing.data.batch_collate import BatchInstances
 from sciwing.tokenizers.word_tokenizer import WordTokenizer
 from sciwing.tokenizers.character_tokenizer import CharacterTokenizer
 from sciwing.datasets.classification.text_classification_dataset import (
@@ -60,6 +61,7 @@ class TestCharEmbedder:
 
     def test_embedding_set_lines(self, setup_char_embedder):
         embedder, lines = setup_char_embedder
+        embedder.store_token_embeddings = True
         _ = embedder(lines)
         for line in lines:
             tokens = line.tokens["tokens"]
@@ -67,3 +69,51 @@ class TestCharEmbedder:
                 assert isinstance(
                     token.get_embedding("char_embedding"), torch.FloatTensor
                 )
+
+    def test_char_ids_match_numericalizer(self, setup_char_embedder):
+        embedder, lines = setup_char_embedder
+        word_idxs = [embedder.word_vocab.get_idx_from_token("train_line1"), 0, 1]
+        char_ids = embedder.get_char_ids(word_idxs=word_idxs, max_token_length=6)
+        for word_idx, word_char_ids in zip(word_idxs, char_ids):
+            word = embedder.word_vocab.get_token_from_idx(word_idx)
+            expected = embedder.char_numericalizer.numericalize_instance(list(word))
+            expected = embedder.char_numericalizer.pad_instance(
+                numericalized_text=expected, max_length=6, add_start_end_token=False
+            )
+            assert word_char_ids.tolist() == expected
+
+    def test_repeated_words_have_same_embedding(self, setup_char_embedder):
+        embedder, lines = setup_char_embedder
+        embedded = embedder(lines)
+        # "This" and "is" occur in both the lines
+        assert torch.equal(embedded[0, 0], embedded[1, 0])
+        assert torch.equal(embedded[0, 1], embedded[1, 1])
+
+    @pytest.mark.parametrize("training", [True, False])
+    def test_embeddings_not_set_by_default(self, setup_char_embedder, training):
+        embedder, lines = setup_char_embedder
+        embedder.train(training)
+        _ = embedder(lines)
+        for line in lines:
+            for token in line.tokens["tokens"]:
+                with pytest.raises(KeyError):
+                    token.get_embedding("char_embedding")
+
+    def test_stored_embeddings_are_detached(self, setup_char_embedder):
+        embedder, lines = setup_char_embedder
+        embedder.store_token_embeddings = True
+        embedder.train()
+        _ = embedder(lines)
+        for line in lines:
+            for token in line.tokens["tokens"]:
+                assert not token.get_embedding("char_embedding").requires_grad
+
+    def test_collated_word_ids_give_same_embedding(self, setup_char_embedder):
+        embedder, lines = setup_char_embedder
+        embedder.eval()
+        expected = embedder(lines)
+        word_ids = embedder.word_numericalizer.numericalize_batch_to_tensor(
+            instances=[[tok.text for tok in line.tokens["tokens"]] for line in lines]
+        )
+        collated = BatchInstances(lines, namespace_to_tensors={"tokens": word_ids})
+        assert torch.allclose(embedder(collated), expected)
@@ -0,0 +1,46 @@
+import pytest
+import numpy as np
+from sciwing.modules.embedders.elmo_embedding_cache import ElmoEmbeddingCache
+
+
+@pytest.fixture
+def setup_cache(tmpdir):
+    cache_filename = tmpdir.join("elmo_cache.hdf5")
+    cache = ElmoEmbeddingCache(str(cache_filename))
+    yield cache, str(cache_filename)
+    cache.close()
+
+
+class TestElmoEmbeddingCache:
+    def test_key_depends_on_tokens_and_aggregation(self):
+        key = ElmoEmbeddingCache.get_key(["a", "b"], "sum")
+        assert key == ElmoEmbeddingCache.get_key(["a", "b"], "sum")
+        assert key != ElmoEmbeddingCache.get_key(["a", "b"], "last")
+        assert key != ElmoEmbeddingCache.get_key(["a b"], "sum")
+
+    def test_key_depends_on_model(self):
+        key = ElmoEmbeddingCache.get_key(
+            ["a", "b"], "sum", model_id="options\x1fweights"
+        )
+        assert key != ElmoEmbeddingCache.get_key(["a", "b"], "sum")
+        assert key != ElmoEmbeddingCache.get_key(
+            ["a", "b"], "sum", model_id="options\x1fother_weights"
+        )
+
+    def test_miss_returns_none(self, setup_cache):
+        cache, _ = setup_cache
+        assert cache.get(cache.get_key(["a"], "sum")) is None
+
+    def test_put_and_get_across_files(self, setup_cache):
+        cache, cache_filename = setup_cache
+        key = cache.get_key(["I", "like", "elmo"], "sum")
+        embedding = np.random.randn(3, 1024)
+        cache.put(key, embedding)
+        cache.close()
+
+        reopened = ElmoEmbeddingCache(cache_filename)
+        assert key in reopened
+        cached = reopened.get(key)
+        assert cached.dtype == np.float32
+        assert np.allclose(cached, embedding, atol=1e-6)
+        reopened.close()
@@ -35,6 +35,7 @@ class TestWordEmbedder:
     def test_dimension(self, setup_embedder, setup_lines):
         embedder = setup_embedder
         lines = setup_lines
+        embedder.store_token_embeddings = True
         _ = embedder(lines)
         for line in lines:
             for token in line.tokens["tokens"]:
@@ -50,3 +51,41 @@ class TestWordEmbedder:
 
     def test_vanilla_embedder_in_class_nursery(self):
         assert ClassNursery.class_nursery["WordEmbedder"] is not None
+
+    def test_padding_and_repeated_tokens(self):
+        embedder = WordEmbedder(embedding_type="glove_6B_50")
+        lines = [Line(text="line"), Line(text="second line")]
+        embeddings = embedder(lines)
+        assert embeddings.size() == (2, 2, 50)
+        assert torch.all(embeddings[0, 1] == 0)
+        assert torch.equal(embeddings[0, 0], embeddings[1, 1])
+
+    def test_oov_tokens_are_not_cached(self):
+        embedder = WordEmbedder(embedding_type="glove_6B_50")
+        embeddings = embedder([Line(text="qwertyuiopasdf line")])
+        assert torch.all(embeddings[0, 0] == 0)
+        assert "qwertyuiopasdf" not in embedder.cached_token2row
+        assert "line" in embedder.cached_token2row
+
+    def test_cached_tokens_are_bounded(self):
+        embedder = WordEmbedder(embedding_type="glove_6B_50", max_cached_tokens=2)
+        first_embedding = embedder([Line(text="first")])[0, 0]
+        _ = embedder([Line(text="second line")])
+        assert set(embedder.cached_token2row.keys()) == {"second", "line"}
+        assert torch.equal(embedder([Line(text="first")])[0, 0], first_embedding)
+        assert len(embedder.cached_token2row) == 2
+
+    def test_tokens_of_the_batch_are_not_evicted(self):
+        embedder = WordEmbedder(embedding_type="glove_6B_50", max_cached_tokens=2)
+        first_embedding = embedder([Line(text="first")])[0, 0]
+        _ = embedder([Line(text="second")])
+        num_rows = embedder.num_rows
+        embeddings = embedder([Line(text="first line")])
+        assert embedder.num_rows == num_rows
+        assert set(embedder.cached_token2row.keys()) == {"first", "line"}
+        assert torch.equal(embeddings[0, 0], first_embedding)
+
+    def test_embedding_matrix_is_not_saved(self):
+        embedder = WordEmbedder(embedding_type="glove_6B_50")
+        assert "embedding_matrix" in dict(embedder.named_buffers())
+        assert "embedding_matrix" not in embedder.state_dict()
@@ -63,3 +63,11 @@ class TestLstm2SeqEncoder:
         encoding = encoder(lines=lines)
         batch_size = len(lines)
         assert encoding.size() == (batch_size, num_time_steps, expected_hidden_size)
+
+    def test_packed_sequence_mask(self, setup_lstm2seqencoder):
+        encoder, options = setup_lstm2seqencoder
+        encoder.use_packed_sequence = True
+        lines = [Line(text="First"), Line(text="second sentence here")]
+        encoding, mask = encoder(lines=lines, return_mask=True)
+        assert encoding.size()[:2] == (2, 3)
+        assert mask.tolist() == [[1, 0, 0], [1, 1, 1]]
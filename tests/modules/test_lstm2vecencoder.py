@@ -63,3 +63,20 @@ class TestLstm2VecEncoder:
         batch_size = len(lines)
         encoding = encoder(lines=lines)
         assert encoding.size() == (batch_size, hidden_dim)
+
+    @pytest.mark.parametrize("bidirectional", [True, False])
+    def test_packed_sequence_ignores_padding(self, bidirectional):
+        embedder = WordEmbedder(embedding_type="glove_6B_50")
+        encoder = LSTM2VecEncoder(
+            embedder=embedder,
+            hidden_dim=10,
+            bidirectional=bidirectional,
+            use_packed_sequence=True,
+        )
+        short_line = Line(text="First sentence")
+        long_line = Line(text="A much longer second sentence")
+        encoder.eval()
+        encoding_alone = encoder(lines=[short_line])
+        encoding, mask = encoder(lines=[short_line, long_line], return_mask=True)
+        assert torch.allclose(encoding[0], encoding_alone[0], atol=1e-6)
+        assert mask.tolist() == [[1, 1, 0, 0, 0], [1, 1, 1, 1, 1]]
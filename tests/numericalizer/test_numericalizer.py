@@ -74,3 +74,32 @@ class TestNumericalizer:
         expected_mask = torch.ByteTensor(expected_mask)
         mask = numericalizer.get_mask_for_instance(instance=padded_numerical_tokens)
         assert torch.all(torch.eq(mask, expected_mask))
+
+    @pytest.mark.parametrize("add_start_end_token", [True, False])
+    @pytest.mark.parametrize("max_length", [None, 3, 10])
+    def test_numericalize_batch_to_tensor(
+        self, single_instance_setup, add_start_end_token, max_length
+    ):
+        single_instance, numericalizer, vocab = single_instance_setup
+        instances = [single_instance[0], ["i", "unseen"], []]
+        padded, mask = numericalizer.numericalize_batch_to_tensor(
+            instances=instances,
+            max_length=max_length,
+            add_start_end_token=add_start_end_token,
+        )
+        expected_length = max_length or len(single_instance[0]) + (
+            2 if add_start_end_token else 0
+        )
+        assert padded.size() == (3, expected_length)
+
+        for instance, padded_instance, instance_mask in zip(instances, padded, mask):
+            expected = numericalizer.numericalize_instance(instance)
+            expected = numericalizer.pad_instance(
+                numericalized_text=expected,
+                max_length=expected_length,
+                add_start_end_token=add_start_end_token,
+            )
+            expected_mask = numericalizer.get_mask_for_instance(instance=expected)
+            assert padded_instance.tolist() == expected
+            assert instance_mask.dtype == torch.bool
+            assert torch.equal(instance_mask, expected_mask)
@@ -23,6 +23,15 @@ class TestWordTokenizer:
         tokenized = tokenizer.tokenize_batch(sample_sentences)
         assert len(tokenized) == 2
 
+    @pytest.mark.parametrize("tokenizer", ["spacy", "vanilla", "spacy-whitespace"])
+    def test_batch_same_as_single(self, tokenizer):
+        sample_sentences = ["I like big apple.", "We process text", "I don't."]
+        tokenizer = WordTokenizer(tokenizer=tokenizer, batch_size=2)
+        tokenized = tokenizer.tokenize_batch(sample_sentences)
+        assert tokenized == [
+            tokenizer.tokenize(sentence) for sentence in sample_sentences
+        ]
+
     def test_word_tokenization_types(self):
         with pytest.raises(AssertionError):
             tokenizer = WordTokenizer(tokenizer="moses")
@@ -67,3 +76,14 @@ class TestWordTokenizer:
             "Event",
             "Systems.",
         ]
+
+    @pytest.mark.parametrize("tokenizer_type", ["spacy", "vanilla"])
+    def test_tokenize_batch_in_processes(self, tokenizer_type):
+        texts = [f"I don't like apple number {idx}." for idx in range(10)]
+        tokenizer = WordTokenizer(tokenizer=tokenizer_type, batch_size=3)
+        parallel_tokenizer = WordTokenizer(
+            tokenizer=tokenizer_type, batch_size=3, n_process=2
+        )
+        assert parallel_tokenizer.tokenize_batch(texts) == tokenizer.tokenize_batch(
+            texts
+        )
@@ -365,3 +365,26 @@ class TestCommon:
     def test_create_class_raises_class_not_found_error(self):
         with pytest.raises(AttributeError):
             create_class(classname="dummy", module_name=Engine.__module__)
+
+    @pytest.mark.parametrize("batch_size, window_size", [(2, 3), (3, 10), (10, 2)])
+    def test_predict_in_batches_keeps_order(self, batch_size, window_size):
+        lines = ["a b c", "a", "a b c d e", "a b", "", "a b c d"]
+        batch_sizes = []
+
+        def predict_batch(batch):
+            batch_sizes.append(len(batch))
+            return [len(line) for line in batch]
+
+        results = list(
+            predict_in_batches(
+                lines=iter(lines),
+                predict_batch=predict_batch,
+                batch_size=batch_size,
+                window_size=window_size,
+            )
+        )
+        assert [line for line, _ in results] == lines
+        assert [prediction for _, prediction in results] == [
+            len(line) for line in lines
+        ]
+        assert max(batch_sizes) <= batch_size
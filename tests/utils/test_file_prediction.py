@@ -0,0 +1,47 @@
+import pytest
+import wasabi
+from sciwing.utils.file_prediction import FilePredictionMixin
+
+
+class LengthPredictor(FilePredictionMixin):
+    def __init__(self):
+        self.msg_printer = wasabi.Printer()
+
+    def predict_for_batch(self, texts):
+        if "fail" in texts:
+            raise ValueError("cannot predict")
+        return [str(len(text.split())) for text in texts]
+
+
+@pytest.fixture
+def setup_file(tmpdir):
+    input_file = tmpdir.join("input.txt")
+    input_file.write("a b c\na\na b\n")
+    return str(input_file), str(tmpdir.join("output.txt"))
+
+
+class TestFilePredictionMixin:
+    def test_predictions_in_file_order(self, setup_file):
+        input_filename, output_filename = setup_file
+        predictor = LengthPredictor()
+        predictions = predictor.predict_for_file(
+            filename=input_filename,
+            batch_size=2,
+            output_filename=output_filename,
+            show=False,
+        )
+        assert predictions == ["3", "1", "2"]
+        with open(output_filename) as fp:
+            assert fp.read() == "3\n1\n2\n"
+
+    def test_output_file_is_closed_on_failure(self, setup_file, tmpdir):
+        _, output_filename = setup_file
+        input_file = tmpdir.join("failing.txt")
+        input_file.write("fail\n")
+        predictor = LengthPredictor()
+        with pytest.raises(ValueError):
+            predictor.predict_for_file(
+                filename=str(input_file), output_filename=output_filename, show=False
+            )
+        with open(output_filename) as fp:
+            assert fp.read() == ""
@@ -2,6 +2,10 @@ import pytest
 import torch
 from sciwing.utils.tensor_utils import has_tensor
 from sciwing.utils.tensor_utils import get_mask
+from sciwing.utils.tensor_utils import get_lengths
+from sciwing.data.line import Line
+from sciwing.utils.tensor_utils import batched_viterbi_decode
+import itertools
 
 
 @pytest.fixture
@@ -43,3 +47,47 @@ class TestTensorUtils:
         for row, size in zip(mask, lengths):
             number_ones = sum(torch.gt(row, 0).tolist())
             assert number_ones == size
+
+    def test_get_lengths_clips_lengths(self):
+        lines = [Line(text=""), Line(text="a b"), Line(text="a b c d")]
+        lengths = get_lengths(lines=lines, namespace="tokens", max_length=3)
+        assert lengths.tolist() == [0, 2, 3]
+
+    @pytest.mark.parametrize("lengths", [[3, 3], [3, 1], [2, 4, 1]])
+    def test_batched_viterbi_decode(self, lengths):
+        torch.manual_seed(1729)
+        num_tags = 3
+        batch_size = len(lengths)
+        max_length = max(lengths)
+        logits = torch.randn(batch_size, max_length, num_tags)
+        transitions = torch.randn(num_tags, num_tags)
+        start_transitions = torch.randn(num_tags)
+        end_transitions = torch.randn(num_tags)
+        mask = get_mask(
+            batch_size=batch_size,
+            max_size=max_length,
+            lengths=torch.LongTensor(lengths),
+        )
+
+        best_tags = batched_viterbi_decode(
+            logits=logits,
+            transitions=transitions,
+            mask=mask,
+            start_transitions=start_transitions,
+            end_transitions=end_transitions,
+        )
+
+        # brute force over all the tag sequences of every line
+        for idx, length in enumerate(lengths):
+            best_score = None
+            expected_tags = None
+            for tags in itertools.product(range(num_tags), repeat=length):
+                score = start_transitions[tags[0]] + end_transitions[tags[-1]]
+                for time_step, tag in enumerate(tags):
+                    score += logits[idx, time_step, tag]
+                    if time_step > 0:
+                        score += transitions[tags[time_step - 1], tag]
+                if best_score is None or score > best_score:
+                    best_score = score
+                    expected_tags = list(tags)
+            assert best_tags[idx] == expected_tags
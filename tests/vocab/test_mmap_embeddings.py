@@ -0,0 +1,52 @@
+import pytest
+import numpy as np
+from sciwing.vocab.mmap_embeddings import MmapEmbeddings
+
+
+@pytest.fixture
+def embedding_file(tmpdir):
+    embedding_file = tmpdir.join("embeddings.txt")
+    embedding_file.write("the 0.1 0.2 0.3\nword 1.0 2.0 3.0\nThe 4.0 5.0 6.0\n")
+    return str(embedding_file)
+
+
+class TestMmapEmbeddings:
+    def test_from_text_file(self, embedding_file):
+        embeddings = MmapEmbeddings.from_text_file(embedding_file)
+        assert len(embeddings) == 3
+        assert embeddings.embedding_dimension == 3
+        assert embeddings.matrix.dtype == np.float32
+        assert np.allclose(embeddings["word"], [1.0, 2.0, 3.0])
+
+    def test_missing_token_raises_key_error(self, embedding_file):
+        embeddings = MmapEmbeddings.from_text_file(embedding_file)
+        assert "missing" not in embeddings
+        with pytest.raises(KeyError):
+            embeddings["missing"]
+
+    def test_save_and_load(self, embedding_file, tmpdir):
+        cache_dir = str(tmpdir.mkdir("cache"))
+        embeddings = MmapEmbeddings.from_text_file(embedding_file)
+        embeddings.save(
+            cache_dir=cache_dir, cache_name="test", source_filename=embedding_file
+        )
+        loaded = MmapEmbeddings.load(
+            cache_dir=cache_dir, cache_name="test", source_filename=embedding_file
+        )
+        assert isinstance(loaded.matrix, np.memmap)
+        for token, embedding in embeddings.items():
+            assert np.array_equal(loaded[token], embedding)
+
+    def test_load_without_cache_returns_none(self, embedding_file, tmpdir):
+        loaded = MmapEmbeddings.load(
+            cache_dir=str(tmpdir), cache_name="absent", source_filename=embedding_file
+        )
+        assert loaded is None
+
+    def test_restrict_to_tokens(self, embedding_file):
+        embeddings = MmapEmbeddings.from_text_file(embedding_file)
+        restricted = embeddings.restrict_to_tokens(["word", "the", "missing"])
+        assert len(restricted) == 2
+        assert "The" not in restricted
+        assert np.array_equal(restricted["word"], embeddings["word"])
+        assert np.array_equal(restricted["the"], embeddings["the"])
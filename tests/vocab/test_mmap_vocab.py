@@ -0,0 +1,77 @@
+import pytest
+import pickle
+import numpy as np
+from sciwing.vocab.mmap_vocab import (
+    VocabTables,
+    MmapFreqIdx,
+    MmapToken2Idx,
+    MmapIdx2Token,
+)
+
+
+@pytest.fixture
+def vocab_orig_vocab():
+    orig_vocab = {"<UNK>": (1e10, 0), "the": (5, 1), "wörd": (2, 2), "rare": (1, 3)}
+    vocab = {"<UNK>": (1e10, 0), "the": (5, 1), "wörd": (2, 2), "rare": (1, 0)}
+    vocab["added"] = (1, 3)
+    return vocab, orig_vocab
+
+
+class TestMmapVocab:
+    def test_token2idx(self, vocab_orig_vocab):
+        vocab, orig_vocab = vocab_orig_vocab
+        tables = VocabTables.from_vocab(vocab=vocab, orig_vocab=orig_vocab)
+        token2idx = MmapToken2Idx(tables)
+
+        assert dict(token2idx) == {token: idx for token, (_, idx) in vocab.items()}
+        assert "missing" not in token2idx
+        assert token2idx.get("missing") is None
+
+    def test_idx2token_uses_last_token_of_idx(self, vocab_orig_vocab):
+        vocab, orig_vocab = vocab_orig_vocab
+        tables = VocabTables.from_vocab(vocab=vocab, orig_vocab=orig_vocab)
+        idx2token = MmapIdx2Token(tables)
+
+        assert dict(idx2token) == {0: "rare", 1: "the", 2: "wörd", 3: "added"}
+        with pytest.raises(KeyError):
+            idx2token[4]
+
+    def test_orig_vocab_excludes_added_tokens(self, vocab_orig_vocab):
+        vocab, orig_vocab = vocab_orig_vocab
+        tables = VocabTables.from_vocab(vocab=vocab, orig_vocab=orig_vocab)
+
+        assert dict(MmapFreqIdx(tables)) == vocab
+        assert dict(MmapFreqIdx(tables, orig=True)) == orig_vocab
+
+    def test_load_is_memory_mapped(self, vocab_orig_vocab, tmpdir):
+        vocab, orig_vocab = vocab_orig_vocab
+        VocabTables.from_vocab(vocab=vocab, orig_vocab=orig_vocab).save(str(tmpdir))
+        tables = VocabTables.load(str(tmpdir))
+
+        assert isinstance(tables.strings, np.memmap)
+        assert dict(MmapFreqIdx(tables)) == vocab
+
+    def test_pickled_as_directory(self, vocab_orig_vocab, tmpdir):
+        vocab, orig_vocab = vocab_orig_vocab
+        VocabTables.from_vocab(vocab=vocab, orig_vocab=orig_vocab).save(str(tmpdir))
+        token2idx = MmapToken2Idx(VocabTables.load(str(tmpdir)))
+
+        unpickled = pickle.loads(pickle.dumps(token2idx))
+        assert unpickled.tables.directory == str(tmpdir)
+        assert isinstance(unpickled.tables.strings, np.memmap)
+        assert dict(unpickled) == dict(token2idx)
+
+    def test_token_cache_is_bounded(self, vocab_orig_vocab):
+        vocab, orig_vocab = vocab_orig_vocab
+        tables = VocabTables.from_vocab(vocab=vocab, orig_vocab=orig_vocab)
+        token2idx = MmapToken2Idx(tables, cache_size=2)
+
+        for token in ["the", "wörd", "rare", "missing"]:
+            token2idx.get(token)
+        assert token2idx._get_idx.cache_info().currsize == 2
+        assert token2idx["the"] == 1
+
+    def test_max_idx_of_empty_vocab(self):
+        tables = VocabTables.from_vocab(vocab={}, orig_vocab={})
+        assert tables.get_max_idx() == -1
+        assert tables.get_vocab_len() == 0
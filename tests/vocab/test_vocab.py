@@ -412,3 +412,77 @@ class TestVocab:
         for instance in instances:
             for token in instance:
                 assert token.islower()
+
+    def test_count_instances_same_as_instances(self, instances):
+        single_instance = instances["single_instance"]
+        vocab = Vocab(instances=single_instance)
+        vocab.build_vocab()
+
+        streamed_vocab = Vocab()
+        # the first half as a generator and then the second half
+        streamed_vocab.count_instances(instance[:3] for instance in single_instance)
+        streamed_vocab.count_instance(single_instance[0][3:])
+        streamed_vocab.build_vocab()
+
+        assert streamed_vocab.vocab == vocab.vocab
+        assert streamed_vocab.get_vocab_len() == vocab.get_vocab_len()
+
+    def test_add_tokens_updates_len(self, instances):
+        single_instance = instances["single_instance"]
+        vocab = Vocab(instances=single_instance)
+        vocab.build_vocab()
+        vocab_len = vocab.get_vocab_len()
+
+        vocab.add_tokens(["new", "nlp", "newer"])
+        assert vocab.get_vocab_len() == vocab_len + 2
+        assert vocab.get_max_idx() == vocab_len + 1
+        assert vocab.get_idx_from_token("newer") == vocab_len + 1
+
+    def test_add_tokens_before_len_is_calculated(self, instances):
+        single_instance = instances["single_instance"]
+        vocab = Vocab(instances=single_instance)
+        vocab.build_vocab()
+
+        vocab.add_tokens(["new"])
+        assert vocab.get_vocab_len() == 3 + len(vocab.special_vocab) + 1
+
+    @pytest.mark.parametrize("include_special_vocab", [True, False])
+    def test_load_binary_vocab(self, instances, tmpdir, include_special_vocab):
+        single_instance = instances["single_instance"]
+        vocab_builder = Vocab(
+            instances=single_instance, include_special_vocab=include_special_vocab
+        )
+        vocab_builder.build_vocab()
+        vocab_dir = str(tmpdir.join("vocab"))
+        vocab_builder.save_to_binary_file(vocab_dir)
+
+        vocab = Vocab.load_from_binary_file(vocab_dir)
+
+        assert dict(vocab.vocab) == vocab_builder.vocab
+        assert dict(vocab.orig_vocab) == vocab_builder.orig_vocab
+        assert vocab.get_vocab_len() == vocab_builder.get_vocab_len()
+        assert vocab.include_special_vocab == include_special_vocab
+        for token in ["i", "like", "nlp", "missing"]:
+            assert vocab.get_idx_from_token(token) == vocab_builder.get_idx_from_token(
+                token
+            )
+        for idx in range(vocab.get_vocab_len()):
+            assert vocab.get_token_from_idx(idx) == vocab_builder.get_token_from_idx(
+                idx
+            )
+
+    def test_add_tokens_to_binary_vocab(self, instances, tmpdir):
+        single_instance = instances["single_instance"]
+        vocab_builder = Vocab(instances=single_instance)
+        vocab_builder.build_vocab()
+        vocab_dir = str(tmpdir.join("vocab"))
+        vocab_builder.save_to_binary_file(vocab_dir)
+
+        vocab = Vocab.load_from_binary_file(vocab_dir)
+        vocab.add_tokens(["new"])
+        vocab_builder.add_tokens(["new"])
+
+        assert vocab.vocab == vocab_builder.vocab
+        assert vocab.get_idx_from_token("new") == vocab_builder.get_idx_from_token(
+            "new"
+        )